@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 23rd May 2024
-Last-modified: 5th July 2024
+Last-modified: 17th October 2026
 Error-series: 1100
 """
 
@@ -13,6 +13,7 @@ __version__ = "0.0.0"
 
 import os
 import logging
+from typing import Iterator
 from datetime import datetime
 
 if __name__ == "__main__":
@@ -23,6 +24,8 @@ else:
     from . import tools
     from .wordhero import WordHero
     from db_scripts import AIGeneratorDB
+    from session_store import SessionStore
+    from tools import get_memoization_settings  # Application level tools (not the tools of this site)
 
 logging.info(f"Old CWD: {os.getcwd()}")
 logging.info("Changing CWD.")
@@ -106,19 +109,40 @@ def main(site_preferences: dict, driver=None, *args, **kwargs):
         local_webdriver = True
 
     wordhero = WordHero(driver)
-    if site_preferences.get("login_required"):
-        wordhero.login_to_wordhero(SETTINGS["wordhero_credentials"]["email"], SETTINGS["wordhero_credentials"]["password"])
+    # Full login is required only if the saved session of the site is not valid anymore.
+    session_store = SessionStore("wordhero", SETTINGS["wordhero_credentials"]["email"])
+    if site_preferences.get("login_required") and not session_store.restore(
+        driver, WordHero.URL + "login", logged_in_url_part="app.wordhero.co/home"
+    ):
+        if wordhero.login_to_wordhero(SETTINGS["wordhero_credentials"]["email"], SETTINGS["wordhero_credentials"]["password"]):
+            session_store.save(driver)
 
-    prompts: list | str = site_preferences["options"]["prompt"]  # In case of wordhero, prompts are headline only
-    prompts: list = prompts if isinstance(prompts, list) else [prompts]
-    logging.info(f"Total number of headlines in this batch is {len(prompts)}")
+    prompts: list | str | Iterator = site_preferences["options"]["prompt"]  # In case of wordhero, prompts are headline only
+    prompts: list | Iterator = prompts if isinstance(prompts, (list, Iterator)) else [prompts]
 
     db = AIGeneratorDB()
+    job_ids, prompts = db.load_jobs(
+        site_preferences["category"],
+        site_preferences["site"],
+        "prompt",
+        prompts,
+        site_preferences.get("resume_jobs"),
+        options=dict(site_preferences["options"]),
+        **get_memoization_settings(),
+    )
+    site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+    if isinstance(prompts, list):
+        logging.info(f"Total number of headlines in this batch is {len(prompts)}")
+    else:
+        logging.info("Headlines of this batch are streamed from the sheet.")
 
     for index, headline in enumerate(prompts):
-        site_preferences["options"]["headline"] = headline
+        options = {**site_preferences["options"], "headline": headline}
         logging.info(f"Going to generate article {index} of the batch...")
-        generated_article, prompt_response_mapping = wordhero.generate_article(**site_preferences["options"])
+        # Parts are checkpointed. So, an interrupted article resumes at the next part on the next run.
+        generated_article, prompt_response_mapping = wordhero.generate_article(
+            **options, checkpoints_dir_path=SETTINGS.get("checkpoint_location", "appdata/checkpoints")
+        )
         logging.info("Article generated successfully...")
         timestamp = datetime.now()
         filename = generate_file_name(prompt=headline, timestamp=timestamp, extension="txt")
@@ -132,9 +156,12 @@ def main(site_preferences: dict, driver=None, *args, **kwargs):
             site_id=db.get_site_id(site_preferences["site"]),
             prompt_id=db.insert_prompt(headline),
             timestamp=timestamp,
+            job_id=job_ids[index],
         )
         logging.info("Output details successfully inserted into the database...")
+        wordhero.clear_article_checkpoint()  # Article is saved. So, its checkpoint is no longer required.
 
+    db.flush()  # Writing the buffered outputs of the batch
     # Quitting the driver instance if local_webdriver
     if local_webdriver:
         driver.quit()
@@ -2,13 +2,15 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 23rd May 2024
-Last-modified: 5th July 2024
+Last-modified: 17th October 2026
 Error-series: 1200
 """
 
 from datetime import datetime
 import logging
 import os
+import json
+import hashlib
 from typing import Any
 from time import sleep
 import inflect
@@ -18,6 +20,106 @@ import selenium.webdriver.support.expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException
+import dom_wait
+import dom_extract
+import output_store
+
+
+class ArticleCheckpoint:
+    """Class to append the parts of an article to the disk as soon as they arrive and record the progress (checkpoint).
+
+    So, an interrupted article resumes at the next part (in the same chat) instead of generating all parts again.
+    """
+
+    def __init__(self, headline: str, tone: str, number_of_words: int | str, checkpoints_dir_path: str = "appdata/checkpoints") -> None:
+        """Constructor of ArticleCheckpoint class. Loads the checkpoint of the article if it exists.
+
+        Args:
+            headline (str): The headline of the article.
+            tone (str): The tone of the article.
+            number_of_words (int | str): The total number of words in the article.
+            checkpoints_dir_path (str, optional): Directory to store the checkpoints and parts. Defaults to "appdata/checkpoints".
+        """
+        key = hashlib.sha256(json.dumps([headline, tone, str(number_of_words)]).encode()).hexdigest()[:16]
+        os.makedirs(checkpoints_dir_path, exist_ok=True)
+        self.file_path = os.path.abspath(os.path.join(checkpoints_dir_path, f"article_{key}.json"))
+        self.parts_file_path = os.path.abspath(os.path.join(checkpoints_dir_path, f"article_{key}.txt"))
+        self.state = {
+            "headline": headline,
+            "tone": tone,
+            "number_of_words": str(number_of_words),
+            "parts_done": 0,
+            "chat_url": None,
+            "size": 0,
+        }
+        self.load()
+
+    @property
+    def parts_done(self) -> int:
+        return self.state["parts_done"]
+
+    @property
+    def chat_url(self) -> str | None:
+        return self.state["chat_url"]
+
+    def load(self) -> None:
+        """Load the checkpoint. Content of the parts file written after the last checkpoint is discarded (that part is generated again)."""
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path) as file:
+                    self.state.update(json.load(file))
+            except (OSError, ValueError) as e:
+                logging.warning(
+                    f"Failed to load the checkpoint '{self.file_path}'. Starting the article again. Error Code: 1203. Exception: {e}"
+                )
+                self.state.update(parts_done=0, chat_url=None, size=0)
+
+        if os.path.exists(self.parts_file_path):
+            if os.path.getsize(self.parts_file_path) < self.state["size"]:
+                logging.warning(
+                    f"Parts of the article '{self.parts_file_path}' are incomplete. Starting the article again. Error Code: 1204"
+                )
+                self.state.update(parts_done=0, chat_url=None, size=0)
+            with open(self.parts_file_path, "r+b") as file:
+                file.truncate(self.state["size"])
+        elif self.state["size"]:
+            logging.warning(f"Parts of the article '{self.parts_file_path}' not found. Starting the article again. Error Code: 1204")
+            self.state.update(parts_done=0, chat_url=None, size=0)
+
+        if self.parts_done:
+            logging.info(f"Checkpoint of the article '{self.state['headline']}' found ({self.parts_done} parts done).")
+
+    def append_part(self, text: str, chat_url: str) -> None:
+        """Append the part to the parts file (synced to the disk) and then record it in the checkpoint.
+
+        Args:
+            text (str): The generated part of the article.
+            chat_url (str): URL of the chat in which the article is being generated.
+        """
+        with open(self.parts_file_path, "ab") as file:
+            file.write(text.encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+            size = file.tell()
+
+        self.state.update(parts_done=self.parts_done + 1, chat_url=chat_url, size=size)
+        temp_file_path = f"{self.file_path}.tmp"
+        with open(temp_file_path, "w") as file:
+            json.dump(self.state, file)
+        os.replace(temp_file_path, self.file_path)  # Atomic. So, an interruption never leaves a partially written checkpoint.
+
+    def read_article(self) -> str:
+        """Read all parts (article) written so far."""
+        if not os.path.exists(self.parts_file_path):
+            return ""
+        with open(self.parts_file_path, "rb") as file:
+            return file.read(self.state["size"]).decode("utf-8")
+
+    def clear(self) -> None:
+        """Delete the checkpoint and the parts file (after the article is saved)."""
+        for file_path in (self.file_path, self.parts_file_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
 
 class WordHero:
@@ -34,6 +136,10 @@ class WordHero:
         """
         self.driver = driver
         self.wait = WebDriverWait(self.driver, 60)
+        # Transcript of the current conversation of the chat page. Only the cells appended after the last read are fetched.
+        self.transcript: dict[str, str] = {}
+        self.consumed_cells = 0  # Number of question/answer cells of the conversation already read into the transcript.
+        self.article_checkpoint: ArticleCheckpoint | None = None  # Checkpoint of the last generated article
 
     @staticmethod
     def save_content(content: str, path: str, filename: str = None, headline: str = None) -> str:
@@ -50,9 +156,12 @@ class WordHero:
         """
         if not filename:
             filename = datetime.now().strftime("wordhero_%Y%m%d%H%M%S.txt")
+        if headline:
+            content = headline + "\n\n" + content
+        store = output_store.get_output_store()
+        if store:
+            return store.save_text(content, os.path.join(path, filename))
         with open(os.path.join(path, filename), "w") as file:
-            if headline:
-                content = headline + "\n\n" + content
             file.write(content)
             created_filename = file.name
         return os.path.abspath(created_filename)
@@ -127,6 +236,31 @@ class WordHero:
                 blog_tools[text] = tool
         return blog_tools
 
+    def reset_transcript(self) -> None:
+        """Forget the transcript of the conversation (like when a new chat is started)."""
+        self.transcript = {}
+        self.consumed_cells = 0
+
+    def read_new_cells(self) -> None:
+        """Read the question/answer cells appended to the conversation since the last read into the transcript.
+
+        Cells already consumed are skipped by the XPath itself. So, the cost of a read doesn't grow with the length of the conversation.
+        """
+        # Div containing questions and answers/responses
+        qa_div_xpath = f"(//div[contains(@id, 'current_cell_text_')])[position() > {self.consumed_cells}]"
+        qa_texts = [qa_div["text"] for qa_div in dom_extract.extract(self.driver, (By.XPATH, qa_div_xpath), {"text": "innerText"})]
+
+        # index 0 question - index 1 it's answer
+        # index 2 question - index 3 it's answer
+        # index 4 question - index 5 it's answer
+        # And so on... (A question without its answer is left for the next read)
+        for index in range(0, len(qa_texts) - 1, 2):
+            question = qa_texts[index]
+            answer = qa_texts[index + 1]
+            self.transcript[question] = answer
+        self.consumed_cells += len(qa_texts) - len(qa_texts) % 2
+        logging.debug(f"Read {len(qa_texts) // 2} new question/answer pairs ({self.consumed_cells // 2} pairs in the conversation).")
+
     def generate_content_with_chat(self, prompt: str, new_chat: bool = True) -> dict:
         """A function to generate content with chat based on a prompt.
 
@@ -135,7 +269,7 @@ class WordHero:
             new_chat (bool, optional): Flag to indicate if a new chat should be started. Defaults to True.
 
         Returns:
-            dict: A dictionary containing questions and their corresponding answers/responses (In the same order as the questions are passed).
+            dict: A dictionary containing questions and their corresponding answers/responses of the conversation (In the same order as the questions are passed).
 
         More:
             - Prompt must not contain any '\n' (new line) characters. Otherwise, the prompt will submitted without writing the complete prompt as passed.
@@ -143,28 +277,16 @@ class WordHero:
         """
 
         def wait_until_response_generated() -> None:
-            """A function that waits until a response is generated by checking the innerText of an element in a loop."""
+            """A function that waits until a response is generated (innerText of the generation info div becomes empty)."""
             generation_info_div = self.driver.find_element(By.CLASS_NAME, "cmeat")
-            while True:
-                if generation_info_div.get_property("innerText").strip():
-                    sleep(0.5)
-                    # if innerText contain any value (AI is typing...). Means element is visible and response is generating.
-                    continue
-                else:
-                    # innerText contain no value. (''). Means response has been generated.
-                    return
+            # innerText contain no value (''). Means response has been generated.
+            dom_wait.wait_until(self.driver, "return !args[0].innerText.trim();", generation_info_div, timeout=600)
 
         def wait_until_generation_info_div_is_visible() -> None:
-            """A function waits until the generation information div is visible on the webpage. It continuously checks the innerText of the element and returns when it contains any value, indicating that the response is being generated."""
+            """A function waits until the generation information div is visible on the webpage. It returns when the innerText of the element contains any value, indicating that the response is being generated."""
             generation_info_div = self.driver.find_element(By.CLASS_NAME, "cmeat")
-            while True:
-                if generation_info_div.get_property("innerText").strip():
-                    # if innerText contain any value (AI is typing...). Means element is visible and response is generating.
-                    return
-                else:
-                    # innerText contain no value. (''). Means response generation is not yet started.
-                    sleep(0.2)
-                    continue
+            # if innerText contain any value (AI is typing...). Means element is visible and response is generating.
+            dom_wait.wait_until(self.driver, "return !!args[0].innerText.trim();", generation_info_div, timeout=120)
 
         logging.info("Generating content with Chat...")
         logging.info("Checking if Chat page is open...")
@@ -172,6 +294,7 @@ class WordHero:
             # If the current page is not chat page.
             logging.info("Chat page is not open. Opening it...")
             self.driver.get(self.URL + "chat")
+            self.reset_transcript()  # Page reloaded. So, conversation is read again from the first cell.
 
         logging.info("Chat page opened successfully...")
 
@@ -179,6 +302,7 @@ class WordHero:
             # Clicking on new chat
             logging.info("Starting a new conversation...")
             self.wait.until(EC.visibility_of_element_located((By.XPATH, "//button[contains(., 'New Chat')]"))).click()
+            self.reset_transcript()
         else:
             logging.info("Skipping new chat. Continue with existing conversation of the chat page...")
 
@@ -201,34 +325,27 @@ class WordHero:
         logging.info("Response generated successfully.")
         sleep(1)
 
-        # Fetching response
-        qa_div_xpath = "//div[contains(@id, 'current_cell_text_')]"  # Div containing questions and answers/responses
-        qa_divs = self.driver.find_elements(By.XPATH, qa_div_xpath)
-
-        # index 0 question - index 1 it's answer
-        # index 2 question - index 3 it's answer
-        # index 4 question - index 5 it's answer
-        # And so on...
-
-        prompt_response_dict = {}
+        # Fetching response (only the question/answer cells appended since the last read)
+        self.read_new_cells()
+        return self.transcript
 
-        for index in range(0, len(qa_divs), 2):
-            question = qa_divs[index].get_property("innerText")
-            answer = qa_divs[index + 1].get_property("innerText")
-            prompt_response_dict[question] = answer
-
-        return prompt_response_dict
-
-    def generate_article(self, headline: str, tone: str, number_of_words: int, *args, **kwargs) -> tuple[str, dict]:
+    def generate_article(
+        self, headline: str, tone: str, number_of_words: int, checkpoints_dir_path: str | None = None, *args, **kwargs
+    ) -> tuple[str, dict]:
         """Generate an article based on the provided headline, tone, and number of words.
 
         Parameters:
             headline (str): The headline of the article.
             tone (str): The tone in which the article should be written. Like 'funny', 'scientific' etc.
             number_of_words (int): The total number of words in the article. Better if in multiple of 500.
+            checkpoints_dir_path (str | None, optional): Directory of the checkpoints. If provided, each part is appended to the disk as soon as
+                it arrives and an interrupted article resumes at the next part. Defaults to None (no checkpoint).
 
         Returns:
             tuple[str, dict]: A tuple containing the generated article as a string and a dictionary of prompt responses.
+
+        More:
+            - With checkpoints, call clear_article_checkpoint() after the article is saved.
         """
         if not (headline and tone and number_of_words):
             logging.error("Please provide a valid headline, tone and number of words. Error Code: 1202")
@@ -238,8 +355,18 @@ class WordHero:
         engine = inflect.engine()  # for ordinal number (1st, 2nd, etc.)
         number_of_part = int(number_of_words) // 500
         article: str = ""
-
-        for part in range(1, number_of_part + 1):
+        prompt_response_dict: dict = {}
+
+        checkpoint = ArticleCheckpoint(headline, tone, number_of_words, checkpoints_dir_path) if checkpoints_dir_path else None
+        self.article_checkpoint = checkpoint
+        first_part = 1
+        if checkpoint and checkpoint.parts_done and checkpoint.chat_url:
+            first_part = checkpoint.parts_done + 1
+            logging.info(f"Resuming the article at part {first_part} of {number_of_part} in the chat '{checkpoint.chat_url}'...")
+            self.driver.get(checkpoint.chat_url)
+            self.reset_transcript()
+
+        for part in range(first_part, number_of_part + 1):
             if part == 1:
                 prompt = f"""Write a {number_of_words} word article about "{headline}". Write in {number_of_part} parts with approximate 500 words each. Start with the headline, multiple subheadings. Content for each subheading should be 120-150 words long. Write in a {tone} tone. Give me the first part."""
                 prompt_response_dict: dict = self.generate_content_with_chat(prompt)
@@ -247,6 +374,18 @@ class WordHero:
                 prompt = f"Give me the {engine.ordinal(part)} part."
                 prompt_response_dict: dict = self.generate_content_with_chat(prompt, False)
 
-            article += prompt_response_dict[prompt]
+            if checkpoint:
+                checkpoint.append_part(prompt_response_dict[prompt], self.driver.current_url)
+                logging.info(f"Part {part} of {number_of_part} of the article written to the disk.")
+            else:
+                article += prompt_response_dict[prompt]
 
+        if checkpoint:
+            article = checkpoint.read_article()
         return article, prompt_response_dict
+
+    def clear_article_checkpoint(self) -> None:
+        """Delete the checkpoint (and parts) of the last generated article. Call it after the article is saved."""
+        if self.article_checkpoint:
+            self.article_checkpoint.clear()
+            self.article_checkpoint = None
@@ -2,7 +2,7 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 20th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1600
 """
 
@@ -13,13 +13,18 @@ import os
 from time import sleep
 from typing import Any, Literal
 from datetime import datetime
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver import Chrome, Edge
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
+import requests
+import http_client
+import output_store
+import dom_wait
+from network_capture import NetworkCapture
 
 URL = "https://ideogram.ai/"
 
@@ -27,14 +32,16 @@ URL = "https://ideogram.ai/"
 class Ideogram:
     """Class to handle all operations related to the Ideogram."""
 
-    def __init__(self, driver: Chrome | Edge | Any):
+    def __init__(self, driver: Chrome | Edge | Any, network_capture: NetworkCapture | None = None):
         """Constructor of Ideogram class.
         Initializes the class with the given driver object and sets up a WebDriverWait object.
 
         Args:
             driver (Chrome | Edge | Any): The driver object to be used for the class.
+            network_capture (NetworkCapture | None, optional): Started network capture of the driver. If provided then request IDs and image links are taken from the API responses. Defaults to None.
         """
         self.driver = driver
+        self.network_capture = network_capture
         self.wait = WebDriverWait(self.driver, 60)
 
     def login_with_google(self) -> bool:
@@ -67,65 +74,87 @@ class Ideogram:
             logging.info("Login success.")
             return True
 
-    def download_images(self, links: list[str], path: str, filenames: list[str] = None) -> list[str]:
+    def get_download_session(self) -> requests.Session:
+        """Get a session with the cookies of the logged in browser. Call it on the thread driving the browser (like when the download is queued)."""
+        return http_client.get_browser_session(self.driver)
+
+    def download_images(
+        self, links: list[str], path: str, filenames: list[str] = None, session: requests.Session | None = None
+    ) -> list[str]:
         """Download images from a list of links to the specified path with optional custom filenames.
 
         Parameters:
             links (list[str]): A list of URLs pointing to the images to be downloaded.
             path (str): The local directory path where the images will be saved.
             filenames (list[str], optional): A list of custom filenames corresponding to the downloaded images. Defaults to None.
+            session (requests.Session | None, optional): Session with the cookies of the logged in browser (See get_download_session()).
+                Must be passed if called from a download (worker) thread. Defaults to None (cookies are read from the browser).
 
         Returns:
             list[str]: A list of absolute paths to the downloaded images.
         """
         logging.info("Downloading started...")
-        headers = {
-            "authority": "ideogram.ai",
-            "method": "GET",
-            "scheme": "https",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Accept-Language": "en-US,en;q=0.9,hi;q=0.8",
-            "Cache-Control": "max-age=0",
-            "Dnt": "1",
-            "Priority": "u=0, i",
-            "Sec-Ch-Ua": '"Google Chrome";v="125", "Chromium";v="125", "Not.A/Brand";v="24"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"',
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Sec-Gpc": "1",
-            "Upgrade-Insecure-Requests": "1",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-        }
-        created_filenames: list = []
-
-        for index, link in enumerate(links):
+        # Cookies and user agent of the browser. So, the images are served as to the logged in page (without the browser).
+        session = session or self.get_download_session()
+        headers = {"Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8", "Referer": URL}
+
+        def download_image(index: int, link: str) -> str | None:
+            """Download a single image. Returns absolute path of the image or None on failure."""
             if not filenames:
                 filename = datetime.now().strftime(f"ideogram_%Y%m%d%H%M%S_{index}.jpg")
             else:
                 filename = filenames[index]
 
-            headers["path"] = link.lstrip("https://ideogram.ai")  # This is one of the header
-
-            while True:
-                with requests.Session() as session:
-                    session.headers.update(headers)
-                    response = session.get(link)
-                    logging.info(f"Response Content-Type: {response.headers.get('Content-Type')}")
-                    if "image/" in response.headers.get("Content-Type"):
-                        with open(os.path.join(path, filename), "wb") as file:
-                            file.write(response.content)
-                            created_filenames.append(os.path.abspath(file.name))
-                            break
-                    else:
-                        # In case of error, retry. Means that the response content is not an image.
-                        logging.error("Response content is not an image. Retrying...")
-        logging.info("Download completed.")
+            try:
+                response = http_client.fetch(link, headers=headers, accepted_content_type="image/", session=session)
+            except Exception as e:
+                logging.error(f"Failed to download the image {link}. Error Code: 1605. Exception: {e}")
+                return None
+
+            store = output_store.get_output_store()
+            if store:
+                return store.save_bytes(response.content, os.path.join(path, filename))
+            with open(os.path.join(path, filename), "wb") as file:
+                file.write(response.content)
+                return os.path.abspath(file.name)
+
+        # All images of a generation are downloaded at the same time using the shared connection pool.
+        with ThreadPoolExecutor(max_workers=max(1, len(links))) as executor:
+            created_filenames = [filename for filename in executor.map(download_image, range(len(links)), links) if filename]
+
+        logging.info(f"Download completed. {len(created_filenames)} of {len(links)} images downloaded.")
         return created_filenames
 
+    @staticmethod
+    def clean_prompt(prompt: str) -> str:
+        """Convert the prompt into the form used by Ideogram in the 'data-download-name' attribute of the generated images div.
+
+        Args:
+            prompt (str): The prompt used to generate the images.
+
+        Returns:
+            str: The cleaned prompt.
+        """
+        # If prompt is "Lord shiva-parvati, lord vishnu-lakshmi blessing some person named as suraj,ram-kumar, akhilesh"
+        # Then data-download-name will "Lord_shivaparvati_lord_vishnulakshmi_"
+        # Here, Len of data-download-name is 37. All space and special chars are replaced with underscore or simply removed.
+
+        # Logic (Found after analysis - 6th July 2024):
+        # Characters, numbers and underscore are allowed only.
+        # Only spaces are replaced with underscore.
+        # Any other special chars except space are removed completely.
+        # data-download-length is not 40 always because this is not the factor of deciding length.
+        # 40 chars from original prompt is selected (if prompt length is 40 or more) then all special chars except spaces are removed and then spaces are replaced with underscore.
+        # This is why, data-download-name length vary. Because 40 chars are from prompt and after removal/replace, data-download-name is obtained.
+
+        # Extracting only 40 chars of prompt if prompt lenght is more than 40
+        if len(prompt) > 40:
+            prompt = prompt[:40]
+        # Removing special chars except space
+        prompt = re.sub(r"[^a-zA-Z0-9 ]+", "", prompt)
+        prompt = prompt.replace(" ", "_")
+        return prompt
+
     def fetch_images_link(self, prompt: str) -> list:
         """A function to fetch generated image links.
 
@@ -136,43 +165,44 @@ class Ideogram:
             list: A list of image links fetched based on the prompt.
         """
         logging.info("Fetching images links...")
-        wait = WebDriverWait(self.driver, 600)
         # Wait until the paragraph contents changes to "Generation completed"
         logging.info("waiting for generation to complete...")
-        wait.until(
-            EC.text_to_be_present_in_element(
-                (By.CSS_SELECTOR, "p.MuiTypography-root.MuiTypography-body1.css-vsgu40"), "Generation completed"
-            )
+        dom_wait.wait_until_text_present(
+            self.driver, (By.CSS_SELECTOR, "p.MuiTypography-root.MuiTypography-body1.css-vsgu40"), "Generation completed", timeout=600
         )
         logging.info("Generation completed.")
-        links = []
 
-        def clean_prompt(prompt: str) -> str:
-            # If prompt is "Lord shiva-parvati, lord vishnu-lakshmi blessing some person named as suraj,ram-kumar, akhilesh"
-            # Then data-download-name will "Lord_shivaparvati_lord_vishnulakshmi_"
-            # Here, Len of data-download-name is 37. All space and special chars are replaced with underscore or simply removed.
-
-            # Logic (Found after analysis - 6th July 2024):
-            # Characters, numbers and underscore are allowed only.
-            # Only spaces are replaced with underscore.
-            # Any other special chars except space are removed completely.
-            # data-download-length is not 40 always because this is not the factor of deciding length.
-            # 40 chars from original prompt is selected (if prompt length is 40 or more) then all special chars except spaces are removed and then spaces are replaced with underscore.
-            # This is why, data-download-name length vary. Because 40 chars are from prompt and after removal/replace, data-download-name is obtained.
-
-            # Extracting only 40 chars of prompt if prompt lenght is more than 40
-            if len(prompt) > 40:
-                prompt = prompt[:40]
-            # Removing special chars except space
-            prompt = re.sub(r"[^a-zA-Z0-9 ]+", "", prompt)
-            prompt = prompt.replace(" ", "_")
-            return prompt
-
-        prompt = clean_prompt(prompt)
+        if self.network_capture and self.network_capture.is_started:
+            request_ids = self.network_capture.find_values("request_id", where={"prompt": prompt})
+            if request_ids:
+                logging.info(f"Request ID (from the network capture): {request_ids[-1]}")
+                return self.fetch_images_link_by_request_id(request_ids[-1])
+
+        prompt = Ideogram.clean_prompt(prompt)
         request_response_div = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, f"div[data-download-name*='{prompt}']")))
         data_request_id = request_response_div.get_attribute("data-request-id")
         logging.info(f"Request ID: {data_request_id}")
-        image_page_link = f"https://ideogram.ai/g/{data_request_id}/0"  # 0 or 1 or 2 or 3 or 4 (because 4 images are generated)
+        return self.fetch_images_link_by_request_id(data_request_id)
+
+    def fetch_images_link_by_request_id(self, request_id: str) -> list:
+        """A function to fetch generated image links using the request ID of the generation.
+
+        Parameters:
+            request_id (str): The request ID of the generation (value of the 'data-request-id' attribute).
+
+        Returns:
+            list: A list of image links of the generation.
+        """
+        if self.network_capture and self.network_capture.is_started:
+            # Links are already received by the page (in the API responses). So, opening the image page is not required.
+            links = self.network_capture.find_asset_urls(request_id, r"/api/images/")
+            if links:
+                logging.info(f"Fetched {len(links)} images links from the network capture.")
+                return links
+            logging.info("Images links not found in the network capture. Fetching from the image page...")
+
+        links = []
+        image_page_link = f"https://ideogram.ai/g/{request_id}/0"  # 0 or 1 or 2 or 3 or 4 (because 4 images are generated)
         logging.info("Image page link fetched successfully.")
 
         self.driver.get(image_page_link)
@@ -197,6 +227,66 @@ class Ideogram:
         logging.info("Fetched all images links successfully.")
         return list(set(links))
 
+    def fetch_request_ids(self, prompt: str) -> list[str]:
+        """A function to fetch the request IDs of all generations of the prompt available on the current page.
+
+        Parameters:
+            prompt (str): The prompt string that has been used to generate the images.
+
+        Returns:
+            list[str]: Request IDs in the order of the page (latest first).
+        """
+        if self.network_capture and self.network_capture.is_started:
+            request_ids = self.network_capture.find_values("request_id", where={"prompt": prompt})
+            if request_ids:
+                return request_ids[::-1]
+
+        selector = f"div[data-download-name*='{Ideogram.clean_prompt(prompt)}'][data-request-id]"
+        request_ids = [div.get_attribute("data-request-id") for div in self.driver.find_elements(By.CSS_SELECTOR, selector)]
+        return [request_id for request_id in request_ids if request_id]
+
+    def fetch_request_id(self, prompt: str, exclude: set | None = None, timeout: int = 60) -> str | Literal[False]:
+        """A function to fetch the request ID of the generation that has just been submitted (Used in pipelined submission).
+
+        Parameters:
+            prompt (str): The prompt string that has been used to generate the images.
+            exclude (set | None, optional): Request IDs already being tracked or generated before the submission. These will be skipped. Defaults to None.
+            timeout (int, optional): Seconds to wait for the div of the generation. Defaults to 60.
+
+        Returns:
+            str | Literal[False]: The request ID on success else False.
+        """
+        exclude = exclude or set()
+        end_time = time() + timeout
+        while time() < end_time:
+            for request_id in self.fetch_request_ids(prompt):
+                if request_id not in exclude:
+                    return request_id
+            sleep(2)
+
+        logging.error("Request ID of the submitted generation not found. Error Code: 1604")
+        return False
+
+    def is_generation_completed(self, request_id: str) -> bool:
+        """A function to check if the generation of the given request ID is completed (Used in pipelined submission).
+
+        Parameters:
+            request_id (str): The request ID of the generation.
+
+        Returns:
+            bool: True if the generation is completed else False.
+        """
+        if "ideogram.ai/t/" not in self.driver.current_url:
+            self.driver.get("https://ideogram.ai/t/top/1")
+        try:
+            # Images of the generation are rendered only when the generation is completed.
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, f"div[data-request-id='{request_id}'] img"))
+            )
+        except TimeoutException:
+            return False
+        return True
+
     def create_image_with_prompt(self, prompt: str, *args, **kwargs):
         """Function that creates an image with the provided prompt.
 
@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 20th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1500
 """
 
@@ -13,6 +13,7 @@ __version__ = "0.0.0"
 
 
 import logging
+from typing import Iterator
 import os
 from time import sleep
 from datetime import datetime
@@ -24,11 +25,16 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException
+import tools
 
 if __name__ == "__main__":
     from ideogram import Ideogram
 else:
     from db_scripts import AIGeneratorDB
+    from download_manager import DownloadManager
+    from pipeline import run_in_flight_window
+    from session_store import SessionStore
+    from network_capture import NetworkCapture, enable_performance_logging
     from .ideogram import Ideogram
 
 logging.info(f"Old CWD: {os.getcwd()}")
@@ -112,12 +118,13 @@ def parse_config_file(file_path: str = "config.txt", set_as_global: bool = True)
         return config_dict
 
 
-def get_webdriver_instance(browser: str = "chrome", headless=False) -> Chrome | Edge | None:
+def get_webdriver_instance(browser: str = "chrome", headless=False, capture_network: bool = False) -> Chrome | Edge | None:
     """Function to get the webdriver instance for the given browser.
 
     Args:
         browser (str, optional): Desired browser (chrome or edge). Defaults to "chrome".
         headless (bool, optional): Set to True for headless mode. Defaults to False.
+        capture_network (bool, optional): Set to True to enable the performance logging (required by the network capture). Defaults to False.
 
     Returns:
         Chrome | Edge | None: Webdriver instance if browser is supported, else None.
@@ -126,11 +133,15 @@ def get_webdriver_instance(browser: str = "chrome", headless=False) -> Chrome |
         options = ChromeOptions()
         if headless:
             options.add_argument("--headless")
+        if capture_network:
+            enable_performance_logging(options)
         return Chrome(options=options)
     elif browser == "edge":
         options = EdgeOptions()
         if headless:
             options.add_argument("--headless")
+        if capture_network:
+            enable_performance_logging(options)
         return Edge(options=options)
     else:
         print("Browser not supported. Please use Chrome or Edge. Error Code: 1504")
@@ -257,12 +268,19 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
 
     # ------------------ Main workflow will start from here ---------------------
     local_webdriver = False
+    capture_network = tools.load_app_settings().get("capture_network", False)
     if not driver:
-        driver = get_webdriver_instance()
+        driver = get_webdriver_instance(capture_network=capture_network)
         driver.maximize_window()
         local_webdriver = True
 
-    if site_preferences.get("login_required"):
+    # Full login is required only if the saved session of the site is not valid anymore.
+    session_store = SessionStore("ideogram", CONFIG["google_login_options_start"].get("email"))
+    login_required = site_preferences.get("login_required") and not session_store.restore(
+        driver, "https://ideogram.ai/", logged_in_url_part="ideogram.ai/t/"
+    )
+
+    if login_required:
         if CONFIG["google_login_options_start"]["manual_login"] == "Y":
             is_login_success = login_to_google_account(driver)
         else:
@@ -278,40 +296,104 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
             return False
 
     # Creating instance of the Ideogram class
-    ideogram = Ideogram(driver)
-    if site_preferences.get("login_required"):
-        ideogram.login_with_google()
+    # Asset links are taken from the API responses (if capture is available). Otherwise, DOM scraping is used.
+    network_capture = NetworkCapture(driver)
+    if capture_network:
+        network_capture.start()
+    ideogram = Ideogram(driver, network_capture)
+    if login_required and ideogram.login_with_google():
+        session_store.save(driver)
 
-    prompts: list | str = site_preferences["options"]["prompt"]
-    prompts: list = prompts if isinstance(prompts, list) else [prompts]
-    logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+    prompts: list | str | Iterator = site_preferences["options"]["prompt"]
+    prompts: list | Iterator = prompts if isinstance(prompts, (list, Iterator)) else [prompts]
 
     db = AIGeneratorDB()
+    job_ids, prompts = db.load_jobs(
+        site_preferences["category"],
+        site_preferences["site"],
+        "prompt",
+        prompts,
+        site_preferences.get("resume_jobs"),
+        options=dict(site_preferences["options"]),
+        **tools.get_memoization_settings(),
+    )
+    site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+    if isinstance(prompts, list):
+        logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+    else:
+        logging.info("Prompts of this batch are streamed from the sheet.")
 
-    for index, prompt in enumerate(prompts):
-        site_preferences["options"]["prompt"] = prompt
-        logging.info(f"Initiating image generation for the prompt {index}...")
-
-        ideogram.create_image_with_prompt(**site_preferences["options"])
-        image_links = ideogram.fetch_images_link(site_preferences["options"]["prompt"])
-        logging.info("Image links fetched successfully....")
+    def save_output(index: int, prompt: str, image_links: list) -> None:
+        """Queue the download of the generated images. Output details are inserted into the database when the download completes."""
         timestamp = datetime.now()
         filename = generate_file_name(prompt=prompt, timestamp=timestamp)
         filenames = [f"{filename}_{index}.jpg" for index in range(1, 11)]
-        downloaded_images_path = ideogram.download_images(
-            image_links, CONFIG["Default_location_start"]["default_output_location_local"], filenames
-        )
-        logging.info(f"Operation Completed @Ideogram for the prompt {index}")
-
-        # Saving the required entities into the database
-        db.insert_output(
-            file_path=downloaded_images_path,
-            category=site_preferences["category"],
-            site_id=db.get_site_id(site_preferences["site"]),
-            prompt_id=db.insert_prompt(prompt),
-            timestamp=timestamp,
+
+        def on_download_complete(downloaded_images_path: list) -> None:
+            if not downloaded_images_path:
+                logging.error(f"Failed to download all images of the prompt {index}. Marking the job as failed. Error Code: 1507")
+                db.update_jobs_state(job_ids[index], "failed")
+                return
+            logging.info(f"Operation Completed @Ideogram for the prompt {index}")
+
+            # Saving the required entities into the database
+            db.insert_output(
+                file_path=downloaded_images_path,
+                category=site_preferences["category"],
+                site_id=db.get_site_id(site_preferences["site"]),
+                prompt_id=db.insert_prompt(prompt),
+                timestamp=timestamp,
+                job_id=job_ids[index],
+            )
+            logging.info("Output details successfully inserted into the database...")
+
+        download_manager.submit(
+            ideogram.download_images,
+            image_links,
+            CONFIG["Default_location_start"]["default_output_location_local"],
+            filenames,
+            session=ideogram.get_download_session(),  # Cookies are copied here (on the thread driving the browser)
+            on_complete=on_download_complete,
         )
-        logging.info("Output details successfully inserted into the database...")
+
+    # Number of generations to keep in the queue of the site at once. 1 means submit next only when previous is completed.
+    in_flight_window = int(CONFIG.get("pipeline_options_start", {}).get("in_flight_window") or 1)
+    # Downloads are performed in the background. So, the browser moves to the next prompt/image immediately.
+    download_manager = DownloadManager(tools.load_app_settings().get("max_download_workers", 4))
+    failed_job_ids: list[int] = []  # Jobs failed in pipelined submission (Sequential failures remain 'running' and are resumed later)
+
+    if in_flight_window > 1:
+        logging.info(f"Pipelined submission. Keeping {in_flight_window} generations in flight...")
+
+        def submit(prompt: str, in_flight_ids: set) -> str | bool:
+            if "ideogram.ai/t/" not in driver.current_url:
+                driver.get("https://ideogram.ai/t/top/1")
+            # Generations of the same prompt done before this submission must not be confused with the new one.
+            exclude = in_flight_ids | set(ideogram.fetch_request_ids(prompt))
+            options = {**site_preferences["options"], "prompt": prompt}
+            ideogram.create_image_with_prompt(**options)
+            return ideogram.fetch_request_id(prompt, exclude=exclude)
+
+        failed_job_ids = [
+            job_ids[index]
+            for index, _ in run_in_flight_window(
+                prompts, submit, ideogram.is_generation_completed, ideogram.fetch_images_link_by_request_id, save_output, in_flight_window
+            )
+        ]
+    else:
+        for index, prompt in enumerate(prompts):
+            options = {**site_preferences["options"], "prompt": prompt}
+            logging.info(f"Initiating image generation for the prompt {index}...")
+
+            ideogram.create_image_with_prompt(**options)
+            image_links = ideogram.fetch_images_link(prompt)
+            logging.info("Image links fetched successfully....")
+            save_output(index, prompt, image_links)
+
+    logging.info("Waiting for the pending downloads to complete...")
+    download_manager.shutdown()
+    db.flush()  # Writing the buffered outputs of the batch
+    db.update_jobs_state(failed_job_ids, "failed")
 
     if local_webdriver:
         driver.quit()  # Closing the browser
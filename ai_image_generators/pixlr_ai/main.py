@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 29th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1400
 """
 
@@ -15,12 +15,14 @@ import os
 from time import sleep
 import tools
 import logging
+from typing import Iterator
 from datetime import datetime
 
 if __name__ == "__main__":
     from pixlr import Pixlr
 else:
     from db_scripts import AIGeneratorDB
+    from session_store import SessionStore
     from .pixlr import Pixlr
 
 
@@ -106,19 +108,38 @@ def main(site_preferences: dict, driver=None, *args, **kwargs):
 
     pixlr = Pixlr(driver)
 
-    if site_preferences.get("login_required"):
-        pixlr.login(SETTINGS["pixlr_credentials"]["email"], SETTINGS["pixlr_credentials"]["password"])
+    # Full login is required only if the saved session of the site is not valid anymore.
+    session_store = SessionStore("pixlr", SETTINGS["pixlr_credentials"]["email"])
+    # Login button is checked only after the generator (rendered in both states) is visible. So, a page not rendered yet isn't accepted.
+    if site_preferences.get("login_required") and not session_store.restore(
+        driver, Pixlr.URL, logged_out_selector="#head-login", ready_selector="#generator-main-modal"
+    ):
+        pixlr.login(SETTINGS["pixlr_credentials"]["email"], SETTINGS["pixlr_credentials"]["password"])  # Raises exception on failure
+        session_store.save(driver)
 
-    prompts: list | str = site_preferences["options"]["prompt"]
-    prompts: list = prompts if isinstance(prompts, list) else [prompts]
-    logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+    prompts: list | str | Iterator = site_preferences["options"]["prompt"]
+    prompts: list | Iterator = prompts if isinstance(prompts, (list, Iterator)) else [prompts]
 
     db = AIGeneratorDB()
+    job_ids, prompts = db.load_jobs(
+        site_preferences["category"],
+        site_preferences["site"],
+        "prompt",
+        prompts,
+        site_preferences.get("resume_jobs"),
+        options=dict(site_preferences["options"]),
+        **tools.get_memoization_settings(),
+    )
+    site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+    if isinstance(prompts, list):
+        logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+    else:
+        logging.info("Prompts of this batch are streamed from the sheet.")
 
     for index, prompt in enumerate(prompts):
-        site_preferences["options"]["prompt"] = prompt
+        options = {**site_preferences["options"], "prompt": prompt}
         logging.info(f"Initiating image generation for the prompt index {index}...")
-        pixlr.generate_image(**site_preferences["options"])
+        pixlr.generate_image(**options)
         images_links = pixlr.fetch_images_link()
         logging.info("Image links fetched successfully....")
         timestamp = datetime.now()
@@ -133,9 +154,11 @@ def main(site_preferences: dict, driver=None, *args, **kwargs):
             site_id=db.get_site_id(site_preferences["site"]),
             prompt_id=db.insert_prompt(prompt),
             timestamp=timestamp,
+            job_id=job_ids[index],
         )
         logging.info("Output details successfully inserted into the database...")
 
+    db.flush()  # Writing the buffered outputs of the batch
     if local_webdriver:
         driver.quit()
     return True
@@ -2,7 +2,7 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 27th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1200
 """
 
@@ -16,8 +16,84 @@ from selenium.webdriver import Chrome, Edge
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException
+import dom_wait
+import dom_extract
+import form_filler
+import output_store
+
+# {option: {value: element ID}} of the option panels of the generator form.
+OPTIONS: dict[str, dict[str, str]] = {
+    "aspect": {
+        "Square": "aspect-square",
+        "Wide": "aspect-wide",
+        "Tall": "aspect-tall",
+    },
+    "style": {
+        "None": "style-none",
+        "Enhance": "style-enhance",
+        "Anime": "style-anime",
+        "Photographic": "style-photographic",
+        "Digital Art": "style-digital-art",
+        "Comic Book": "style-comic-book",
+        "Fantasy Art": "style-fantasy-art",
+        "Analog Film": "style-analog-film",
+        "Neon Punk": "style-neon-punk",
+        "Isometric": "style-isometric",
+        "Low Poly": "style-low-poly",
+        "Origami": "style-origami",
+        "Line Art": "style-line-art",
+        "Craft Clay": "style-craft-clay",
+        "Cinematic": "style-cinematic",
+        "3D Model": "style-3d-model",
+        "Pixel Art": "style-pixel-art",
+    },
+    "color": {
+        "None": "color-none",
+        "Warm Tone": "color-warm-tone",
+        "Cool Tone": "color-cool-tone",
+        "Muted Colors": "color-muted-colors",
+        "Vibrant Colors": "color-vibrant-colors",
+        "Pastel Colors": "color-pastel-colors",
+        "Black And White": "color-black-and-white",
+    },
+    "lighting": {
+        "None": "lighting-none",
+        "Studio": "lighting-studio",
+        "Backlight": "lighting-backlight",
+        "Sunlight": "lighting-sunlight",
+        "Dramatic": "lighting-dramatic",
+        "Low Light": "lighting-low-light",
+        "Volumetric": "lighting-volumetric",
+        "Rim Lighting": "lighting-rim-lighting",
+        "Dimly Lit": "lighting-dimly-lit",
+        "Golden Hour": "lighting-golden-hour",
+        "Crepuscular Rays": "lighting-crepuscular-rays",
+    },
+    "composition": {
+        "None": "composition-none",
+        "Blurry Background": "composition-blurry-background",
+        "Close Up": "composition-close-up",
+        "Wide Angle": "composition-wide-angle",
+        "Narrow Depth Of Field": "composition-narrow-depth-of-field",
+        "Shot From Below": "composition-shot-from-below",
+        "Shot From Above": "composition-shot-from-above",
+        "Macrophotography": "composition-macrophotography",
+    },
+}
+
+# Generator form. Applied by form_filler in a single round trip (no hover and click per option).
+GENERATOR_FORM: list[dict] = [
+    {"action": "click", "locator": (By.ID, "generator-main-modal")},  # Prompt-options container. So, all elements appear on the screen.
+    {"option": "prompt", "action": "fill", "locator": (By.ID, "generator-positive")},
+    {"option": "negative_prompt", "action": "click", "locator": (By.ID, "negative-prompt-toggle")},
+    {"option": "negative_prompt", "action": "fill", "locator": (By.ID, "generator-negative")},
+    *(
+        {"option": option, "action": "click", "choices": {value: (By.ID, element_id) for value, element_id in choices.items()}}
+        for option, choices in OPTIONS.items()
+    ),
+    {"action": "click", "locator": (By.CSS_SELECTOR, ".button.med.positive.but"), "enabled": True},
+]
 
 
 class Pixlr:
@@ -93,116 +169,18 @@ class Pixlr:
         logging.info("Generating image...")
         self.driver.get(Pixlr.URL)
 
-        # Clicking on the prompt-options container. So, all elements appear on the screen.
-        self.wait.until(EC.visibility_of_element_located((By.ID, "generator-main-modal"))).click()
-
-        # Writing prompt
-        self.wait.until(EC.visibility_of_element_located((By.ID, "generator-positive"))).send_keys(prompt)
-        logging.info("Prompt written successfully...")
-
-        # Negative prompt if provided
-        if negative_prompt:
-            # Clicking on negative prompt toggle checkbox
-            # self.driver.find_element(By.ID, "negative-prompt-toggle").click() # Not working
-            self.driver.execute_script('document.querySelector("#negative-prompt-toggle").click()')
-            # Writing negative prompt
-            self.wait.until(EC.visibility_of_element_located((By.ID, "generator-negative"))).send_keys(negative_prompt)
-            logging.info("Negative prompt written successfully...")
-
-        logging.info("It's time to select options if provided else default will use...")
-        # selenium.common.exceptions.ElementNotInteractableException: Message: element not interactable (Means we can't interact with that element. Cause may be element is hidden, required hover to visible...)
-        # Above exception is raised when I have tried to click on the options that visible after mouse hover.
-        # So, I am going to use ActionChain to simulate the mouse hover, so element became interactable and then click.
-
-        options: dict[str, dict[str, str]] = {
-            "aspect": {
-                "Square": "aspect-square",
-                "Wide": "aspect-wide",
-                "Tall": "aspect-tall",
-            },
-            "style": {
-                "None": "style-none",
-                "Enhance": "style-enhance",
-                "Anime": "style-anime",
-                "Photographic": "style-photographic",
-                "Digital Art": "style-digital-art",
-                "Comic Book": "style-comic-book",
-                "Fantasy Art": "style-fantasy-art",
-                "Analog Film": "style-analog-film",
-                "Neon Punk": "style-neon-punk",
-                "Isometric": "style-isometric",
-                "Low Poly": "style-low-poly",
-                "Origami": "style-origami",
-                "Line Art": "style-line-art",
-                "Craft Clay": "style-craft-clay",
-                "Cinematic": "style-cinematic",
-                "3D Model": "style-3d-model",
-                "Pixel Art": "style-pixel-art",
-            },
-            "color": {
-                "None": "color-none",
-                "Warm Tone": "color-warm-tone",
-                "Cool Tone": "color-cool-tone",
-                "Muted Colors": "color-muted-colors",
-                "Vibrant Colors": "color-vibrant-colors",
-                "Pastel Colors": "color-pastel-colors",
-                "Black And White": "color-black-and-white",
-            },
-            "lighting": {
-                "None": "lighting-none",
-                "Studio": "lighting-studio",
-                "Backlight": "lighting-backlight",
-                "Sunlight": "lighting-sunlight",
-                "Dramatic": "lighting-dramatic",
-                "Low Light": "lighting-low-light",
-                "Volumetric": "lighting-volumetric",
-                "Rim Lighting": "lighting-rim-lighting",
-                "Dimly Lit": "lighting-dimly-lit",
-                "Golden Hour": "lighting-golden-hour",
-                "Crepuscular Rays": "lighting-crepuscular-rays",
-            },
-            "composition": {
-                "None": "composition-none",
-                "Blurry Background": "composition-blurry-background",
-                "Close Up": "composition-close-up",
-                "Wide Angle": "composition-wide-angle",
-                "Narrow Depth Of Field": "composition-narrow-depth-of-field",
-                "Shot From Below": "composition-shot-from-below",
-                "Shot From Above": "composition-shot-from-above",
-                "Macrophotography": "composition-macrophotography",
-            },
-        }
-        actions = ActionChains(self.driver)
-        self.actions: ActionChains = actions
-
-        aspect_option_button_label = self.driver.find_element(By.ID, "aspect-type-label")
-        style_option_button_label = self.driver.find_element(By.ID, "style-type-label")
-        color_option_button_label = self.driver.find_element(By.ID, "color-type-label")
-        lighting_option_button_label = self.driver.find_element(By.ID, "lighting-type-label")
-        composition_option_button_label = self.driver.find_element(By.ID, "composition-type-label")
-
-        if aspect:
-            self.actions.move_to_element(aspect_option_button_label).click_and_hold().perform()
-            self.driver.find_element(By.ID, options["aspect"][aspect.title()]).click()
-
-        if style:
-            self.actions.move_to_element(style_option_button_label).click_and_hold().perform()
-            self.driver.find_element(By.ID, options["style"][style.title()]).click()
-
-        if color:
-            self.actions.move_to_element(color_option_button_label).click_and_hold().perform()
-            self.driver.find_element(By.ID, options["color"][color.title()]).click()
-
-        if lighting:
-            self.actions.move_to_element(lighting_option_button_label).click_and_hold().perform()
-            self.driver.find_element(By.ID, options["lighting"][lighting.title()]).click()
-
-        if composition:
-            self.actions.move_to_element(composition_option_button_label).click_and_hold().perform()
-            self.driver.find_element(By.ID, options["composition"][composition.title()]).click()
-
-        generate_button_selector = ".button.med.positive.but"
-        self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, generate_button_selector))).click()
+        # Prompt, negative prompt, options (if provided else default will use) and the generate button in a single round trip.
+        # Options are clicked by JavaScript. So, the hover (to make them interactable) is not required.
+        values = dict(
+            prompt=prompt,
+            negative_prompt=negative_prompt,
+            aspect=aspect,
+            style=style,
+            color=color,
+            lighting=lighting,
+            composition=composition,
+        )
+        form_filler.fill_form(self.driver, GENERATOR_FORM, values)
         logging.info("Generate button clicked successfully....")
 
     def fetch_images_link(self) -> list:
@@ -219,13 +197,13 @@ class Pixlr:
         # Images are displayed when generation completed. It may take from 15 sec to 300 sec.
         logging.info("Waiting for image to appear...")
         t1 = time.time()
-        wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "img.result")))
+        dom_wait.wait_until_present(self.driver, (By.CSS_SELECTOR, "img.result"), timeout=300, visible=True)
         t2 = time.time()
         logging.debug(f"Images appeared in {t2-t1} seconds")
 
-        images = image_container.find_elements(By.CSS_SELECTOR, "img.result")
+        images = dom_extract.extract(self.driver, (By.CSS_SELECTOR, "img.result"), {"src": "src"}, root=image_container)
         logging.info("Images links fetched successfully...")
-        return [image.get_attribute("src") for image in images]
+        return [image["src"] for image in images]
 
     def download_images(self, links: list[str], path: str, filename: str | None = None) -> list[str]:
         """Download images from a list of links to the specified path with optional custom filenames.
@@ -247,6 +225,7 @@ class Pixlr:
         logging.info("Image data decoded successfully....")
 
         created_filenames: list = []
+        store = output_store.get_output_store()
 
         for index, image_data in enumerate(decoded_images_data):
             if original_filename:
@@ -254,6 +233,9 @@ class Pixlr:
             else:
                 filename = datetime.now().strftime(f"pixlr_%Y%m%d%H%M%S_{index}.png")
 
+            if store:
+                created_filenames.append(store.save_bytes(image_data, os.path.join(path, filename)))
+                continue
             with open(os.path.join(path, filename), "wb") as file:
                 file.write(image_data)
                 created_filenames.append(os.path.abspath(file.name))
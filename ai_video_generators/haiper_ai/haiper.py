@@ -2,36 +2,70 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 17th May 2024
-Last-modified: 21st June 2024
+Last-modified: 17th October 2026
 Error-series: 1400
 """
 
 import logging
 import os
-from time import sleep
+from time import sleep, time
 from typing import Any, Literal
 from datetime import datetime
-import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver import Chrome, Edge
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import requests
+import http_client
+import output_store
+import dom_wait
+import dom_extract
+import form_filler
+from network_capture import NetworkCapture
 
 URL = "https://haiper.ai/auth/signin"
 
+# Creation settings (prompt, seed and duration) and the create button. Applied by form_filler in a single round trip.
+CREATION_SETTINGS_FORM: list[dict] = [
+    {"option": "prompt", "action": "fill", "locator": (By.TAG_NAME, "textarea")},
+    {"action": "click", "locator": (By.CSS_SELECTOR, 'button[aria-label="Creation Setting"]')},  # Option button
+    {"option": "seed", "action": "fill", "locator": (By.CSS_SELECTOR, "input[name='seed']")},
+    {
+        "option": "duration",
+        "action": "click",
+        "choices": {"2": (By.CSS_SELECTOR, "button[value='2']"), "4": (By.CSS_SELECTOR, "button[value='4']")},
+        "default": "2",  # default value in haiper
+    },
+    {"option": "image", "action": "wait", "locator": (By.CSS_SELECTOR, "img[alt='thumbnail']"), "timeout": 60},  # Image uploaded
+    {
+        "action": "click",
+        "locator": (By.XPATH, '//button[@aria-label="Creation Setting"]/following-sibling::button[1]'),  # Create button
+        "enabled": True,
+    },
+]
+PROMPT_FORM: list[dict] = [
+    # Create video with text
+    {"action": "click", "locator": (By.XPATH, "/html/body/main/article/section/div/div/div[2]/div[1]/div/div/div/div[1]"), "timeout": 60},
+    *CREATION_SETTINGS_FORM,
+]
+
 
 class Haiper:
     """Class to handle all operations related to the Haiper."""
 
-    def __init__(self, driver: Chrome | Edge | Any):
+    GENERATION_IN_PROGRESS_MESSAGES = ("Queuing for generation", "Your video is being generated")
+
+    def __init__(self, driver: Chrome | Edge | Any, network_capture: NetworkCapture | None = None):
         """Constructor of Haiper class.
         Initializes the class with the given driver object and sets up a WebDriverWait object.
 
         Args:
             driver (Chrome | Edge | Any): The driver object to be used for the class.
+            network_capture (NetworkCapture | None, optional): Started network capture of the driver. If provided then video links are taken from the API responses. Defaults to None.
         """
         self.driver = driver
+        self.network_capture = network_capture
         self.wait = WebDriverWait(self.driver, 60)
 
     def login_with_google(self) -> bool:
@@ -79,24 +113,34 @@ class Haiper:
             logging.info("Login success.")
             return True
 
-    def download_video(self, link: str, path: str, filename: str = None) -> str:
+    def get_download_session(self) -> requests.Session:
+        """Get a session with the cookies of the logged in browser. Call it on the thread driving the browser (like when the download is queued)."""
+        return http_client.get_browser_session(self.driver)
+
+    def download_video(self, link: str, path: str, filename: str = None, session: requests.Session | None = None) -> str:
         """Download a video from the given link and save it to the specified path with an optional filename.
 
         Args:
             link (str): The URL of the video to download.
             path (str): The directory path where the video will be saved.
             filename (str, optional): The name of the file to save the video as. If not provided, a default filename will be generated.
+            session (requests.Session | None, optional): Session with the cookies of the logged in browser (See get_download_session()).
+                Must be passed if called from a download (worker) thread. Defaults to None (cookies are read from the browser).
 
         Returns:
             str: The absolute path of the saved file.
         """
         if not filename:
             filename = datetime.now().strftime("haiper_%Y%m%d%H%M%S.mp4")
-        response = requests.get(link)
-        with open(os.path.join(path, filename), "wb") as file:
-            file.write(response.content)
-            created_filename = file.name
-        return os.path.abspath(created_filename)
+        file_path = os.path.join(path, filename)
+        session = session or self.get_download_session()
+        store = output_store.get_output_store()
+        if store:
+            # file_path is created as a link of the video in the store
+            return store.download(link, file_path, session=session)
+        # Streaming in chunks. So, memory usage doesn't depend on the size of the video.
+        http_client.stream_download(link, file_path, session=session)
+        return os.path.abspath(file_path)
 
     def fetch_generated_video_link(self) -> str | Literal[False]:
         """A function to fetch the generated video link after a series of actions to locate and retrieve it.
@@ -116,13 +160,10 @@ class Haiper:
         else:
             logging.info("URL changes to haiper.ai/creations")
             sleep(2)
-            wait = WebDriverWait(self.driver, 800)
 
             logging.info("Finding all containers with video ID.")
             # Wait until the generating/queuing message removed from the DOM.
             partial_id = "creation-card-"
-            # video_id_containers = self.driver.find_elements(By.XPATH, f'//*[contains(@id, "{partial_id}")]') # Working
-            video_id_containers = self.driver.find_elements(By.CSS_SELECTOR, "div[id*=creation-card-]")
 
             try:
                 video_generating_info_div = self.wait.until(
@@ -133,16 +174,16 @@ class Haiper:
                     EC.presence_of_element_located((By.XPATH, '//div[text()="Your video is being generated"]'))
                 )
             else:
-                video_generating_info_div = wait.until(
-                    EC.presence_of_element_located((By.XPATH, '//div[text()="Your video is being generated"]'))
+                video_generating_info_div = dom_wait.wait_until_present(
+                    self.driver, (By.XPATH, '//div[text()="Your video is being generated"]'), timeout=800
                 )
             logging.info("Video generation info div is located.")
 
-            container_video_id = None
-            for container in video_id_containers:
-                if video_generating_info_div in container.find_elements(By.TAG_NAME, "div"):
-                    container_video_id = container.get_attribute("id")
-                    break
+            # Container (with video ID) of the info div is found inside the page (instead of reading all divs of every container).
+            containers = dom_extract.extract(
+                self.driver, (dom_extract.CLOSEST, "div[id*=creation-card-]"), {"id": "id"}, root=video_generating_info_div
+            )
+            container_video_id = containers[0]["id"] if containers else None
 
             if container_video_id:
                 video_id = container_video_id.lstrip(partial_id)
@@ -155,16 +196,86 @@ class Haiper:
 
             try:
                 # Wait until video generation is in process.
-                wait.until_not(EC.presence_of_element_located((By.XPATH, '//div[text()="Your video is being generated"]')))
+                dom_wait.wait_until_absent(self.driver, (By.XPATH, '//div[text()="Your video is being generated"]'), timeout=800)
             except TimeoutException:
                 print("Video generating taking too much time (10 min+). Error Code: 1407")
                 logging.exception("Video generating taking too much time (10 min+). Error Code: 1407")
                 return False
 
-            self.driver.get(f"https://haiper.ai/creation/{video_id}")  # Opening the video page
-            mp4_link = self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "video"))).get_attribute("src")
-            self.driver.get("https://haiper.ai/explore")  # Opening the explore page
-            return mp4_link
+            return self.fetch_video_link_by_id(video_id)
+
+    def fetch_video_link_by_id(self, video_id: str) -> str:
+        """Fetch the link of the generated video using its ID (ID of the creation card).
+
+        Args:
+            video_id (str): The ID of the video (without 'creation-card-' prefix).
+
+        Returns:
+            str: The link of the generated video (mp4).
+        """
+        if self.network_capture and self.network_capture.is_started:
+            # Link is already received by the page (in the API responses). So, opening the video page is not required.
+            mp4_links = self.network_capture.find_asset_urls(video_id, r"\.mp4(\?|$)")
+            if mp4_links:
+                logging.info(f"Video link of {video_id} found in the network capture.")
+                return mp4_links[0]
+            logging.info(f"Video link of {video_id} not found in the network capture. Fetching from the video page...")
+
+        self.driver.get(f"https://haiper.ai/creation/{video_id}")  # Opening the video page
+        mp4_link = self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "video"))).get_attribute("src")
+        self.driver.get("https://haiper.ai/explore")  # Opening the explore page
+        return mp4_link
+
+    def fetch_video_id(self, exclude: set | None = None, timeout: int = 60) -> str | Literal[False]:
+        """Fetch the ID of the video whose generation has just been submitted (Used in pipelined submission).
+
+        Args:
+            exclude (set | None, optional): IDs of the videos already being tracked. These will be skipped. Defaults to None.
+            timeout (int, optional): Seconds to wait for the creation card of the new video. Defaults to 60.
+
+        Returns:
+            str | Literal[False]: The ID of the video (without 'creation-card-' prefix) on success else False.
+        """
+        exclude = exclude or set()
+        partial_id = "creation-card-"
+        try:
+            # When submit button is clicked then url changes to 'creation page url' in few seconds.
+            self.wait.until(EC.url_contains("haiper.ai/creations"))
+        except TimeoutException:
+            logging.error("URL doesn't changed to haiper.ai/creations. Probably submit button is not clicked. Error Code: 1410")
+            return False
+
+        end_time = time() + timeout
+        while time() < end_time:
+            # Cards are in the order of creation (latest first). So, first untracked card in progress is the new video.
+            for container in self.driver.find_elements(By.CSS_SELECTOR, "div[id*=creation-card-]"):
+                video_id = container.get_attribute("id").removeprefix(partial_id)
+                text = container.get_property("innerText")
+                if video_id not in exclude and any(message in text for message in Haiper.GENERATION_IN_PROGRESS_MESSAGES):
+                    return video_id
+            sleep(2)
+
+        logging.error("Creation card of the submitted video not found. Error Code: 1411")
+        return False
+
+    def is_generation_completed(self, video_id: str) -> bool:
+        """Check if the generation of the video is completed (Used in pipelined submission).
+
+        Args:
+            video_id (str): The ID of the video (without 'creation-card-' prefix).
+
+        Returns:
+            bool: True if the video is generated, False if it's still in queue/generating.
+        """
+        if "haiper.ai/creations" not in self.driver.current_url:
+            self.driver.get("https://haiper.ai/creations")
+        try:
+            container = self.wait.until(EC.presence_of_element_located((By.ID, f"creation-card-{video_id}")))
+        except TimeoutException:
+            logging.warning(f"Creation card of the video {video_id} not found.")
+            return False
+        text = container.get_property("innerText")
+        return not any(message in text for message in Haiper.GENERATION_IN_PROGRESS_MESSAGES)
 
     def create_video_with_prompt(self, prompt: str, seed: str | int, duration: str | int = 2, *args, **kwargs):
         """Create video with the given prompt text, seed value, and optional duration setting.
@@ -190,25 +301,7 @@ class Haiper:
             self.driver.get("https://haiper.ai/")
 
         try:
-            create_video_with_text_div_xpath = "/html/body/main/article/section/div/div/div[2]/div[1]/div/div/div/div[1]"
-            self.wait.until(EC.element_to_be_clickable((By.XPATH, create_video_with_text_div_xpath))).click()
-
-            self.driver.find_element(By.TAG_NAME, "textarea").send_keys(prompt)  # Prompt
-            option_button = self.driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Creation Setting"]')
-            option_button.click()  # Clicking option button
-            self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[name='seed']"))).send_keys(seed)  # seed
-
-            duration_2_sec_button_selector = "button[value='2']"  # default value in haiper
-            duration_4_sec_button_selector = "button[value='4']"
-            if str(duration) == "4":
-                self.driver.find_element(By.CSS_SELECTOR, duration_4_sec_button_selector).click()
-            else:
-                self.driver.find_element(By.CSS_SELECTOR, duration_2_sec_button_selector).click()
-
-            logging.debug("Going to click on the create button.")
-            # create_button = option_button.find_element(By.XPATH, "./following-sibling::button[1]")
-            wait = WebDriverWait(option_button, 30)
-            wait.until(EC.element_to_be_clickable((By.XPATH, "./following-sibling::button[1]"))).click()  # Clicking create button
+            form_filler.fill_form(self.driver, PROMPT_FORM, dict(prompt=prompt, seed=seed, duration=duration))
         except Exception as e:
             print("Something went wrong while generating video with prompt. Error Code: 1402")
             logging.error("Something went wrong while generating video with prompt. Error Code: 1402")
@@ -240,37 +333,15 @@ class Haiper:
             logging.info("Navigating to https://haiper.ai/")
             self.driver.get("https://haiper.ai/")
 
-        def wait_until_image_uploaded():
-            """Wait until the image is uploaded by waiting for the presence of the specified CSS selector."""
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "img[alt='thumbnail']")))
-
         try:
             animate_your_image_div_xpath = "/html/body/main/article/section/div/div/div[2]/div[1]/div/div/div/div[2]"
             self.wait.until(EC.element_to_be_clickable((By.XPATH, animate_your_image_div_xpath))).click()
 
-            # Image upload
+            # Image upload (file input can't be filled by JavaScript)
             self.driver.find_element(By.CSS_SELECTOR, 'input[type="file"]').send_keys(image)
-            if prompt:
-                self.driver.find_element(By.TAG_NAME, "textarea").send_keys(prompt)  # Prompt
-
-            option_button = self.driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Creation Setting"]')
-            option_button.click()  # Clicking option button
-            self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[name='seed']"))).send_keys(seed)  # seed
-
-            duration_2_sec_button_selector = "button[value='2']"  # default value in haiper
-            duration_4_sec_button_selector = "button[value='4']"
-            if str(duration) == "4":
-                self.driver.find_element(By.CSS_SELECTOR, duration_4_sec_button_selector).click()
-            else:
-                self.driver.find_element(By.CSS_SELECTOR, duration_2_sec_button_selector).click()
-
-            # Waiting until the image uploaded and the submit-button will clickable.
-            wait_until_image_uploaded()
 
-            logging.debug("Going to click on the create button.")
-            # create_button = option_button.find_element(By.XPATH, "./following-sibling::button[1]")
-            wait = WebDriverWait(option_button, 30)
-            wait.until(EC.element_to_be_clickable((By.XPATH, "./following-sibling::button[1]"))).click()  # Clicking create button
+            # Waiting until the image uploaded and the submit-button will clickable, then clicking create button (in the same round trip).
+            form_filler.fill_form(self.driver, CREATION_SETTINGS_FORM, dict(image=image, prompt=prompt, seed=seed, duration=duration))
         except Exception as e:
             print("Something went wrong while generating video with image. Error Code: 1403")
             logging.error("Something went wrong while generating video with image. Error Code: 1404")
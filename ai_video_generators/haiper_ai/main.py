@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 17th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1300
 """
 
@@ -13,6 +13,7 @@ __version__ = "0.0.0"
 
 
 import logging
+from typing import Iterator
 from datetime import datetime
 import tools
 import os
@@ -30,6 +31,10 @@ if __name__ == "__main__":
     from haiper import Haiper
 else:
     from db_scripts import AIGeneratorDB
+    from download_manager import DownloadManager
+    from pipeline import run_in_flight_window
+    from session_store import SessionStore
+    from network_capture import NetworkCapture, enable_performance_logging
     from .haiper import Haiper
 
 logging.info(f"Old CWD: {os.getcwd()}")
@@ -113,12 +118,13 @@ def parse_config_file(file_path: str = "config.txt", set_as_global: bool = True)
         return config_dict
 
 
-def get_webdriver_instance(browser: str = "chrome", headless=False) -> Chrome | Edge | None:
+def get_webdriver_instance(browser: str = "chrome", headless=False, capture_network: bool = False) -> Chrome | Edge | None:
     """Function to get the webdriver instance for the given browser.
 
     Args:
         browser (str, optional): Desired browser (chrome or edge). Defaults to "chrome".
         headless (bool, optional): Set to True for headless mode. Defaults to False.
+        capture_network (bool, optional): Set to True to enable the performance logging (required by the network capture). Defaults to False.
 
     Returns:
         Chrome | Edge | None: Webdriver instance if browser is supported, else None.
@@ -127,11 +133,15 @@ def get_webdriver_instance(browser: str = "chrome", headless=False) -> Chrome |
         options = ChromeOptions()
         if headless:
             options.add_argument("--headless")
+        if capture_network:
+            enable_performance_logging(options)
         return Chrome(options=options)
     elif browser == "edge":
         options = EdgeOptions()
         if headless:
             options.add_argument("--headless")
+        if capture_network:
+            enable_performance_logging(options)
         return Edge(options=options)
     else:
         print("Browser not supported. Please use Chrome or Edge. Error Code: 1304")
@@ -210,12 +220,19 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
 
     # ------------------ Main workflow will start from here ---------------------
     local_webdriver = False
+    capture_network = tools.load_app_settings().get("capture_network", False)
     if not driver:
-        driver = get_webdriver_instance()
+        driver = get_webdriver_instance(capture_network=capture_network)
         driver.maximize_window()
         local_webdriver = True
 
-    if site_preferences.get("login_required"):
+    # Full login is required only if the saved session of the site is not valid anymore.
+    session_store = SessionStore("haiper", CONFIG["google_login_options_start"].get("email"))
+    login_required = site_preferences.get("login_required") and not session_store.restore(
+        driver, "https://haiper.ai/auth/signin", logged_out_url_part="auth/signin"
+    )
+
+    if login_required:
         if CONFIG["google_login_options_start"]["manual_login"] == "Y":
             is_login_success = login_to_google_account(driver)
         else:
@@ -231,9 +248,13 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
             return False
 
     # Creating instance of the Haiper class
-    haiper = Haiper(driver)
-    if site_preferences.get("login_required"):
-        haiper.login_with_google()
+    # Asset links are taken from the API responses (if capture is available). Otherwise, DOM scraping is used.
+    network_capture = NetworkCapture(driver)
+    if capture_network:
+        network_capture.start()
+    haiper = Haiper(driver, network_capture)
+    if login_required and haiper.login_with_google():
+        session_store.save(driver)
 
     def is_image_option_available(site_preferences: dict) -> bool:
         """
@@ -252,69 +273,166 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
             return True
         return False
 
+    # Number of generations to keep in the queue of the site at once. 1 means submit next only when previous is completed.
+    in_flight_window = int(CONFIG.get("pipeline_options_start", {}).get("in_flight_window") or 1)
+    # Downloads are performed in the background. So, the browser moves to the next prompt/image immediately.
+    download_manager = DownloadManager(tools.load_app_settings().get("max_download_workers", 4))
+    failed_job_ids: list[int] = []  # Jobs failed in pipelined submission (Sequential failures remain 'running' and are resumed later)
+
     if is_image_option_available(site_preferences):
         logging.info("Initiating video generation from images (Haiper AI)...")
 
-        images: list | str = site_preferences["options"]["image"]
-        images: list = images if isinstance(images, list) else [images]
-        logging.info(f"Total number of images path in this batch is {len(images)}")
+        images: list | str | Iterator = site_preferences["options"]["image"]
+        images: list | Iterator = images if isinstance(images, (list, Iterator)) else [images]
 
         db = AIGeneratorDB()
+        job_ids, images = db.load_jobs(
+            site_preferences["category"],
+            site_preferences["site"],
+            "image",
+            images,
+            site_preferences.get("resume_jobs"),
+            options=dict(site_preferences["options"]),
+            **tools.get_memoization_settings(),
+        )
+        site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+        if isinstance(images, list):
+            logging.info(f"Total number of images path in this batch is {len(images)}")
+        else:
+            logging.info("Images of this batch are streamed from the sheet.")
 
-        for index, image in enumerate(images):
-            site_preferences["options"]["image"] = image
-            logging.info(f"Initiating video generation for the image index {index}...")
-            haiper.create_video_with_image(**site_preferences["options"])
-            generated_video_link = haiper.fetch_generated_video_link()
-            logging.info("Video link successfully fetched...")
+        def save_output(index: int, image: str, generated_video_link: str) -> None:
+            """Queue the download of the generated video. Output details are inserted into the database when the download completes."""
             timestamp = datetime.now()
             filename = tools.generate_file_name(image_path=image, timestamp=timestamp, extension="mp4")
-            downloaded_video_path = haiper.download_video(
-                generated_video_link, CONFIG["Default_location_start"]["default_output_location_local"], filename
-            )
-            logging.info(f"Operation Completed for the image index {index}")
-
-            # Saving the required entities into the database
-            db.insert_output(
-                file_path=downloaded_video_path,
-                category=site_preferences["category"],
-                site_id=db.get_site_id(site_preferences["site"]),
-                image_id=db.insert_image(image),
-                timestamp=timestamp,
+
+            def on_download_complete(downloaded_video_path: str) -> None:
+                logging.info(f"Operation Completed for the image index {index}")
+
+                # Saving the required entities into the database
+                db.insert_output(
+                    file_path=downloaded_video_path,
+                    category=site_preferences["category"],
+                    site_id=db.get_site_id(site_preferences["site"]),
+                    image_id=db.insert_image(image),
+                    timestamp=timestamp,
+                    job_id=job_ids[index],
+                )
+                logging.info("Output details successfully inserted into the database...")
+
+            download_manager.submit(
+                haiper.download_video,
+                generated_video_link,
+                CONFIG["Default_location_start"]["default_output_location_local"],
+                filename,
+                session=haiper.get_download_session(),  # Cookies are copied here (on the thread driving the browser)
+                on_complete=on_download_complete,
             )
-            logging.info("Output details successfully inserted into the database...")
+
+        if in_flight_window > 1:
+            logging.info(f"Pipelined submission. Keeping {in_flight_window} generations in flight...")
+
+            def submit(image: str, in_flight_ids: set) -> str | bool:
+                driver.get("https://haiper.ai/explore")
+                options = {**site_preferences["options"], "image": image}
+                if not haiper.create_video_with_image(**options):
+                    return False
+                return haiper.fetch_video_id(exclude=in_flight_ids)
+
+            failed_job_ids = [
+                job_ids[index]
+                for index, _ in run_in_flight_window(
+                    images, submit, haiper.is_generation_completed, haiper.fetch_video_link_by_id, save_output, in_flight_window
+                )
+            ]
+        else:
+            for index, image in enumerate(images):
+                options = {**site_preferences["options"], "image": image}
+                logging.info(f"Initiating video generation for the image index {index}...")
+                haiper.create_video_with_image(**options)
+                generated_video_link = haiper.fetch_generated_video_link()
+                logging.info("Video link successfully fetched...")
+                save_output(index, image, generated_video_link)
 
     else:
         logging.info("Initiating video generation from prompt...")
 
-        prompts: list | str = site_preferences["options"]["prompt"]
-        prompts: list = prompts if isinstance(prompts, list) else [prompts]
-        logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+        prompts: list | str | Iterator = site_preferences["options"]["prompt"]
+        prompts: list | Iterator = prompts if isinstance(prompts, (list, Iterator)) else [prompts]
 
         db = AIGeneratorDB()
+        job_ids, prompts = db.load_jobs(
+            site_preferences["category"],
+            site_preferences["site"],
+            "prompt",
+            prompts,
+            site_preferences.get("resume_jobs"),
+            options=dict(site_preferences["options"]),
+            **tools.get_memoization_settings(),
+        )
+        site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+        if isinstance(prompts, list):
+            logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+        else:
+            logging.info("Prompts of this batch are streamed from the sheet.")
 
-        for index, prompt in enumerate(prompts):
-            site_preferences["options"]["prompt"] = prompt
-            logging.info(f"Initiating image generation for the prompt index {index}...")
-            haiper.create_video_with_prompt(**site_preferences["options"])
-            generated_video_link = haiper.fetch_generated_video_link()
-            logging.info("Video link successfully fetched...")
+        def save_output(index: int, prompt: str, generated_video_link: str) -> None:
+            """Queue the download of the generated video. Output details are inserted into the database when the download completes."""
             timestamp = datetime.now()
             filename = tools.generate_file_name(prompt=prompt, timestamp=timestamp, extension="mp4")
-            downloaded_video_path = haiper.download_video(
-                generated_video_link, CONFIG["Default_location_start"]["default_output_location_local"], filename
-            )
-            logging.info(f"Operation Completed for the prompt index {index}")
-
-            # Saving the required entities into the database
-            db.insert_output(
-                file_path=downloaded_video_path,
-                category=site_preferences["category"],
-                site_id=db.get_site_id(site_preferences["site"]),
-                prompt_id=db.insert_prompt(prompt),
-                timestamp=timestamp,
+
+            def on_download_complete(downloaded_video_path: str) -> None:
+                logging.info(f"Operation Completed for the prompt index {index}")
+
+                # Saving the required entities into the database
+                db.insert_output(
+                    file_path=downloaded_video_path,
+                    category=site_preferences["category"],
+                    site_id=db.get_site_id(site_preferences["site"]),
+                    prompt_id=db.insert_prompt(prompt),
+                    timestamp=timestamp,
+                    job_id=job_ids[index],
+                )
+                logging.info("Output details successfully inserted into the database...")
+
+            download_manager.submit(
+                haiper.download_video,
+                generated_video_link,
+                CONFIG["Default_location_start"]["default_output_location_local"],
+                filename,
+                session=haiper.get_download_session(),  # Cookies are copied here (on the thread driving the browser)
+                on_complete=on_download_complete,
             )
-            logging.info("Output details successfully inserted into the database...")
+
+        if in_flight_window > 1:
+            logging.info(f"Pipelined submission. Keeping {in_flight_window} generations in flight...")
+
+            def submit(prompt: str, in_flight_ids: set) -> str | bool:
+                driver.get("https://haiper.ai/explore")
+                options = {**site_preferences["options"], "prompt": prompt}
+                if not haiper.create_video_with_prompt(**options):
+                    return False
+                return haiper.fetch_video_id(exclude=in_flight_ids)
+
+            failed_job_ids = [
+                job_ids[index]
+                for index, _ in run_in_flight_window(
+                    prompts, submit, haiper.is_generation_completed, haiper.fetch_video_link_by_id, save_output, in_flight_window
+                )
+            ]
+        else:
+            for index, prompt in enumerate(prompts):
+                options = {**site_preferences["options"], "prompt": prompt}
+                logging.info(f"Initiating image generation for the prompt index {index}...")
+                haiper.create_video_with_prompt(**options)
+                generated_video_link = haiper.fetch_generated_video_link()
+                logging.info("Video link successfully fetched...")
+                save_output(index, prompt, generated_video_link)
+
+    logging.info("Waiting for the pending downloads to complete...")
+    download_manager.shutdown()
+    db.flush()  # Writing the buffered outputs of the batch
+    db.update_jobs_state(failed_job_ids, "failed")
 
     if local_webdriver:
         logging.info("Operation Completed. Closing the webdriver (Haiper AI)")
@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 7th May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1100
 """
 
@@ -13,6 +13,7 @@ __version__ = "1.0.0"
 
 
 import logging
+from typing import Iterator
 import os
 from time import sleep
 from datetime import datetime
@@ -30,6 +31,9 @@ if __name__ == "__main__":
     import pixverse
 else:
     from db_scripts import AIGeneratorDB
+    from download_manager import DownloadManager
+    from pipeline import run_in_flight_window
+    from session_store import SessionStore
     from . import pixverse
 
 logging.info(f"Old CWD: {os.getcwd()}")
@@ -215,7 +219,13 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
         driver.maximize_window()
         local_webdriver = True
 
-    if site_preferences.get("login_required"):
+    # Full login is required only if the saved session of the site is not valid anymore.
+    session_store = SessionStore("pixverse", CONFIG["google_login_options_start"].get("email"))
+    login_required = site_preferences.get("login_required") and not session_store.restore(
+        driver, "https://app.pixverse.ai/login", logged_in_url_part="app.pixverse.ai/home"
+    )
+
+    if login_required:
         if CONFIG["google_login_options_start"]["manual_login"] == "Y":
             is_login_success = login_to_google_account(driver)
         else:
@@ -230,8 +240,9 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
                 driver.quit()
             return False
 
-    if site_preferences.get("login_required"):
-        pixverse.login_with_google(driver)
+    if login_required:
+        pixverse.login_with_google(driver)  # Raises exception on failure
+        session_store.save(driver)
 
     def is_image_option_available(site_preferences: dict) -> bool:
         """
@@ -250,69 +261,167 @@ def main(site_preferences: dict, driver=None, *args, **kwargs) -> None:
             return True
         return False
 
+    # Number of generations to keep in the queue of the site at once. 1 means submit next only when previous is completed.
+    in_flight_window = int(CONFIG.get("pipeline_options_start", {}).get("in_flight_window") or 1)
+    # Downloads are performed in the background. So, the browser moves to the next prompt/image immediately.
+    download_manager = DownloadManager(tools.load_app_settings().get("max_download_workers", 4))
+    failed_job_ids: list[int] = []  # Jobs failed in pipelined submission (Sequential failures remain 'running' and are resumed later)
+
+    def is_generation_completed(video_id: str) -> bool:
+        return pixverse.is_generation_completed(driver, video_id)
+
+    def fetch_video_link_by_id(video_id: str) -> str:
+        return pixverse.fetch_video_link_by_id(driver, video_id)
+
     if is_image_option_available(site_preferences):
         logging.info("Initiating video generation from images (Pixverse AI)...")
 
-        images: list | str = site_preferences["options"]["image"]
-        images: list = images if isinstance(images, list) else [images]
-        logging.info(f"Total number of images path in this batch is {len(images)}")
+        images: list | str | Iterator = site_preferences["options"]["image"]
+        images: list | Iterator = images if isinstance(images, (list, Iterator)) else [images]
 
         db = AIGeneratorDB()
+        job_ids, images = db.load_jobs(
+            site_preferences["category"],
+            site_preferences["site"],
+            "image",
+            images,
+            site_preferences.get("resume_jobs"),
+            options=dict(site_preferences["options"]),
+            **tools.get_memoization_settings(),
+        )
+        site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+        if isinstance(images, list):
+            logging.info(f"Total number of images path in this batch is {len(images)}")
+        else:
+            logging.info("Images of this batch are streamed from the sheet.")
 
-        for index, image in enumerate(images):
-            site_preferences["options"]["image"] = image
-            logging.info(f"Initiating video generation for the image index {index}...")
-            pixverse.create_video_from_images(driver, **site_preferences["options"])
-            link = pixverse.fetch_generated_video_link(driver)
-            logging.info("Video linked fetched successfully...")
+        def save_output(index: int, image: str, link: str) -> None:
+            """Queue the download of the generated video. Output details are inserted into the database when the download completes."""
             timestamp = datetime.now()
             filename = tools.generate_file_name(image_path=image, timestamp=timestamp, extension="mp4")
-            downloaded_video_path = pixverse.download_video(
-                link, CONFIG["Default_location_start"]["default_output_location_local"], filename
-            )
-            logging.info(f"Operation Completed for the image index {index}")
-
-            # Saving the required entities into the database
-            db.insert_output(
-                file_path=downloaded_video_path,
-                category=site_preferences["category"],
-                site_id=db.get_site_id(site_preferences["site"]),
-                image_id=db.insert_image(image),
-                timestamp=timestamp,
+
+            def on_download_complete(downloaded_video_path: str) -> None:
+                logging.info(f"Operation Completed for the image index {index}")
+
+                # Saving the required entities into the database
+                db.insert_output(
+                    file_path=downloaded_video_path,
+                    category=site_preferences["category"],
+                    site_id=db.get_site_id(site_preferences["site"]),
+                    image_id=db.insert_image(image),
+                    timestamp=timestamp,
+                    job_id=job_ids[index],
+                )
+                logging.info("Output details successfully inserted into the database...")
+
+            download_manager.submit(
+                pixverse.download_video,
+                link,
+                CONFIG["Default_location_start"]["default_output_location_local"],
+                filename,
+                on_complete=on_download_complete,
             )
-            logging.info("Output details successfully inserted into the database...")
+
+        if in_flight_window > 1:
+            logging.info(f"Pipelined submission. Keeping {in_flight_window} generations in flight...")
+
+            def submit(image: str, in_flight_ids: set) -> str | bool:
+                options = {**site_preferences["options"], "image": image}
+                if pixverse.create_video_from_images(driver, **options) is False:
+                    return False
+                return pixverse.fetch_video_id(driver, exclude=in_flight_ids)
+
+            failed_job_ids = [
+                job_ids[index]
+                for index, _ in run_in_flight_window(
+                    images, submit, is_generation_completed, fetch_video_link_by_id, save_output, in_flight_window
+                )
+            ]
+        else:
+            for index, image in enumerate(images):
+                options = {**site_preferences["options"], "image": image}
+                logging.info(f"Initiating video generation for the image index {index}...")
+                pixverse.create_video_from_images(driver, **options)
+                link = pixverse.fetch_generated_video_link(driver)
+                logging.info("Video linked fetched successfully...")
+                save_output(index, image, link)
 
     else:
         logging.info("Initiating video generation from prompt...")
 
-        prompts: list | str = site_preferences["options"]["prompt"]
-        prompts: list = prompts if isinstance(prompts, list) else [prompts]
-        logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+        prompts: list | str | Iterator = site_preferences["options"]["prompt"]
+        prompts: list | Iterator = prompts if isinstance(prompts, (list, Iterator)) else [prompts]
 
         db = AIGeneratorDB()
+        job_ids, prompts = db.load_jobs(
+            site_preferences["category"],
+            site_preferences["site"],
+            "prompt",
+            prompts,
+            site_preferences.get("resume_jobs"),
+            options=dict(site_preferences["options"]),
+            **tools.get_memoization_settings(),
+        )
+        site_preferences["job_ids"] = job_ids  # Reported to the site runner (filled while the batch is streamed)
+        if isinstance(prompts, list):
+            logging.info(f"Total number of prompts in this batch is {len(prompts)}")
+        else:
+            logging.info("Prompts of this batch are streamed from the sheet.")
 
-        for index, prompt in enumerate(prompts):
-            site_preferences["options"]["prompt"] = prompt
-            logging.info(f"Initiating image generation for the prompt index {index}...")
-            pixverse.create_video_from_prompt(driver, **site_preferences["options"])
-            link = pixverse.fetch_generated_video_link(driver)
-            logging.info("Video linked fetched successfully...")
+        def save_output(index: int, prompt: str, link: str) -> None:
+            """Queue the download of the generated video. Output details are inserted into the database when the download completes."""
             timestamp = datetime.now()
             filename = tools.generate_file_name(prompt=prompt, timestamp=timestamp, extension="mp4")
-            downloaded_video_path = pixverse.download_video(
-                link, CONFIG["Default_location_start"]["default_output_location_local"], filename
-            )
-            logging.info(f"Operation Completed for the prompt index {index}")
-
-            # Saving the required entities into the database
-            db.insert_output(
-                file_path=downloaded_video_path,
-                category=site_preferences["category"],
-                site_id=db.get_site_id(site_preferences["site"]),
-                prompt_id=db.insert_prompt(prompt),
-                timestamp=timestamp,
+
+            def on_download_complete(downloaded_video_path: str) -> None:
+                logging.info(f"Operation Completed for the prompt index {index}")
+
+                # Saving the required entities into the database
+                db.insert_output(
+                    file_path=downloaded_video_path,
+                    category=site_preferences["category"],
+                    site_id=db.get_site_id(site_preferences["site"]),
+                    prompt_id=db.insert_prompt(prompt),
+                    timestamp=timestamp,
+                    job_id=job_ids[index],
+                )
+                logging.info("Output details successfully inserted into the database...")
+
+            download_manager.submit(
+                pixverse.download_video,
+                link,
+                CONFIG["Default_location_start"]["default_output_location_local"],
+                filename,
+                on_complete=on_download_complete,
             )
-            logging.info("Output details successfully inserted into the database...")
+
+        if in_flight_window > 1:
+            logging.info(f"Pipelined submission. Keeping {in_flight_window} generations in flight...")
+
+            def submit(prompt: str, in_flight_ids: set) -> str | bool:
+                options = {**site_preferences["options"], "prompt": prompt}
+                pixverse.create_video_from_prompt(driver, **options)
+                return pixverse.fetch_video_id(driver, exclude=in_flight_ids)
+
+            failed_job_ids = [
+                job_ids[index]
+                for index, _ in run_in_flight_window(
+                    prompts, submit, is_generation_completed, fetch_video_link_by_id, save_output, in_flight_window
+                )
+            ]
+        else:
+            for index, prompt in enumerate(prompts):
+                options = {**site_preferences["options"], "prompt": prompt}
+                logging.info(f"Initiating image generation for the prompt index {index}...")
+                pixverse.create_video_from_prompt(driver, **options)
+                link = pixverse.fetch_generated_video_link(driver)
+                logging.info("Video linked fetched successfully...")
+                save_output(index, prompt, link)
+
+    logging.info("Waiting for the pending downloads to complete...")
+    download_manager.shutdown()
+    db.flush()  # Writing the buffered outputs of the batch
+    db.update_jobs_state(failed_job_ids, "failed")
 
     print("Operation Completed (Pixverse)")
     logging.info("Operation Completed (Pixverse)")
@@ -2,7 +2,7 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 9th May 2024
-Last-modified: 30th June 2024
+Last-modified: 17th October 2026
 Error-series: 1200
 """
 
@@ -11,14 +11,35 @@ import os
 from time import sleep
 from typing import Any
 from datetime import datetime
-import requests
+from urllib.parse import urlparse, parse_qs
 from selenium.webdriver.common.by import By
 from selenium.webdriver import Chrome, Edge
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import http_client
+import output_store
+import dom_wait
+import form_filler
 
 URL = "https://app.pixverse.ai/login"
+VIDEO_DETAIL_URL = "https://app.pixverse.ai/create/video?detail=show&id={video_id}"
+VIDEO_GENERATION_INFO_DIV_SELECTOR = ".text-base.text-center"  # Available only when video is generating
+
+# Forms of the create pages. Applied by form_filler in a single round trip.
+TEXT_TO_VIDEO_FORM: list[dict] = [
+    {"option": "prompt", "action": "fill", "locator": (By.ID, "Prompt"), "timeout": 60},
+    {"option": "seed", "action": "fill", "locator": (By.CSS_SELECTOR, 'input[role="spinbutton"]')},
+    {"action": "click", "locator": (By.CSS_SELECTOR, 'button[type="button"]'), "index": 1, "enabled": True, "timeout": 20},  # Create button
+]
+IMAGE_TO_VIDEO_FORM: list[dict] = [
+    {"option": "prompt", "action": "fill", "locator": (By.ID, "Prompt")},
+    {"option": "motion_strength", "action": "fill", "locator": (By.CSS_SELECTOR, 'input[aria-valuemin="0.01"]')},
+    {"option": "seed", "action": "fill", "locator": (By.CSS_SELECTOR, 'input[step="1"]')},
+    {"option": "hd_quality", "action": "check", "locator": (By.ID, "Quality"), "default": False},
+    {"action": "wait", "locator": (By.CSS_SELECTOR, 'img[src*="media.pixverse.ai/upload"]'), "timeout": 20},  # Image uploaded
+    {"action": "click", "locator": (By.XPATH, "//span[text()='Create']//ancestor::button[1]"), "enabled": True, "timeout": 20},
+]
 
 
 def login_with_google(driver: Chrome | Edge | Any) -> None:
@@ -55,11 +76,12 @@ def download_video(link: str, path: str, filename: str = None) -> str:
     """
     if not filename:
         filename = datetime.now().strftime("pixverse_%Y%m%d%H%M%S.mp4")
-    response = requests.get(link)
-    with open(os.path.join(path, filename), "wb") as file:
-        file.write(response.content)
-        created_filename = file.name
-    return os.path.abspath(created_filename)
+    file_path = os.path.join(path, filename)
+    store = output_store.get_output_store()
+    if store:
+        return store.download(link, file_path)  # file_path is created as a link of the video in the store
+    http_client.stream_download(link, file_path)  # Streaming in chunks. So, memory usage doesn't depend on the size of the video.
+    return os.path.abspath(file_path)
 
 
 def fetch_generated_video_link(driver: Chrome | Edge | Any) -> str | bool:
@@ -120,7 +142,7 @@ def fetch_generated_video_link(driver: Chrome | Edge | Any) -> str | bool:
     wait_300 = WebDriverWait(driver, 600)  # Video generation takes time.
     try:
         logging.info("Waiting until the video generation message div disappears.")
-        wait_300.until_not(expected_conditions.presence_of_element_located((By.CSS_SELECTOR, ".text-base.text-center")))
+        dom_wait.wait_until_absent(driver, (By.CSS_SELECTOR, ".text-base.text-center"), timeout=600)
     except TimeoutException:
         print("Video generating taking too much time (10 min+). Error Code: 1202")
         logging.log("Video generating taking too much time (10 min+). Error Code: 1202")
@@ -146,6 +168,87 @@ def fetch_generated_video_link(driver: Chrome | Edge | Any) -> str | bool:
     return generated_video_public_link
 
 
+def fetch_video_id(driver: Chrome | Edge | Any, exclude: set | None = None) -> str | bool:
+    """Function to fetch the detail ID of the video whose generation has just been submitted (Used in pipelined submission).
+
+    Args:
+        driver (Chrome | Edge | Any): The web driver to use for interacting with the webpage.
+        exclude (set | None, optional): IDs of the videos already being tracked. These will be skipped. Defaults to None.
+
+    Returns:
+        str | bool: The detail ID of the video on success else False.
+
+    More Info:
+        - Each video generating div opens the detail page of the video (https://app.pixverse.ai/create/video?detail=show&id=<ID>) on click.
+    """
+    exclude = exclude or set()
+    creation_page_url = driver.current_url
+
+    for index in range(len(exclude) + 1):
+        try:
+            WebDriverWait(driver, 30).until(
+                expected_conditions.visibility_of_element_located((By.CSS_SELECTOR, VIDEO_GENERATION_INFO_DIV_SELECTOR))
+            )
+        except TimeoutException:
+            logging.error("Div specifying the video generation is not present. Error Code: 1205")
+            return False
+
+        # Fetching again in each iteration because the elements are detached after navigation.
+        video_generation_info_divs = driver.find_elements(By.CSS_SELECTOR, VIDEO_GENERATION_INFO_DIV_SELECTOR)
+        if index >= len(video_generation_info_divs):
+            break
+        video_generation_info_divs[index].click()
+        sleep(5)
+        video_id = parse_qs(urlparse(driver.current_url).query).get("id", [None])[0]
+        driver.get(creation_page_url)
+
+        if video_id and video_id not in exclude:
+            return video_id
+
+    logging.error("Detail ID of the submitted video not found. Error Code: 1206")
+    return False
+
+
+def is_generation_completed(driver: Chrome | Edge | Any, video_id: str) -> bool:
+    """Function to check if the generation of the video is completed (Used in pipelined submission).
+
+    Args:
+        driver (Chrome | Edge | Any): The web driver to use for interacting with the webpage.
+        video_id (str): The detail ID of the video.
+
+    Returns:
+        bool: True if the video is generated, False if it's still generating.
+    """
+    driver.get(VIDEO_DETAIL_URL.format(video_id=video_id))
+    try:
+        WebDriverWait(driver, 20).until(
+            lambda driver: driver.find_elements(By.TAG_NAME, "video")
+            or driver.find_elements(By.CSS_SELECTOR, VIDEO_GENERATION_INFO_DIV_SELECTOR)
+        )
+    except TimeoutException:
+        return False
+    return not driver.find_elements(By.CSS_SELECTOR, VIDEO_GENERATION_INFO_DIV_SELECTOR)
+
+
+def fetch_video_link_by_id(driver: Chrome | Edge | Any, video_id: str) -> str:
+    """Function to fetch the public link of the generated video using its detail ID.
+
+    Args:
+        driver (Chrome | Edge | Any): The web driver to use for interacting with the webpage.
+        video_id (str): The detail ID of the video.
+
+    Returns:
+        str: The public link of the generated video.
+    """
+    video_detail_url = VIDEO_DETAIL_URL.format(video_id=video_id)
+    if driver.current_url != video_detail_url:
+        driver.get(video_detail_url)
+    video_element = WebDriverWait(driver, 60).until(expected_conditions.visibility_of_element_located((By.TAG_NAME, "video")))
+    generated_video_public_link = video_element.get_attribute("src")
+    logging.info(f"Found video link: {generated_video_public_link}")
+    return generated_video_public_link
+
+
 def create_video_from_prompt(driver: Chrome | Edge | Any, prompt: str, seed: int | str, *args, **kwargs):
     """Creates a video based on a given prompt using the provided driver.
 
@@ -169,19 +272,7 @@ def create_video_from_prompt(driver: Chrome | Edge | Any, prompt: str, seed: int
         logging.info("Navigating to app.pixverse.ai/create/video/text")
         driver.get("https://app.pixverse.ai/create/video/text")
 
-    WebDriverWait(driver, 60).until(expected_conditions.visibility_of_element_located((By.ID, "Prompt")))
-    prompt_textarea = driver.find_element(By.ID, "Prompt")
-    prompt_textarea.clear()
-    prompt_textarea.send_keys(prompt)  # Prompt
-    seed_button_selector = 'input[role="spinbutton"]'
-    driver.find_element(By.CSS_SELECTOR, seed_button_selector).send_keys(seed)
-    logging.info("Prompt written successfully...")
-
-    wait = WebDriverWait(driver, 20)
-    submit_button_selector = 'button[type="button"]'
-    wait.until(expected_conditions.presence_of_all_elements_located((By.CSS_SELECTOR, submit_button_selector)))
-    create_button = driver.find_elements(By.CSS_SELECTOR, submit_button_selector)[1]
-    wait.until(expected_conditions.element_to_be_clickable(create_button)).click()
+    form_filler.fill_form(driver, TEXT_TO_VIDEO_FORM, dict(prompt=prompt, seed=seed))
     logging.info("Create button clicked successfully...")
 
 
@@ -211,21 +302,6 @@ def create_video_from_images(
         None
     """
 
-    def wait_until_image_uploaded() -> bool:
-        """
-        A function that waits until a specific image is uploaded on the webpage and returns True if successful, False otherwise.
-        No parameters are passed to this function and it returns a boolean value.
-        """
-        try:
-            wait.until(
-                expected_conditions.text_to_be_present_in_element_attribute((By.TAG_NAME, "img"), "src", "https://media.pixverse.ai/upload")
-            )
-        except TimeoutException:
-            logging.error("Image not uploaded. Time out. Error Code: 1201")
-            return False
-        else:
-            return True
-
     logging.info("Creating video with the given image.")
 
     if not image:
@@ -243,26 +319,11 @@ def create_video_from_images(
     # image_upload_button_selector = ".ant-btn.css-1ntsptu.ant-btn-text.ant-btn-sm"
     image_file_input_selector = 'input[type="file"]'
     wait.until(expected_conditions.presence_of_element_located((By.CSS_SELECTOR, image_file_input_selector))).send_keys(image)
-    if prompt:
-        prompt_textarea = driver.find_element(By.ID, "Prompt")
-        prompt_textarea.clear()
-        prompt_textarea.send_keys(prompt)  # Prompt if any
-    motion_strength_input_selector = 'input[aria-valuemin="0.01"]'
-    driver.find_element(By.CSS_SELECTOR, motion_strength_input_selector).send_keys(motion_strength)
-    seed_button_selector = 'input[step="1"]'
-    driver.find_element(By.CSS_SELECTOR, seed_button_selector).send_keys(seed)
-    quality_button = driver.find_element(By.ID, "Quality")
-    if quality_button.get_property("aria-checked") == "false":
-        if hd_quality:
-            quality_button.click()  # HD enabled
-    else:
-        if not hd_quality:
-            quality_button.click()  # HD disabled
-
-    # Waiting for image to be uploaded
-    if not wait_until_image_uploaded():
-        return False
 
-    submit_button_xpath = "//span[text()='Create']//ancestor::button[1]"
-    wait.until(expected_conditions.element_to_be_clickable((By.XPATH, submit_button_xpath)))
-    driver.find_element(By.XPATH, submit_button_xpath).click()
+    # Prompt, motion strength, seed, quality and waiting for image to be uploaded before clicking create button
+    try:
+        values = dict(prompt=prompt, motion_strength=motion_strength, seed=seed, hd_quality=hd_quality)
+        form_filler.fill_form(driver, IMAGE_TO_VIDEO_FORM, values)
+    except TimeoutException as e:
+        logging.error(f"Image not uploaded. Time out. Error Code: 1201. Exception: {e}")
+        return False
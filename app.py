@@ -3,7 +3,7 @@
 Driver module to integrate and execute the script.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 09th June 2024
-Last-modified: 28th June 2024
+Last-modified: 17th October 2026
 Error-series: 3100
 """
 
@@ -11,25 +11,71 @@ __author__ = "Suraj Kumar Giri"
 __email__ = "surajgirioffl@gmail.com"
 __version__ = "0.0.0"
 
+from time import perf_counter
+
+STARTUP_START_TIME = perf_counter()
+
 import logging
+import multiprocessing
 import sys
 import os
-import cli
-import gui
-from excel_preference_manager import PreferenceManager
+import threading
 import tools
-from db_scripts import AIGeneratorDB
+import preferences_snapshot
 
+# Only lightweight modules are imported above. Front end (cli or gui), database and browser modules are imported on first use.
 APP_REQUIRED_DIRS = ["appdata", "appdata/logs", "appdata/profile"]
+# If this environment variable is set then the application exits as soon as the front end is loaded (used to benchmark the startup).
+EXIT_AFTER_STARTUP_ENV = "AI_GENERATORS_EXIT_AFTER_STARTUP"
 
 tools.create_app_require_directories(APP_REQUIRED_DIRS)
 tools.configure_logging("appdata/logs/app.log")
 
 
+def synchronize_sites(categories_sites_mapping: dict) -> None:
+    """Insert the sites of the preferences into the database (if not exist). Executed in the background at the startup.
+
+    Args:
+        categories_sites_mapping (dict): A dictionary mapping categories to a list of sites.
+    """
+    from db_scripts import AIGeneratorDB
+
+    sites = []
+    for value in categories_sites_mapping.values():
+        sites += value
+    try:
+        AIGeneratorDB().insert_sites_if_not_exist(list(set(sites)))
+    except Exception as e:
+        # Not fatal. Missing sites are inserted on first use.
+        logging.exception(f"Failed to insert the sites into the database. Error Code: 3101. Exception: {e}")
+
+
+def get_interface_name(args: list[str]) -> str:
+    """Get the name of the front end ('cli' or 'gui') from the command line args.
+
+    Args:
+        args (list[str]): The command line args (without the script name).
+
+    Returns:
+        str: 'cli' or 'gui'.
+    """
+    if not args:
+        logging.info("No args specified. Starting default GUI version...")
+        return "gui"
+    if args[0] in ["CLI", "cli"]:
+        logging.info("CLI version specified. Starting CLI version...")
+        return "cli"
+    if args[0] in ["GUI", "gui"]:
+        logging.info("GUI version specified. Starting GUI version...")
+        return "gui"
+    logging.error("Invalid args. Starting default CLI version...")
+    return "cli"
+
+
 def main() -> None:
     """
     A function that serves as the entry point of the program.
-    It initializes the preference manager, fetches categories and sites,
+    It loads the preferences snapshot (compiled from the preferences workbook if changed), fetches categories and sites,
     and determines whether to start the CLI or GUI version based on the arguments provided.
 
     Does not take any parameters and does not return anything.
@@ -37,35 +83,51 @@ def main() -> None:
     More Info:
         - If provided args are "CLI" or "cli", it starts the CLI version of the application.
         - If provided args are "GUI" or "gui", it starts the GUI version of the application.
-        - If no args are provided, it starts the default CLI version of the application.
+        - If no args are provided, it starts the default GUI version of the application.
+        - Only the selected front end is imported.
     """
-    preference_manager = PreferenceManager()
-    categories, categories_sites_mapping = preference_manager.fetch_categories_and_sites()
-    sites_preferences: dict = preference_manager.fetch_sites_preferences()
+    # Workbook is parsed only if it is changed since the last launch. Otherwise, preferences are loaded from the snapshot (without pandas).
+    snapshot = preferences_snapshot.get_snapshot()
+    categories, categories_sites_mapping = snapshot.categories, snapshot.categories_sites_mapping
+    sites_preferences: dict = snapshot.sites_preferences
 
-    sites = []
-    for value in categories_sites_mapping.values():
-        sites += value
-    AIGeneratorDB().insert_sites_if_not_exist(list(set(sites)))
+    # Database engine is created in the background. So, the front end appears without waiting for it.
+    threading.Thread(target=synchronize_sites, args=(categories_sites_mapping,), name="synchronize_sites", daemon=True).start()
+
+    interface_name = get_interface_name(sys.argv[1:])
+    if interface_name == "cli":
+        import cli as interface
+    else:
+        import gui as interface
+    logging.info(f"Startup completed in {perf_counter() - STARTUP_START_TIME:.3f} seconds ({interface_name}).")
+    if os.environ.get(EXIT_AFTER_STARTUP_ENV):
+        print(f"Startup completed in {perf_counter() - STARTUP_START_TIME:.3f} seconds ({interface_name}).")
+        return
 
     # driver = tools.get_webdriver_instance(profile_dir_path=f"{os.getcwd()}/appdata/profile")
     # driver.maximize_window()
     driver = None
 
-    if len(sys.argv) > 1:
-        if sys.argv[1] in ["CLI", "cli"]:
-            logging.info("CLI version specified. Starting CLI version...")
-            cli.main(categories, categories_sites_mapping, sites_preferences, driver)
-        elif sys.argv[1] in ["GUI", "gui"]:
-            logging.info("GUI version specified. Starting GUI version...")
-            gui.main(categories, categories_sites_mapping, sites_preferences, driver)
-        else:
-            logging.error("Invalid args. Starting default CLI version...")
-            cli.main(categories, categories_sites_mapping, sites_preferences, driver)
-    else:
-        logging.info("No args specified. Starting default GUI version...")
-        gui.main(categories, categories_sites_mapping, sites_preferences, driver)
+    # Browsers are launched in the background now and reused by all generations (instead of launching a new browser for each run).
+    app_settings: dict = tools.load_app_settings()
+    browser_pool = None
+    if int(app_settings.get("browser_pool_size", 0)) > 0:
+        from browser_pool import BrowserPool
+
+        browser_pool = BrowserPool(
+            app_settings["browser_pool_size"],
+            app_settings.get("browser_pool_max_generations", 20),
+            "appdata/profile",
+            capture_network=app_settings.get("capture_network", False),
+        )
+
+    try:
+        interface.main(categories, categories_sites_mapping, sites_preferences, driver, browser_pool=browser_pool)
+    finally:
+        if browser_pool:
+            browser_pool.close()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Required by the parallel mode (site_runner) in the PyInstaller build.
     main()
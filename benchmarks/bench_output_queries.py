@@ -0,0 +1,126 @@
+"""Benchmark of the output queries of AIGeneratorDB on a synthetic database (millions of outputs).
+
+Each query is measured with the indexes of the Output table and again after dropping them (like the databases created before the indexes).
+Query plans (EXPLAIN QUERY PLAN) are printed. So, the use of the indexes can be verified.
+Usage (from the project directory): python benchmarks/bench_output_queries.py [--rows 2000000] [--sites 5] [--prompts 100000] [--repeat 5]
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+"""
+
+import os
+import sys
+import random
+import argparse
+import tempfile
+from statistics import median
+from time import perf_counter
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import models
+from models import Output, session_scope
+
+CATEGORIES = ["text_to_video", "image_to_video", "text_to_image", "text_to_text"]
+SITES = ["pixverse", "haiper", "ideogram", "wordhero", "pixlr"]
+START_TIME = datetime(2024, 1, 1)
+
+
+def populate(rows: int, sites: int, prompts: int) -> None:
+    """Insert the synthetic sites, prompts and outputs (outputs are spread over a year)."""
+    random.seed(0)
+    connection = models.get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.executemany("INSERT INTO sites (site) VALUES (?)", [(SITES[index % len(SITES)] + str(index),) for index in range(sites)])
+        cursor.executemany("INSERT INTO prompts (prompt) VALUES (?)", ((f"prompt {index}",) for index in range(prompts)))
+        cursor.executemany(
+            "INSERT INTO output (file_path, category, site_id, prompt_id, image_id, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f"outputs/{index}.mp4",
+                    CATEGORIES[index % len(CATEGORIES)],
+                    random.randint(1, sites),
+                    random.randint(1, prompts),
+                    None,
+                    str(START_TIME + timedelta(seconds=random.randint(0, 365 * 24 * 3600))),
+                )
+                for index in range(rows)
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def get_queries(db, site: str) -> dict:
+    """Queries of the benchmark. {name: (function, statement to explain)}"""
+    start_time, end_time = START_TIME + timedelta(days=100), START_TIME + timedelta(days=107)
+    return {
+        "outputs of a site in a week": (
+            lambda: db.get_outputs(site, start_time, end_time),
+            select(Output).where(Output.site_id == 1, Output.timestamp >= start_time, Output.timestamp < end_time),
+        ),
+        "latest output of a prompt": (
+            lambda: db.get_latest_output(prompt="prompt 4242"),
+            select(Output).where(Output.prompt_id == 4242).order_by(Output.timestamp.desc()).limit(1),
+        ),
+        "counts per category": (
+            lambda: db.count_outputs_by_category(),
+            select(Output.category).group_by(Output.category),
+        ),
+    }
+
+
+def measure(queries: dict, repeat: int, label: str) -> dict[str, float]:
+    """Measure each query (median of repeat runs) and print its query plan."""
+    timings = {}
+    for name, (function, statement) in queries.items():
+        durations = []
+        for _ in range(repeat):
+            start = perf_counter()
+            function()
+            durations.append(perf_counter() - start)
+        timings[name] = median(durations)
+        with session_scope() as session:
+            plan = session.execute(text(f"EXPLAIN QUERY PLAN {statement.compile(compile_kwargs={'literal_binds': True})}")).all()
+        print(f"[{label}] {name}: {timings[name] * 1000:.2f} ms | plan: {' / '.join(row[-1] for row in plan)}")
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Number of outputs. Default: 2000000")
+    parser.add_argument("--sites", type=int, default=5, help="Number of sites. Default: 5")
+    parser.add_argument("--prompts", type=int, default=100_000, help="Number of prompts. Default: 100000")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs per query (median is reported). Default: 5")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        models.DATABASE_PATH = os.path.join(temp_dir_path, "bench.db")  # Before the first use of the engine
+        from db_scripts import AIGeneratorDB
+
+        start = perf_counter()
+        populate(args.rows, args.sites, args.prompts)
+        print(f"Inserted {args.rows} outputs in {perf_counter() - start:.1f} s\n")
+
+        db = AIGeneratorDB()
+        queries = get_queries(db, f"{SITES[0]}0")
+        indexed_timings = measure(queries, args.repeat, "indexed")
+        print()
+
+        with session_scope() as session:
+            for index in Output.__table__.indexes:
+                session.execute(text(f"DROP INDEX {index.name}"))
+        models.get_engine().dispose()  # Pooled connections cache the statements prepared with the dropped indexes
+        unindexed_timings = measure(queries, args.repeat, "no index")
+        print()
+
+        for name in queries:
+            print(f"{name}: {unindexed_timings[name] / indexed_timings[name]:.1f}x faster with the indexes")
+        models.get_engine().dispose()  # So, the temporary directory can be deleted (Windows)
+
+
+if __name__ == "__main__":
+    main()
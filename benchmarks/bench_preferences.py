@@ -0,0 +1,115 @@
+"""Benchmark of the PreferenceManager on a synthetic options sheet (thousands of sites and dozens of option/value pairs).
+
+Compares the vectorized implementation with the previous row by row implementation (kept here as reference).
+Usage (from the project directory): python benchmarks/bench_preferences.py [--rows 5000] [--pairs 30] [--repeat 5]
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+"""
+
+import os
+import sys
+import argparse
+from time import perf_counter
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from excel_preference_manager import PreferenceManager, replace_nan
+
+CATEGORIES = ["text_to_video", "image_to_video", "text_to_image", "text_to_text"]
+
+
+def create_options_sheet(rows: int, pairs: int) -> pd.DataFrame:
+    """Create a synthetic options sheet (as read by pd.read_excel()). Around 30% option/value cells are empty (NaN)."""
+    random = np.random.default_rng(0)
+    data = {
+        "site": [f"site{index}" for index in range(rows)],
+        "category": [CATEGORIES[index % len(CATEGORIES)] for index in range(rows)],
+        "automation_status": random.integers(0, 2, rows).astype(bool),
+    }
+    for pair in range(1, pairs + 1):
+        is_empty = random.random(rows) < 0.3
+        data[f"option{pair}"] = np.where(is_empty, None, f"option_{pair}")
+        data[f"value{pair}"] = np.where(is_empty, np.nan, random.integers(1, 100, rows).astype(float))
+    return pd.DataFrame(data)
+
+
+def legacy_replace_nan(df: pd.DataFrame) -> pd.DataFrame:
+    return df.map(lambda value: "" if pd.isna(value) else value)
+
+
+def legacy_fetch_categories_and_sites(options_df: pd.DataFrame) -> tuple[list, dict]:
+    categories_sites_mapping: dict = {}
+    categories: list = options_df["category"].drop_duplicates().to_list()
+    for category in categories:
+        categories_sites_mapping[category] = options_df.loc[options_df["category"] == category, "site"].to_list()
+    return categories, categories_sites_mapping
+
+
+def legacy_fetch_sites_preferences(options_df: pd.DataFrame) -> dict[dict]:
+    sites_options: dict[dict] = {}
+    for index in range(len(options_df)):
+        site_dict: dict = {}
+        options_dict: dict = {}
+        for key, value in options_df.iloc[index].to_dict().items():
+            if "option" in key:
+                if value:
+                    options_dict[value] = ""
+                    last_key = value
+            elif "value" in key:
+                if value:
+                    options_dict[last_key] = value
+            else:
+                site_dict[key] = value
+        site_dict["options"] = options_dict
+        sites_options.setdefault(site_dict["category"], {})[site_dict["site"]] = site_dict
+    return sites_options
+
+
+def measure(function, repeat: int) -> tuple[float, object]:
+    """Best time (in milliseconds) of the function among the repeats and its result."""
+    best_time = float("inf")
+    for _ in range(repeat):
+        start_time = perf_counter()
+        result = function()
+        best_time = min(best_time, perf_counter() - start_time)
+    return best_time * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="Number of site rows. Default: 5000")
+    parser.add_argument("--pairs", type=int, default=30, help="Number of option/value column pairs. Default: 30")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repeats (best is reported). Default: 5")
+    args = parser.parse_args()
+
+    raw_df = create_options_sheet(args.rows, args.pairs)
+    print(f"Options sheet: {args.rows} rows x {len(raw_df.columns)} columns\n")
+
+    legacy_time, legacy_df = measure(lambda: legacy_replace_nan(raw_df), args.repeat)
+    vectorized_time, options_df = measure(lambda: replace_nan(raw_df), args.repeat)
+    assert legacy_df.equals(options_df)
+    results = [("replace NaN", legacy_time, vectorized_time)]
+
+    # Manager without reading the Excel file
+    preference_manager = PreferenceManager.__new__(PreferenceManager)
+    preference_manager.options_df = options_df
+
+    legacy_time, expected = measure(lambda: legacy_fetch_categories_and_sites(options_df), args.repeat)
+    vectorized_time, result = measure(preference_manager.fetch_categories_and_sites, args.repeat)
+    assert result == expected
+    results.append(("fetch_categories_and_sites", legacy_time, vectorized_time))
+
+    legacy_time, expected = measure(lambda: legacy_fetch_sites_preferences(options_df), args.repeat)
+    vectorized_time, result = measure(preference_manager.fetch_sites_preferences, args.repeat)
+    assert result == expected
+    results.append(("fetch_sites_preferences", legacy_time, vectorized_time))
+
+    print(f"{'Operation':<30}{'Row by row (ms)':>18}{'Vectorized (ms)':>18}{'Speedup':>10}")
+    for operation, legacy_time, vectorized_time in results:
+        print(f"{operation:<30}{legacy_time:>18.2f}{vectorized_time:>18.2f}{legacy_time / vectorized_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark of the startup of the application (CLI and GUI paths) based on 'python -X importtime'.
+
+Application is launched with the AI_GENERATORS_EXIT_AFTER_STARTUP environment variable. So, it exits as soon as the front end is loaded.
+Reports the wall time of the launch, total import time and the slowest top-level imports of each path.
+The PyInstaller build (See myapp.spec) can be measured with '--exe' (only wall time, import times are not available in the frozen app).
+Usage (from the project directory): python benchmarks/bench_startup.py [--paths cli gui] [--repeat 5] [--top 10] [--exe "dist/ai_generator/AI Generators.exe"]
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from statistics import median
+from time import perf_counter
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXIT_AFTER_STARTUP_ENV = "AI_GENERATORS_EXIT_AFTER_STARTUP"
+
+
+def parse_import_times(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Parse the output of '-X importtime'.
+
+    Returns:
+        list[tuple[str, int, int, int]]: (module, self time (us), cumulative time (us), nesting level) of each import.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_time, cumulative_time, module = line[len("import time:") :].split("|")
+        level = (len(module) - len(module.lstrip())) // 2
+        imports.append((module.strip(), int(self_time), int(cumulative_time), level))
+    return imports
+
+
+def launch(command: list[str]) -> tuple[float, subprocess.CompletedProcess]:
+    """Launch the application and wait until it exits (after the startup). Returns the wall time (in seconds) and the process."""
+    env = dict(os.environ, **{EXIT_AFTER_STARTUP_ENV: "1"})
+    start_time = perf_counter()
+    process = subprocess.run(command, cwd=PROJECT_DIR, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    return perf_counter() - start_time, process
+
+
+def benchmark_path(interface_name: str, repeat: int, top: int) -> None:
+    """Benchmark the startup of the given front end ('cli' or 'gui') with the Python interpreter."""
+    wall_times, import_times = [], []
+    for _ in range(repeat):
+        wall_time, process = launch([sys.executable, "-X", "importtime", "app.py", interface_name])
+        if process.returncode != 0:
+            print(f"[{interface_name}] Failed to launch the application:\n{process.stderr.splitlines()[-1] if process.stderr else ''}\n")
+            return
+        wall_times.append(wall_time)
+        import_times.append(parse_import_times(process.stderr))
+
+    imports = import_times[-1]
+    total_import_time = median(sum(self_time for _, self_time, _, _ in run) for run in import_times)
+    print(f"[{interface_name}] Wall time: {median(wall_times) * 1000:.0f} ms | Total import time: {total_import_time / 1000:.0f} ms")
+    print(f"[{interface_name}] Modules imported: {len(imports)}")
+    print(f"[{interface_name}] Slowest top-level imports (cumulative):")
+    top_level_imports = sorted((item for item in imports if item[3] == 0), key=lambda item: item[2], reverse=True)
+    for module, _, cumulative_time, _ in top_level_imports[:top]:
+        print(f"    {cumulative_time / 1000:>9.1f} ms  {module}")
+    print()
+
+
+def benchmark_exe(exe_path: str, interface_name: str, repeat: int) -> None:
+    """Benchmark the startup of the PyInstaller build."""
+    wall_times = []
+    for _ in range(repeat):
+        wall_time, process = launch([os.path.abspath(exe_path), interface_name])
+        if process.returncode != 0:
+            print(f"[exe {interface_name}] Failed to launch the application (exit code {process.returncode}).\n")
+            return
+        wall_times.append(wall_time)
+    print(f"[exe {interface_name}] Wall time: {median(wall_times) * 1000:.0f} ms (median of {repeat})\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--paths", nargs="+", default=["cli", "gui"], choices=["cli", "gui"], help="Front ends to benchmark. Default: cli gui"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of launches per path (median is reported). Default: 5")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show. Default: 10")
+    parser.add_argument("--exe", help="Path of the executable built by PyInstaller (myapp.spec). If provided, the build is measured too.")
+    args = parser.parse_args()
+
+    for interface_name in args.paths:
+        benchmark_path(interface_name, args.repeat, args.top)
+        if args.exe:
+            benchmark_exe(args.exe, interface_name, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Module to keep warm (already launched) browsers and lease them to the site runs.
+
+Launching a browser takes several seconds. So, browsers are launched once (in the background at the startup of the application)
+and the same browsers are reused by the upcoming generations of all sites.
+Each browser of the pool has its own persistent profile directory. So, cookies (logins) of the sites are preserved across the runs.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 2900
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from queue import Queue
+from typing import Iterator, TYPE_CHECKING
+import tools
+
+if TYPE_CHECKING:
+    # Selenium is imported by the background thread (on launch of the browsers). So, it doesn't delay the startup of the application.
+    from selenium.webdriver import Chrome, Edge
+
+
+class BrowserPool:
+    """Class to launch a fixed number of browsers and lease them to the site runs."""
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_generations: int = 20,
+        profile_dir_path: str = "appdata/profile",
+        browser: str = "chrome",
+        headless: bool = False,
+        capture_network: bool = False,
+    ) -> None:
+        """Constructor of BrowserPool class. Browsers are launched in the background (lease() waits until one is ready).
+
+        Args:
+            size (int, optional): Number of browsers in the pool. Defaults to 1.
+            max_generations (int, optional): A browser is closed and launched again after this many generations (to free the memory leaked by the sites). Defaults to 20.
+            profile_dir_path (str, optional): Directory containing the profile directories of the browsers (one per browser). Defaults to "appdata/profile".
+            browser (str, optional): Desired browser (chrome or edge). Defaults to "chrome".
+            headless (bool, optional): Set to True for headless mode. Defaults to False.
+            capture_network (bool, optional): Set to True to launch the browsers with the performance logging (required by the network capture). Defaults to False.
+        """
+        self.size = max(1, int(size))
+        self.max_generations = max(1, int(max_generations))
+        # Absolute path because site modules change the CWD.
+        self.profile_dir_path = os.path.abspath(profile_dir_path)
+        self.browser = browser
+        self.headless = headless
+        self.capture_network = capture_network
+
+        # Idle browsers as [slot, driver, generations]. driver is None if the browser of the slot must be launched on lease.
+        self.idle_browsers: Queue[list] = Queue()
+        self.leased_browsers: dict[int, list] = {}  # {id(driver): [slot, driver, generations]}
+        self.lock = threading.Lock()
+        self.is_closed = False
+
+        threading.Thread(target=self._warm_up, name="browser_pool_warm_up", daemon=True).start()
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _launch(self, slot: int) -> "Chrome | Edge | None":
+        """Launch the browser of the given slot (with its own profile directory)."""
+        profile_dir_path = os.path.join(self.profile_dir_path, f"pool_{slot}")
+        os.makedirs(profile_dir_path, exist_ok=True)
+        logging.info(f"Launching the browser of the slot {slot} of the browser pool...")
+        try:
+            driver = tools.get_webdriver_instance(self.browser, self.headless, profile_dir_path, self.capture_network)
+            driver.maximize_window()
+        except Exception as e:
+            logging.exception(f"Failed to launch the browser of the slot {slot}. Error Code: 2901. Exception: {e}")
+            return None
+        return driver
+
+    def _warm_up(self) -> None:
+        """Launch all browsers of the pool (Executed in the background thread)."""
+        for slot in range(self.size):
+            driver = None if self.is_closed else self._launch(slot)
+            if self.is_closed:
+                self._quit(driver)  # Pool closed during the launch
+                driver = None
+            self.idle_browsers.put([slot, driver, 0])
+        logging.info(f"Browser pool is ready with {self.size} browsers.")
+
+    @staticmethod
+    def _quit(driver: "Chrome | Edge | None") -> None:
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Exception in closing the browser: {e}")
+
+    @staticmethod
+    def is_healthy(driver: "Chrome | Edge | None") -> bool:
+        """Check if the browser is still responding (not crashed or closed by the user).
+
+        Args:
+            driver (Chrome | Edge | None): The web driver.
+
+        Returns:
+            bool: True if the browser is responding else False.
+        """
+        if driver is None:
+            return False
+        try:
+            driver.window_handles
+            driver.current_url
+        except Exception:
+            return False
+        return True
+
+    def lease(self, timeout: int | float | None = None) -> "Chrome | Edge":
+        """Take a browser from the pool. Blocks until a browser is available.
+
+        Args:
+            timeout (int | float | None, optional): Maximum seconds to wait for a browser. Defaults to None (wait forever).
+
+        Returns:
+            Chrome | Edge: A healthy web driver. It must be returned by release() after use.
+
+        Raises:
+            queue.Empty: If no browser is available within the timeout.
+            RuntimeError: If the browser can't be launched.
+        """
+        slot, driver, generations = entry = self.idle_browsers.get(timeout=timeout)
+
+        if not self.is_healthy(driver):
+            if driver is not None:
+                logging.warning(f"Browser of the slot {slot} is not responding. Launching it again...")
+            self._quit(driver)
+            driver = self._launch(slot)
+            generations = 0
+            if driver is None:
+                self.idle_browsers.put([slot, None, 0])  # Next lease will try again
+                raise RuntimeError(f"Failed to launch the browser of the slot {slot}. Error Code: 2902")
+
+        entry[1:] = [driver, generations]
+        with self.lock:
+            self.leased_browsers[id(driver)] = entry
+        logging.info(f"Browser of the slot {slot} leased (used in {generations} generations).")
+        return driver
+
+    def release(self, driver: "Chrome | Edge", generations: int = 1) -> None:
+        """Return a leased browser to the pool.
+
+        Args:
+            driver (Chrome | Edge): The web driver returned by lease().
+            generations (int, optional): Number of generations performed with the browser during the lease. Defaults to 1.
+        """
+        with self.lock:
+            entry = self.leased_browsers.pop(id(driver))
+        slot = entry[0]
+        entry[2] += generations
+
+        if self.is_closed or entry[2] >= self.max_generations or not self.is_healthy(driver):
+            logging.info(f"Recycling the browser of the slot {slot} (used in {entry[2]} generations).")
+            self._quit(driver)
+            entry[1:] = [None, 0]  # Launched again on the next lease
+        else:
+            try:
+                # Closing the extra tabs opened by the site and leaving the browser on a blank page.
+                for handle in driver.window_handles[1:]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+                driver.get("about:blank")
+            except Exception as e:
+                logging.warning(f"Exception in resetting the browser of the slot {slot}: {e}")
+
+        self.idle_browsers.put(entry)
+
+    @contextmanager
+    def leased(self, timeout: int | float | None = None) -> Iterator["Chrome | Edge"]:
+        """Context manager version of lease() and release(). Counts the lease as a single generation."""
+        driver = self.lease(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Close all browsers of the pool (idle and leased)."""
+        self.is_closed = True
+        with self.lock:
+            drivers = [entry[1] for entry in self.leased_browsers.values()]
+            self.leased_browsers.clear()
+        while not self.idle_browsers.empty():
+            drivers.append(self.idle_browsers.get_nowait()[1])
+        for driver in drivers:
+            self._quit(driver)
+        logging.info("Browser pool closed.")
@@ -3,15 +3,15 @@
 CLI module to provide Command Line Interface for the application.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 09th June 2024
-Last-modified: 10th June 2024
+Last-modified: 17th October 2026
 Error-series: 2200
 """
 
 import logging
-import importlib
 import sys
 from typing import Literal
 from os import system
+import site_runner
 
 
 def clear_screen():
@@ -140,8 +140,30 @@ def prompt_selector_menu(prompts: list[str], selected_site: str) -> str | Litera
             continue
 
 
+def resume_jobs_menu(unfinished_jobs: int) -> bool:
+    """
+    A function to ask the user whether to resume the unfinished jobs of the selected site.
+
+    Parameters:
+        unfinished_jobs (int): Number of unfinished jobs of the selected site.
+
+    Returns:
+        bool: True if the user wants to resume the unfinished jobs else False (start a new batch).
+    """
+    print(f"\n{unfinished_jobs} unfinished jobs found for the selected site (from a previous interrupted batch).")
+    choice = input("Write 'y' to resume them or press 'enter' to start a new batch: ")
+    return choice.lower() in ["y", "yes"]
+
+
 def main(
-    categories: list, categories_sites_mapping: dict, sites_preferences: dict, prompts: list, driver=None, *args, **kwargs
+    categories: list,
+    categories_sites_mapping: dict,
+    sites_preferences: dict,
+    prompts: list,
+    driver=None,
+    browser_pool=None,
+    *args,
+    **kwargs,
 ) -> Literal[False] | None:
     """
     A function that handles the main logic of the program.
@@ -154,12 +176,15 @@ def main(
         sites_preferences (dict): A dictionary containing preferences for each site.
         prompts (list): A list of available prompts.
         driver (optional): An optional driver object.
+        browser_pool (BrowserPool, optional): Pool of warm browsers. Used if driver is not provided. Defaults to None.
         *args: Additional positional arguments.
         **kwargs: Additional keyword arguments.
 
     Returns:
         Literal[False] | None: False if the user selects to exit the program, otherwise None.
     """
+    db = None  # Created on first use. So, the category menu appears without waiting for the database modules to load.
+
     while True:
         try:
             while True:
@@ -176,6 +201,17 @@ def main(
                         start_from_top = True
                         break
 
+                    if db is None:
+                        from db_scripts import AIGeneratorDB
+
+                        db = AIGeneratorDB()
+                    unfinished_jobs = len(db.get_unfinished_jobs(selected_category, selected_site))
+                    resume_jobs = bool(unfinished_jobs) and resume_jobs_menu(unfinished_jobs)
+                    if resume_jobs:
+                        # Prompts of the unfinished jobs are used.
+                        selected_prompt = None
+                        break
+
                     selected_prompt = prompt_selector_menu(prompts, selected_site)
                     if selected_prompt is False:
                         continue
@@ -185,26 +221,25 @@ def main(
                     continue
                 break
 
+            sites_preferences[selected_category][selected_site]["resume_jobs"] = resume_jobs
+
             # Updating prompt for the selected site
-            if "prompt" in sites_preferences[selected_category][selected_site]["options"].keys():
+            if not resume_jobs and "prompt" in sites_preferences[selected_category][selected_site]["options"].keys():
                 # BTW Above condition is not required. If prompt key doesn't exist then 'prompt' key will created and accepted by **kwargs of the function which accept this site options as args.
                 sites_preferences[selected_category][selected_site]["options"]["prompt"] = selected_prompt
 
-            category_package_name_mapping: dict[str, str] = {
-                "text_to_video": "ai_video_generators",
-                "image_to_video": "ai_video_generators",
-                "text_to_image": "ai_image_generators",
-                "text_to_text": "ai_content_generators",
-            }
-
             logging.info("======================Starting a new AI Generation =======================")
             logging.info(f"Category: {selected_category} | Site: {selected_site} | Prompt: {selected_prompt}")
             print("Starting a new AI Generation")
             print(f"Category: {selected_category} | Site: {selected_site}")
 
-            module = f"{category_package_name_mapping[selected_category]}.{selected_site}_ai.main"
-            module = importlib.import_module(module)
-            status: bool = module.main(site_preferences=sites_preferences[selected_category][selected_site], driver=driver, *args, **kwargs)
+            site_preferences: dict = sites_preferences[selected_category][selected_site]
+            if browser_pool and not driver:
+                status: bool = site_runner.run_site_with_browser_pool(
+                    browser_pool, selected_category, selected_site, site_preferences, *args, **kwargs
+                )
+            else:
+                status: bool = site_runner.run_site(selected_category, selected_site, site_preferences, driver, *args, **kwargs)
 
             if status:
                 logging.info("======================AI Generation Completed | STATUS -> SUCCESS =======================")
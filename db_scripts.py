@@ -3,23 +3,119 @@
 You can import this module to perform database operations for any site.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 28th June 2024
-Last-modified: 5th July 2024
+Last-modified: 17th October 2026
+Error-series: 3500
 """
 
-from datetime import datetime
-from models import Sites, Prompts, Images, Output, get_new_session
+import os
+import json
+import atexit
+import hashlib
+import logging
+import threading
+import weakref
+from time import time
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+from sqlalchemy import update, select, func
+from sqlalchemy.dialects.sqlite import insert
+from models import Sites, Prompts, Images, Output, Jobs, session_scope
+import output_store
+
+MAX_JOB_ATTEMPTS = 3  # A job is not resumed anymore after this many attempts.
+JOB_CHUNK_SIZE = 100  # Number of streamed payloads inserted as jobs at once.
+OUTPUT_BUFFER_SIZE = 20  # Buffered outputs are written (in one transaction) when this many outputs are buffered.
+OUTPUT_FLUSH_INTERVAL = 60  # Seconds. Buffered outputs are written if the oldest one is buffered for this long.
+MAX_QUERY_PARAMETERS = 500  # Generation keys are looked up in chunks of this size (SQLite limits the number of parameters of a query).
+PAYLOAD_OPTIONS = frozenset({"prompt", "headline", "image"})  # Options holding the items of the batch. Not part of the generation key.
+
+
+def normalize_value(value):
+    """Normalize a prompt or an option value for the generation key (extra whitespaces are removed and 1.0 is same as 1)."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def compute_generation_key(site: str, category: str, payload_type: str, payload: str, options: dict | None = None) -> str:
+    """Compute the key of a generation. Generations having the same key produce the same kind of output.
+
+    Args:
+        site (str): The name of the site.
+        category (str): The category of the site.
+        payload_type (str): Type of the payload. 'prompt' or 'image'.
+        payload (str): The prompt or the image path.
+        options (dict | None, optional): Options of the site (like seed, style and duration). Empty options, lists/iterators and the payload options (See PAYLOAD_OPTIONS) are ignored. Defaults to None.
+
+    Returns:
+        str: SHA-256 (hex) of the normalized site, category, payload and options.
+    """
+    payload = os.path.normpath(payload) if payload_type == "image" else normalize_value(payload)
+    normalized_options = {}
+    for name, value in (options or {}).items():
+        value = normalize_value(value)
+        if name.strip().lower() in PAYLOAD_OPTIONS or value in ("", None) or isinstance(value, (list, tuple, dict, Iterator)):
+            continue
+        normalized_options[name.strip().lower()] = value
+    data = json.dumps(
+        [site.strip().lower(), category.strip().lower(), payload_type, payload, normalized_options], sort_keys=True, default=str
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
 
 
 class AIGeneratorDB:
+    # IDs never change once inserted. So, these are shared by all objects of the process. {value: id}
+    _site_ids: dict[str, int] = {}
+    _prompt_ids: dict[str, int] = {}
+    _image_ids: dict[str, int] = {}
+    _cache_lock = threading.Lock()
+    # Objects having buffered outputs are flushed at the exit of the process.
+    _instances: "weakref.WeakSet[AIGeneratorDB]" = weakref.WeakSet()
+
     def __init__(self) -> None:
-        """Initialize the object with a new session.
+        """Initialize the object.
         No parameters.
         Returns None.
+
+        Each operation uses the session of the calling thread (See models.session_scope()). So, an object can be used by multiple threads.
         """
-        self.session = get_new_session()
+        # Write-behind buffer. Outputs (and the jobs completed by them) are written in a single transaction by flush().
+        self.pending_outputs: list[dict] = []
+        self.pending_done_job_ids: list[int] = []
+        self.first_pending_time: float | None = None
+        self.buffer_lock = threading.RLock()
+        self.generation_keys: dict[int, str] = {}  # {job_id: generation_key} of the loaded jobs. Stored with their outputs.
+        AIGeneratorDB._instances.add(self)
 
     def __del__(self) -> None:
-        self.session.close()
+        self.close()
+
+    def close(self) -> None:
+        """Write the buffered outputs."""
+        try:
+            self.flush()
+        except Exception as e:
+            logging.exception(f"Failed to write the buffered outputs. Error Code: 3501. Exception: {e}")
+
+    def _get_or_insert_id(self, cache: dict[str, int], model, column, value: str) -> int:
+        """Get the ID of the row having the value (in the unique column). Row is inserted (INSERT ... ON CONFLICT DO NOTHING) if not exists."""
+        with AIGeneratorDB._cache_lock:
+            id = cache.get(value)
+        if id is not None:
+            return id
+
+        with session_scope() as session:
+            id = session.execute(select(model.id).where(column == value)).scalar_one_or_none()
+            if id is None:
+                # Another session (or process) may insert the same value at the same time. So, conflict is ignored instead of failing.
+                session.execute(insert(model).values({column.key: value}).on_conflict_do_nothing(index_elements=[column.key]))
+                id = session.execute(select(model.id).where(column == value)).scalar_one()
+
+        with AIGeneratorDB._cache_lock:
+            cache[value] = id
+        return id
 
     def get_site_id(self, site: str) -> int:
         """Get the site ID for a given site name.
@@ -30,7 +126,8 @@ class AIGeneratorDB:
         Returns:
             int: The site ID.
         """
-        return self.session.query(Sites.id).where(Sites.site == site).one()[0]
+        # Sites are inserted in the background at the startup of the application. So, it is inserted here if not inserted yet.
+        return self._get_or_insert_id(AIGeneratorDB._site_ids, Sites, Sites.site, site)
 
     def insert_prompt(self, prompt: str) -> int:
         """Insert a prompt into the database.
@@ -44,17 +141,7 @@ class AIGeneratorDB:
         Returns:
             int: The ID of the inserted prompt.
         """
-        # Check if the prompt already exists
-        id = self.session.query(Prompts.id).where(Prompts.prompt == prompt).one_or_none()
-        if id:
-            # Prompt already exists
-            return id[0]
-
-        # Prompt doesn't exist, insert it
-        row = Prompts(prompt=prompt)
-        self.session.add(row)
-        self.session.commit()
-        return row.id
+        return self._get_or_insert_id(AIGeneratorDB._prompt_ids, Prompts, Prompts.prompt, prompt)
 
     def insert_image(self, image: str) -> int:
         """Insert an image (image_path) into the database.
@@ -68,56 +155,97 @@ class AIGeneratorDB:
         Returns:
             int: The ID of the inserted image (image_path).
         """
-        # Check if the image path already exists
-        id = self.session.query(Images.id).where(Images.image == image).one_or_none()
-        if id:
-            # Image path already exists
-            return id[0]
-
-        # Image path doesn't exist, insert it
-        row = Images(image=image)
-        self.session.add(row)
-        self.session.commit()
-        return row.id
+        return self._get_or_insert_id(AIGeneratorDB._image_ids, Images, Images.image, image)
 
     def insert_output(
-        self, file_path: str | list, category: str, site_id: str, prompt_id: str = None, image_id: str = None, timestamp: datetime = None
+        self,
+        file_path: str | list,
+        category: str,
+        site_id: str,
+        prompt_id: str = None,
+        image_id: str = None,
+        timestamp: datetime = None,
+        job_id: int | None = None,
+        generation_key: str | None = None,
     ):
         """Insert the output into the database.
 
+        Outputs are buffered and written in a single transaction (See flush()) when OUTPUT_BUFFER_SIZE outputs are buffered
+        or the oldest one is buffered for OUTPUT_FLUSH_INTERVAL seconds. Call flush() at the end of the batch.
+
         Parameters:
             file_path (str | list): The path to the output file or list of path to output files (if more than one output files).
+                Outputs written into the output store are recorded with the path of their content in the store (object_path).
             category (str): The category of the site.
             site_id (str): The ID of the site.
             prompt_id (str, optional): The ID of the prompt (default is None).
             image_id (str, optional): The ID of the image (default is None).
             timestamp (datetime, optional): The timestamp of AI generation (default is None). If None then datetime.now() will used.
+            job_id (int | None, optional): The ID of the job completed by this output. It is marked as done in the same transaction (default is None).
+                Not marked if there is no output file (file_path is an empty list).
+            generation_key (str | None, optional): Key of the generation (See compute_generation_key()). If None then the key of the job is used (default is None).
         """
-        if isinstance(file_path, str):
-            self.session.add(
-                Output(
-                    file_path=file_path,
-                    category=category,
-                    site_id=site_id,
-                    prompt_id=prompt_id,
-                    image_id=image_id,
-                    timestamp=timestamp if timestamp else datetime.now(),
-                )
-            )
-        else:
-            rows = [
-                Output(
-                    file_path=path,
-                    category=category,
-                    site_id=site_id,
-                    prompt_id=prompt_id,
-                    image_id=image_id,
-                    timestamp=timestamp if timestamp else datetime.now(),
-                )
-                for path in file_path
-            ]
-            self.session.add_all(rows)
-        self.session.commit()
+        if generation_key is None and job_id is not None:
+            generation_key = self.generation_keys.get(job_id)
+        file_paths = [file_path] if isinstance(file_path, str) else file_path
+        store = output_store.get_output_store()
+        rows = [
+            {
+                "file_path": path,
+                "category": category,
+                "site_id": site_id,
+                "prompt_id": prompt_id,
+                "image_id": image_id,
+                "timestamp": timestamp if timestamp else datetime.now(),
+                "generation_key": generation_key,
+                "object_path": store.pop_object_path(path) if store else None,  # Content of the output in the store
+            }
+            for path in file_paths
+        ]
+
+        with self.buffer_lock:
+            self.pending_outputs.extend(rows)
+            if job_id is not None and rows:  # A job without any output file is not done (it must be resumed)
+                self.pending_done_job_ids.append(job_id)
+            if self.first_pending_time is None:
+                self.first_pending_time = time()
+            if len(self.pending_outputs) >= OUTPUT_BUFFER_SIZE or time() - self.first_pending_time >= OUTPUT_FLUSH_INTERVAL:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered outputs (upsert by file path) and mark their jobs as done in a single transaction."""
+        with self.buffer_lock:
+            if not self.pending_outputs and not self.pending_done_job_ids:
+                return
+            with session_scope() as session:
+                if self.pending_outputs:
+                    statement = insert(Output).values(self.pending_outputs)
+                    # Same file path means the file is overwritten. So, details of the latest generation are kept.
+                    statement = statement.on_conflict_do_update(
+                        index_elements=[Output.file_path],
+                        set_={
+                            column: statement.excluded[column]
+                            for column in ["category", "site_id", "prompt_id", "image_id", "timestamp", "generation_key", "object_path"]
+                        },
+                    )
+                    session.execute(statement)
+                if self.pending_done_job_ids:
+                    session.execute(
+                        update(Jobs).where(Jobs.id.in_(self.pending_done_job_ids)).values(state="done", updated_at=datetime.now())
+                    )
+            logging.info(f"Written {len(self.pending_outputs)} buffered outputs into the database.")
+            self.pending_outputs = []
+            self.pending_done_job_ids = []
+            self.first_pending_time = None
+
+    @staticmethod
+    def flush_all() -> None:
+        """Write the buffered outputs of all objects (Called at the exit of the process)."""
+        for db in list(AIGeneratorDB._instances):
+            try:
+                db.flush()
+            except Exception as e:
+                logging.exception(f"Failed to write the buffered outputs. Error Code: 3501. Exception: {e}")
 
     def insert_sites_if_not_exist(self, sites: list):
         """Insert sites into the database if they do not already exist.
@@ -128,9 +256,346 @@ class AIGeneratorDB:
         Returns:
             None
         """
-        for site in sites:
-            row = self.session.query(Sites).filter_by(site=site).first()
-            if not row:
-                # If site doesn't exit.
-                self.session.add(Sites(site=site))
-        self.session.commit()
+        if not sites:
+            return
+        # Existing sites are skipped by the database itself (single statement instead of a query per site).
+        with session_scope() as session:
+            session.execute(insert(Sites).values([{"site": site} for site in sites]).on_conflict_do_nothing(index_elements=[Sites.site]))
+
+    def create_jobs(
+        self, category: str, site: str, payload_type: str, payloads: list[str], generation_keys: list[str] | None = None
+    ) -> list[int]:
+        """Insert a new batch of jobs (in pending state) into the database.
+
+        Args:
+            category (str): The category of the site.
+            site (str): The name of the site.
+            payload_type (str): Type of the payloads. 'prompt' or 'image'.
+            payloads (list[str]): Prompts or image paths of the batch (in order).
+            generation_keys (list[str] | None, optional): Generation keys of the payloads (in order). Stored with the outputs of the jobs. Defaults to None.
+
+        Returns:
+            list[int]: IDs of the inserted jobs (in order of the payloads).
+        """
+        site_id = self.get_site_id(site)
+        now = datetime.now()
+        rows = [
+            Jobs(
+                category=category,
+                site_id=site_id,
+                payload_type=payload_type,
+                payload=payload,
+                state="pending",
+                attempts=0,
+                created_at=now,
+                updated_at=now,
+                generation_key=generation_key,
+            )
+            for payload, generation_key in zip(payloads, generation_keys or [None] * len(payloads))
+        ]
+        with session_scope() as session:
+            session.add_all(rows)
+        for row in rows:
+            if row.generation_key:
+                self.generation_keys[row.id] = row.generation_key
+        return [row.id for row in rows]
+
+    def get_unfinished_jobs(self, category: str, site: str, payload_type: str = None, max_attempts: int = MAX_JOB_ATTEMPTS) -> list[Jobs]:
+        """Get the jobs of the site which are not done yet (pending, running or failed) and still have attempts left.
+
+        Args:
+            category (str): The category of the site.
+            site (str): The name of the site.
+            payload_type (str, optional): Type of the payloads ('prompt' or 'image'). Defaults to None (all types).
+            max_attempts (int, optional): Jobs attempted this many times are excluded. Defaults to MAX_JOB_ATTEMPTS.
+
+        Returns:
+            list[Jobs]: The unfinished jobs in order of their creation.
+        """
+        query = select(Jobs).where(
+            Jobs.category == category,
+            Jobs.site_id == self.get_site_id(site),
+            Jobs.state != "done",
+            Jobs.attempts < max_attempts,
+        )
+        if payload_type:
+            query = query.where(Jobs.payload_type == payload_type)
+        with session_scope() as session:
+            return list(session.scalars(query.order_by(Jobs.id)))
+
+    def update_jobs_state(self, job_ids: int | list[int], state: str, increment_attempts: bool = False) -> None:
+        """Update the state of the jobs.
+
+        Args:
+            job_ids (int | list[int]): ID of the job or list of IDs of the jobs.
+            state (str): The new state. 'pending', 'running', 'done' or 'failed'.
+            increment_attempts (bool, optional): Whether to increment the attempts of the jobs. Defaults to False.
+        """
+        job_ids = [job_ids] if isinstance(job_ids, int) else job_ids
+        if not job_ids:
+            return
+        values = {"state": state, "updated_at": datetime.now()}
+        if increment_attempts:
+            values["attempts"] = Jobs.attempts + 1
+        with session_scope() as session:
+            session.execute(update(Jobs).where(Jobs.id.in_(job_ids)).values(**values))
+
+    def is_output_exist(self, category: str, site_id: int, prompt: str = None, image: str = None) -> bool:
+        """Check if the output of the prompt/image already exists for the site.
+
+        Args:
+            category (str): The category of the site.
+            site_id (int): The ID of the site.
+            prompt (str, optional): The prompt. Defaults to None.
+            image (str, optional): The image path. Defaults to None.
+
+        Returns:
+            bool: True if at least one output exists else False.
+        """
+        query = select(Output.file_path).where(Output.category == category, Output.site_id == site_id)
+        if prompt is not None:
+            query = query.join(Prompts, Output.prompt_id == Prompts.id).where(Prompts.prompt == prompt)
+        else:
+            query = query.join(Images, Output.image_id == Images.id).where(Images.image == image)
+        with session_scope() as session:
+            return session.execute(query.limit(1)).first() is not None
+
+    def get_outputs(
+        self, site: str, start_time: datetime = None, end_time: datetime = None, category: str = None, limit: int = None
+    ) -> list[Output]:
+        """Get the outputs of the site generated in the date range (uses the index on (site_id, timestamp)).
+
+        Args:
+            site (str): The name of the site.
+            start_time (datetime, optional): Outputs generated at or after this time. Defaults to None (no lower bound).
+            end_time (datetime, optional): Outputs generated before this time. Defaults to None (no upper bound).
+            category (str, optional): Only outputs of this category. Defaults to None (all categories).
+            limit (int, optional): Maximum number of outputs (latest first). Defaults to None (all outputs).
+
+        Returns:
+            list[Output]: The outputs (latest first).
+        """
+        self.flush()  # So, the buffered outputs are included
+        query = select(Output).where(Output.site_id == self.get_site_id(site))
+        if start_time is not None:
+            query = query.where(Output.timestamp >= start_time)
+        if end_time is not None:
+            query = query.where(Output.timestamp < end_time)
+        if category is not None:
+            query = query.where(Output.category == category)
+        query = query.order_by(Output.timestamp.desc()).limit(limit)
+        with session_scope() as session:
+            return list(session.scalars(query))
+
+    def get_latest_output(self, prompt: str = None, image: str = None, site: str = None) -> Output | None:
+        """Get the latest output of the prompt/image (uses the indexes on prompt_id/image_id).
+
+        Args:
+            prompt (str, optional): The prompt. Defaults to None.
+            image (str, optional): The image path. Used if prompt is None. Defaults to None.
+            site (str, optional): Only outputs of this site. Defaults to None (all sites).
+
+        Returns:
+            Output | None: The latest output. None if no output exists.
+        """
+        self.flush()
+        query = select(Output)
+        if prompt is not None:
+            query = query.join(Prompts, Output.prompt_id == Prompts.id).where(Prompts.prompt == prompt)
+        else:
+            query = query.join(Images, Output.image_id == Images.id).where(Images.image == image)
+        if site is not None:
+            query = query.where(Output.site_id == self.get_site_id(site))
+        with session_scope() as session:
+            return session.scalars(query.order_by(Output.timestamp.desc()).limit(1)).first()
+
+    def count_outputs_by_category(self, site: str = None) -> dict[str, int]:
+        """Count the outputs of each category (uses the index on category).
+
+        Args:
+            site (str, optional): Only outputs of this site. Defaults to None (all sites).
+
+        Returns:
+            dict[str, int]: {category: number of outputs}
+        """
+        self.flush()
+        query = select(Output.category, func.count()).group_by(Output.category)
+        if site is not None:
+            query = query.where(Output.site_id == self.get_site_id(site))
+        with session_scope() as session:
+            return dict(session.execute(query).all())
+
+    def find_generated_keys(self, generation_keys: Iterable[str], ttl_hours: float = 0) -> set[str]:
+        """Find the generation keys which already have outputs (uses the index on the generation key).
+
+        Args:
+            generation_keys (Iterable[str]): The generation keys. See compute_generation_key().
+            ttl_hours (float, optional): Outputs older than this many hours are ignored (regenerated). Defaults to 0 (outputs never expire).
+
+        Returns:
+            set[str]: The keys having at least one output.
+        """
+        self.flush()
+        generation_keys = list(set(generation_keys))
+        generated_keys = set()
+        with session_scope() as session:
+            for index in range(0, len(generation_keys), MAX_QUERY_PARAMETERS):
+                query = select(Output.generation_key).where(
+                    Output.generation_key.in_(generation_keys[index : index + MAX_QUERY_PARAMETERS])
+                )
+                if ttl_hours:
+                    query = query.where(Output.timestamp >= datetime.now() - timedelta(hours=ttl_hours))
+                generated_keys.update(session.scalars(query.distinct()))
+        return generated_keys
+
+    def skip_generated_payloads(
+        self,
+        category: str,
+        site: str,
+        payload_type: str,
+        payloads: list[str],
+        options: dict | None,
+        memoize: bool = False,
+        ttl_hours: float = 0,
+    ) -> tuple[list[str], list[str] | None]:
+        """Compute the generation keys of the payloads and remove the payloads already generated (if memoize is True).
+
+        Args:
+            category (str): The category of the site.
+            site (str): The name of the site.
+            payload_type (str): Type of the payloads. 'prompt' or 'image'.
+            payloads (list[str]): Prompts or image paths.
+            options (dict | None): Options of the site. If None then generation keys are not computed (and nothing is skipped).
+            memoize (bool, optional): Whether to remove the payloads already generated. Defaults to False.
+            ttl_hours (float, optional): Outputs older than this many hours are regenerated. Defaults to 0 (outputs never expire).
+
+        Returns:
+            tuple[list[str], list[str] | None]: The remaining payloads and their generation keys (in same order).
+        """
+        if options is None:
+            return payloads, None
+        generation_keys = [compute_generation_key(site, category, payload_type, payload, options) for payload in payloads]
+        if not memoize:
+            return payloads, generation_keys
+
+        generated_keys = self.find_generated_keys(generation_keys, ttl_hours)
+        if not generated_keys:
+            return payloads, generation_keys
+        remaining = [(payload, key) for payload, key in zip(payloads, generation_keys) if key not in generated_keys]
+        logging.info(
+            f"Skipped {len(payloads) - len(remaining)} {payload_type}s (already generated with the same site, category and options)."
+        )
+        return [payload for payload, _ in remaining], [key for _, key in remaining]
+
+    def stream_jobs(
+        self,
+        category: str,
+        site: str,
+        payload_type: str,
+        payloads: Iterable[str],
+        job_ids: list[int],
+        chunk_size: int = JOB_CHUNK_SIZE,
+        options: dict | None = None,
+        memoize: bool = False,
+        ttl_hours: float = 0,
+    ) -> Iterator[str]:
+        """Create the jobs of a new batch lazily (chunk by chunk) while the payloads are consumed.
+
+        Jobs are inserted (in running state) just before their payloads are yielded and their IDs are appended to 'job_ids'.
+        So, job_ids[index] is available for every yielded payload and the first generation starts without reading all payloads.
+
+        Args:
+            category (str): The category of the site.
+            site (str): The name of the site.
+            payload_type (str): Type of the payloads. 'prompt' or 'image'.
+            payloads (Iterable[str]): Prompts or image paths of the batch. E.g: PreferenceManager.iterate_prompts().
+            job_ids (list[int]): List to which the IDs of the created jobs are appended (in order of the payloads).
+            chunk_size (int, optional): Number of payloads inserted as jobs at once. Defaults to JOB_CHUNK_SIZE.
+            options (dict | None, optional): Options of the site. See skip_generated_payloads(). Defaults to None.
+            memoize (bool, optional): Whether to skip the payloads already generated. Defaults to False.
+            ttl_hours (float, optional): Outputs older than this many hours are regenerated. Defaults to 0 (outputs never expire).
+
+        Yields:
+            str: The payloads.
+        """
+
+        def create_chunk_jobs(chunk: list[str]) -> list[str]:
+            chunk, generation_keys = self.skip_generated_payloads(category, site, payload_type, chunk, options, memoize, ttl_hours)
+            if chunk:
+                created_job_ids = self.create_jobs(category, site, payload_type, chunk, generation_keys)
+                self.update_jobs_state(created_job_ids, "running", increment_attempts=True)
+                job_ids.extend(created_job_ids)
+            return chunk
+
+        chunk: list[str] = []
+        for payload in payloads:
+            chunk.append(payload)
+            if len(chunk) < chunk_size:
+                continue
+            yield from create_chunk_jobs(chunk)
+            chunk = []
+
+        if chunk:
+            yield from create_chunk_jobs(chunk)
+
+    def load_jobs(
+        self,
+        category: str,
+        site: str,
+        payload_type: str,
+        payloads: Iterable[str],
+        resume: bool = False,
+        options: dict | None = None,
+        memoize: bool = False,
+        ttl_hours: float = 0,
+        force: bool = False,
+    ) -> tuple[list[int], list[str] | Iterator[str]]:
+        """Get the jobs to be processed by the site and mark them as running.
+
+        If resume is True then the unfinished jobs of the site are loaded (payloads are ignored) and jobs whose output already exists are marked as done and skipped.
+        Otherwise, a new batch of jobs is created from the payloads.
+        If payloads is not a list (like a generator streaming the rows of a sheet) then jobs are created lazily during the iteration (See stream_jobs()).
+        If options are provided then the generation key of each payload is stored with its output. With memoize, payloads whose key already has an output are skipped.
+
+        Args:
+            category (str): The category of the site.
+            site (str): The name of the site.
+            payload_type (str): Type of the payloads. 'prompt' or 'image'.
+            payloads (Iterable[str]): Prompts or image paths of the new batch.
+            resume (bool, optional): Whether to resume the unfinished jobs instead of creating a new batch. Defaults to False.
+            options (dict | None, optional): Options of the site (site_preferences["options"]). Defaults to None (no generation keys).
+            memoize (bool, optional): Whether to skip the payloads already generated with the same site, category and options. Defaults to False.
+            ttl_hours (float, optional): Outputs older than this many hours are regenerated. Defaults to 0 (outputs never expire).
+            force (bool, optional): Regenerate everything even if memoize is True. Defaults to False.
+
+        Returns:
+            tuple[list[int], list[str] | Iterator[str]]: IDs of the jobs and their payloads (in same order). In case of streamed payloads, IDs are filled during the iteration.
+        """
+        memoize = memoize and not force
+        if resume:
+            site_id = self.get_site_id(site)
+            job_ids, payloads, completed_job_ids = [], [], []
+            for job in self.get_unfinished_jobs(category, site, payload_type):
+                if self.is_output_exist(category, site_id, **{payload_type: job.payload}):
+                    completed_job_ids.append(job.id)
+                else:
+                    job_ids.append(job.id)
+                    payloads.append(job.payload)
+                    if job.generation_key:
+                        self.generation_keys[job.id] = job.generation_key
+            self.update_jobs_state(completed_job_ids, "done")
+            logging.info(f"Resuming {len(job_ids)} unfinished jobs. Skipped {len(completed_job_ids)} jobs (output already exists).")
+        elif not isinstance(payloads, list):
+            job_ids = []
+            return job_ids, self.stream_jobs(
+                category, site, payload_type, payloads, job_ids, options=options, memoize=memoize, ttl_hours=ttl_hours
+            )
+        else:
+            payloads, generation_keys = self.skip_generated_payloads(category, site, payload_type, payloads, options, memoize, ttl_hours)
+            job_ids = self.create_jobs(category, site, payload_type, payloads, generation_keys)
+
+        self.update_jobs_state(job_ids, "running", increment_attempts=True)
+        return job_ids, payloads
+
+
+atexit.register(AIGeneratorDB.flush_all)
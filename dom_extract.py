@@ -0,0 +1,122 @@
+"""Module to extract the data (IDs, texts and URLs) of many elements of a page in a single WebDriver round trip.
+
+Reading an attribute/property of an element by WebDriver (get_attribute(), get_property(), find_elements()) is a separate HTTP round trip.
+Here, a single JavaScript snippet finds all requested elements, reads the requested fields and returns everything as one JSON payload.
+Round trips saved by the extractions are counted (See get_round_trip_stats()) and logged at the exit of the process.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3700
+"""
+
+import json
+import atexit
+import logging
+import threading
+from typing import Any
+from selenium.webdriver import Chrome, Edge
+import dom_wait
+
+# Locator strategy. (CLOSEST, css_selector) finds the closest ancestor (or itself) of the root element matching the selector.
+CLOSEST = "closest"
+
+# arguments: [queries, root]. queries is {name: [locator, {key: field}]}. Field is a property (like 'innerText') or an attribute prefixed by '@' (like '@id').
+# Returns JSON of {name: [{key: value}]} (one object per element, in document order).
+EXTRACT_SCRIPT = """
+const [queries, root] = arguments;
+const scope = root || document;
+const findAll = (locator) => {
+    const [by, value] = locator;
+    if (by === "xpath") {
+        const snapshot = document.evaluate(value, scope, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        return Array.from({length: snapshot.snapshotLength}, (_, index) => snapshot.snapshotItem(index));
+    }
+    if (by === "closest") {
+        const element = root && root.closest(value);
+        return element ? [element] : [];
+    }
+    return Array.from(scope.querySelectorAll(value));
+};
+const read = (element, field) => {
+    const value = field.startsWith("@") ? element.getAttribute(field.slice(1)) : element[field];
+    return value === undefined ? null : value;
+};
+const result = {};
+for (const [name, [locator, fields]] of Object.entries(queries)) {
+    result[name] = findAll(locator).map(
+        (element) => Object.fromEntries(Object.entries(fields).map(([key, field]) => [key, read(element, field)]))
+    );
+}
+return JSON.stringify(result);
+"""
+
+_round_trip_stats = {"extractions": 0, "elements": 0, "round_trips_saved": 0}
+_round_trip_stats_lock = threading.Lock()
+
+
+def extract_many(
+    driver: Chrome | Edge, queries: dict[str, tuple[tuple[str, str], dict[str, str]]], root: Any = None
+) -> dict[str, list[dict]]:
+    """Extract the fields of the elements of several locators in a single round trip.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        queries (dict[str, tuple[tuple[str, str], dict[str, str]]]): {name: (locator, {key: field})}. Field is a property (like 'innerText', 'src')
+            or an attribute prefixed by '@' (like '@id'). E.g: {"images": ((By.CSS_SELECTOR, "img.result"), {"src": "src"})}
+        root (WebElement, optional): Elements are searched inside this element. Defaults to None (complete page).
+
+    Returns:
+        dict[str, list[dict]]: {name: [{key: value}]} One dict per element (in document order).
+    """
+    js_queries = {
+        name: [list(locator) if locator[0] == CLOSEST else dom_wait.to_js_locator(locator), fields]
+        for name, (locator, fields) in queries.items()
+    }
+    result: dict[str, list[dict]] = json.loads(driver.execute_script(EXTRACT_SCRIPT, js_queries, root))
+
+    # Without the extraction: one find_elements() per locator and one call per field of each element.
+    elements = sum(len(items) for items in result.values())
+    round_trips = sum(1 + len(items) * len(queries[name][1]) for name, items in result.items())
+    with _round_trip_stats_lock:
+        _round_trip_stats["extractions"] += 1
+        _round_trip_stats["elements"] += elements
+        _round_trip_stats["round_trips_saved"] += round_trips - 1
+        total_saved = _round_trip_stats["round_trips_saved"]
+    logging.debug(f"Extracted {elements} elements in 1 round trip instead of {round_trips} ({total_saved} round trips saved in total).")
+    return result
+
+
+def extract(driver: Chrome | Edge, locator: tuple[str, str], fields: dict[str, str], root: Any = None) -> list[dict]:
+    """Extract the fields of all elements matching the locator in a single round trip. See extract_many().
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        locator (tuple[str, str]): The Selenium locator (or (CLOSEST, css_selector) with root). E.g: (By.XPATH, "//div[contains(@id, 'cell_')]").
+        fields (dict[str, str]): {key: field}. E.g: {"id": "@id", "text": "innerText"}.
+        root (WebElement, optional): Elements are searched inside this element. Defaults to None (complete page).
+
+    Returns:
+        list[dict]: One dict ({key: value}) per element (in document order).
+    """
+    return extract_many(driver, {"elements": (locator, fields)}, root)["elements"]
+
+
+def get_round_trip_stats() -> dict[str, int]:
+    """Get the number of extractions, extracted elements and WebDriver round trips saved (by this process).
+
+    Returns:
+        dict[str, int]: {'extractions': int, 'elements': int, 'round_trips_saved': int}
+    """
+    with _round_trip_stats_lock:
+        return dict(_round_trip_stats)
+
+
+def log_round_trip_stats() -> None:
+    stats = get_round_trip_stats()
+    if stats["extractions"]:
+        logging.info(
+            f"DOM extraction: {stats['extractions']} extractions ({stats['elements']} elements) saved {stats['round_trips_saved']} WebDriver round trips."
+        )
+
+
+atexit.register(log_round_trip_stats)
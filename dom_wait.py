@@ -0,0 +1,212 @@
+"""Module to wait for a DOM condition using an in-page MutationObserver (instead of polling through WebDriver).
+
+WebDriverWait checks the condition every 500 ms and each check is a round trip to the browser.
+Here, the condition is checked inside the page whenever the DOM changes (and every second as a fallback) and the result is returned as soon as it is satisfied.
+Long waits are split into slices (one execute_async_script call per slice). So, a 10 min wait costs ~10 round trips instead of ~1200.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3200
+"""
+
+import logging
+from time import sleep, time
+from typing import Any
+from selenium.webdriver import Chrome, Edge
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException, NoSuchWindowException
+
+SLICE_DURATION = 60  # Seconds. Maximum duration of a single execute_async_script call.
+# Errors of execute_async_script when the page is reloaded/navigated during the wait (lowercase).
+NAVIGATION_ERROR_MESSAGES = ["document unloaded", "execution context was destroyed", "cannot find context", "target frame detached"]
+
+# arguments: [condition_source, condition_args, slice_duration_ms, callback]
+# Resolves with {"satisfied": true, "value": ...} or {"satisfied": false} at the end of the slice.
+OBSERVER_SCRIPT = """
+const [conditionSource, conditionArgs, sliceDuration, done] = arguments;
+const condition = new Function("args", "find", "isVisible", conditionSource);
+const find = (locator) => {
+    const [by, value] = locator;
+    if (by === "xpath") {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(value);
+};
+const isVisible = (element) => !!(element && (element.offsetWidth || element.offsetHeight || element.getClientRects().length));
+const check = () => {
+    try {
+        return condition(conditionArgs, find, isVisible);
+    } catch (e) {
+        return null;
+    }
+};
+
+let observer = null;
+let timer = null;
+let interval = null;
+const finish = (result) => {
+    if (observer) observer.disconnect();
+    if (timer) clearTimeout(timer);
+    if (interval) clearInterval(interval);
+    done(result);
+};
+const onChange = () => {
+    const value = check();
+    if (value) finish({satisfied: true, value: value});
+};
+
+const value = check();
+if (value) {
+    finish({satisfied: true, value: value});
+    return;
+}
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+// Fallback (inside the page) for the changes which are not DOM mutations. E.g: visibility changed by the layout.
+interval = setInterval(onChange, 1000);
+timer = setTimeout(() => finish({satisfied: false}), sliceDuration);
+"""
+
+
+def to_js_locator(locator: tuple[str, str]) -> list[str]:
+    """Convert a Selenium locator (like (By.ID, 'prompt')) into the locator understood by the observer script (CSS or XPath).
+
+    Args:
+        locator (tuple[str, str]): The Selenium locator. Supported strategies are CSS selector, XPath, ID, class name and tag name.
+
+    Returns:
+        list[str]: ['css', selector] or ['xpath', xpath].
+    """
+    by, value = locator
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by == By.ID:
+        return ["css", f"[id='{value}']"]
+    if by == By.CLASS_NAME:
+        return ["css", f".{value}"]
+    if by == By.TAG_NAME:
+        return ["css", value]
+    raise ValueError(f"Locator strategy '{by}' is not supported. Error Code: 3201")
+
+
+def is_navigation_error(error: WebDriverException) -> bool:
+    """Check if the error is raised because the page is reloaded/navigated during the script (the wait can be retried on the new page).
+
+    Args:
+        error (WebDriverException): The exception raised by execute_async_script.
+
+    Returns:
+        bool: True if the page changed during the script else False (like a stale element, a closed window or an error of the condition).
+    """
+    if isinstance(error, (StaleElementReferenceException, NoSuchWindowException)):
+        return False
+    if isinstance(error, TimeoutException):
+        return True  # Script timeout. Callback of the script is lost when the page changes during the script.
+    message = (error.msg or str(error)).lower()
+    return any(navigation_error_message in message for navigation_error_message in NAVIGATION_ERROR_MESSAGES)
+
+
+def wait_until(driver: Chrome | Edge, condition_source: str, *args, timeout: int | float = 600, message: str = "") -> Any:
+    """Wait until the JavaScript condition returns a truthy value. The condition is re-checked by a MutationObserver on every DOM change.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        condition_source (str): Body of a JavaScript function. It receives 'args' (the passed args), 'find(locator)' and 'isVisible(element)'.
+            E.g: "const element = find(args[0]); return element && element.innerText.trim();"
+        *args: Arguments passed to the condition as 'args' (WebElements are allowed).
+        timeout (int | float, optional): Maximum seconds to wait. Defaults to 600.
+        message (str, optional): Message of the TimeoutException. Defaults to "".
+
+    Returns:
+        Any: The truthy value returned by the condition (WebElements are returned as WebElement).
+
+    Raises:
+        TimeoutException: If the condition is not satisfied within the timeout.
+        WebDriverException: If the script fails for a reason other than the navigation of the page (like StaleElementReferenceException).
+    """
+    deadline = time() + timeout
+    original_script_timeout = driver.timeouts.script
+    round_trips = 0
+
+    try:
+        while True:
+            slice_duration = max(0.0, min(SLICE_DURATION, deadline - time()))
+            driver.set_script_timeout(slice_duration + 10)  # Script resolves itself at the end of the slice.
+            round_trips += 1
+            try:
+                result = driver.execute_async_script(OBSERVER_SCRIPT, condition_source, list(args), int(slice_duration * 1000))
+            except WebDriverException as e:
+                # Page is reloaded/navigated during the wait. Observer is installed again on the new page.
+                # Other errors (like a stale element passed in args or a closed window) are raised immediately.
+                if not is_navigation_error(e):
+                    raise
+                logging.debug(f"Observer interrupted: {e}")
+                result = None
+                sleep(0.5)
+
+            if result and result.get("satisfied"):
+                logging.debug(f"DOM condition satisfied after {round_trips} round trips.")
+                return result.get("value")
+            if time() >= deadline:
+                raise TimeoutException(message or f"DOM condition not satisfied in {timeout} seconds.")
+    finally:
+        driver.set_script_timeout(original_script_timeout)
+
+
+def wait_until_present(driver: Chrome | Edge, locator: tuple[str, str], timeout: int | float = 600, visible: bool = False) -> Any:
+    """Wait until the element is present (and visible if 'visible' is True) in the DOM.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        locator (tuple[str, str]): The Selenium locator of the element. E.g: (By.CSS_SELECTOR, "img.result").
+        timeout (int | float, optional): Maximum seconds to wait. Defaults to 600.
+        visible (bool, optional): Whether the element must be visible. Defaults to False.
+
+    Returns:
+        WebElement: The element.
+
+    Raises:
+        TimeoutException: If the element doesn't appear within the timeout.
+    """
+    condition = "const element = find(args[0]); return (element && (!args[1] || isVisible(element))) ? element : null;"
+    return wait_until(driver, condition, to_js_locator(locator), visible, timeout=timeout, message=f"Element {locator} not found.")
+
+
+def wait_until_absent(driver: Chrome | Edge, locator: tuple[str, str], timeout: int | float = 600) -> bool:
+    """Wait until the element is removed from the DOM.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        locator (tuple[str, str]): The Selenium locator of the element.
+        timeout (int | float, optional): Maximum seconds to wait. Defaults to 600.
+
+    Returns:
+        bool: True when the element is absent.
+
+    Raises:
+        TimeoutException: If the element is still present after the timeout.
+    """
+    return wait_until(
+        driver, "return !find(args[0]);", to_js_locator(locator), timeout=timeout, message=f"Element {locator} is still present."
+    )
+
+
+def wait_until_text_present(driver: Chrome | Edge, locator: tuple[str, str], text: str, timeout: int | float = 600) -> bool:
+    """Wait until the text of the element contains the given text.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        locator (tuple[str, str]): The Selenium locator of the element.
+        text (str): The expected text.
+        timeout (int | float, optional): Maximum seconds to wait. Defaults to 600.
+
+    Returns:
+        bool: True when the text is present.
+
+    Raises:
+        TimeoutException: If the text doesn't appear within the timeout.
+    """
+    condition = "const element = find(args[0]); return !!element && element.textContent.includes(args[1]);"
+    return wait_until(driver, condition, to_js_locator(locator), text, timeout=timeout, message=f"Text '{text}' not found in {locator}.")
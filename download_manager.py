@@ -0,0 +1,95 @@
+"""Module to download the generated outputs in the background.
+
+The browser loop (main.py of each site) only queues the download and moves to the next prompt/image.
+Downloads are performed by a bounded pool of threads and a callback (like inserting the output into the database) is called on completion.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 2700
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+class DownloadManager:
+    """Class to download the generated outputs in the background using a bounded pool of threads."""
+
+    def __init__(self, max_workers: int = 4, max_pending: int | None = None) -> None:
+        """Constructor of DownloadManager class.
+
+        Args:
+            max_workers (int, optional): Maximum number of downloads at the same time. Defaults to 4.
+            max_pending (int | None, optional): Maximum number of queued + running downloads. submit() blocks when the queue is full. Defaults to twice of max_workers.
+        """
+        max_workers = max(1, int(max_workers))
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download_manager")
+        self.pending_slots = threading.BoundedSemaphore(max_pending or max_workers * 2)
+        # Callbacks are executed one at a time. So, they can safely share objects (like database session) with each other.
+        self.callback_lock = threading.Lock()
+        self.futures: list[Future] = []
+        logging.info(f"Download manager started with {max_workers} workers.")
+
+    def __enter__(self) -> "DownloadManager":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def _download(self, download_function: Callable, args: tuple, kwargs: dict, on_complete: Callable[[Any], None] | None) -> Any:
+        """Execute the download function and then the callback (Executed by the worker threads)."""
+        try:
+            result = download_function(*args, **kwargs)
+            if on_complete:
+                with self.callback_lock:
+                    on_complete(result)
+            return result
+        except Exception as e:
+            logging.exception(f"Download failed. Error Code: 2701. Exception: {e}")
+            raise
+        finally:
+            self.pending_slots.release()
+
+    def submit(self, download_function: Callable, *args, on_complete: Callable[[Any], None] | None = None, **kwargs) -> Future:
+        """Queue a download.
+
+        Args:
+            download_function (Callable): Function that performs the download. E.g: Haiper.download_video.
+            *args: Positional arguments for the download function.
+            on_complete (Callable[[Any], None] | None, optional): Function called with the return value of the download function on success. Defaults to None.
+            **kwargs: Keyword arguments for the download function.
+
+        Returns:
+            Future: Future of the download (Result is the return value of the download function).
+        """
+        self.pending_slots.acquire()  # Blocks only if too many downloads are pending.
+        future = self.executor.submit(self._download, download_function, args, kwargs, on_complete)
+        self.futures.append(future)
+        return future
+
+    def wait(self) -> bool:
+        """Wait until all queued downloads are completed.
+
+        Returns:
+            bool: True if all downloads (and their callbacks) are successful else False.
+        """
+        wait(self.futures)
+        failed_downloads = sum(1 for future in self.futures if future.exception())
+        if failed_downloads:
+            logging.error(f"{failed_downloads} out of {len(self.futures)} downloads failed. Error Code: 2702")
+        else:
+            logging.info(f"All {len(self.futures)} downloads completed successfully.")
+        self.futures.clear()
+        return not failed_downloads
+
+    def shutdown(self) -> bool:
+        """Wait until all queued downloads are completed and stop the worker threads.
+
+        Returns:
+            bool: True if all downloads (and their callbacks) are successful else False.
+        """
+        status = self.wait()
+        self.executor.shutdown(wait=True)
+        return status
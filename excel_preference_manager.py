@@ -2,11 +2,106 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 8th June 2024
-Last-modified: 15th June 2024
+Last-modified: 17th October 2026
 Error-series: 2100
 """
 
+import os
+import threading
+from typing import Any, Iterator
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+
+
+def replace_nan(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace NaN values of the dataframe with '' (empty string) using vectorized operations.
+
+    Only the columns containing NaN are converted to object dtype (rest of the columns keep their dtype).
+
+    Args:
+        df (pd.DataFrame): The dataframe.
+
+    Returns:
+        pd.DataFrame: New dataframe without NaN values.
+    """
+    is_not_nan = df.notna()
+    nan_columns = df.columns[~is_not_nan.all()]
+    return df.astype(dict.fromkeys(nan_columns, object)).where(is_not_nan, "")
+
+
+class WorkbookCache:
+    """Process-wide cache of the parsed Excel workbooks.
+
+    Each sheet is parsed only once and served from the memory until the file is changed (detected by its modification time and size).
+    Only the parsed sheets are cached. The file is never kept open.
+    """
+
+    # {absolute_path: {"path": absolute_path, "signature": (mtime_ns, size), "sheet_names": list[str] | None, "sheets": {sheet_name: pd.DataFrame}}}
+    _workbooks: dict[str, dict] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_signature(excel_file_path: str) -> tuple[int, int]:
+        stat = os.stat(excel_file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def _get_workbook(cls, excel_file_path: str) -> dict:
+        """Get the cached workbook of the file (emptied if the file is changed). Must be called with the lock acquired."""
+        excel_file_path = os.path.abspath(excel_file_path)
+        signature = cls._get_signature(excel_file_path)
+        workbook = cls._workbooks.get(excel_file_path)
+        if workbook is None or workbook["signature"] != signature:
+            workbook = {"path": excel_file_path, "signature": signature, "sheet_names": None, "sheets": {}}
+            cls._workbooks[excel_file_path] = workbook
+        return workbook
+
+    @classmethod
+    def get_sheet_names(cls, excel_file_path: str) -> list[str]:
+        """Get the names of all sheets of the workbook.
+
+        Args:
+            excel_file_path (str): Path to the Excel file.
+
+        Returns:
+            list[str]: Names of the sheets.
+        """
+        with cls._lock:
+            workbook = cls._get_workbook(excel_file_path)
+            if workbook["sheet_names"] is None:
+                # File is closed immediately. So, the file is not locked (like while it is being saved by Excel on Windows).
+                with pd.ExcelFile(workbook["path"]) as excel_file:
+                    workbook["sheet_names"] = list(excel_file.sheet_names)
+            return list(workbook["sheet_names"])
+
+    @classmethod
+    def get_sheet(cls, excel_file_path: str, sheet_name: str) -> pd.DataFrame:
+        """Get the parsed sheet of the workbook. NaN values are replaced with '' (empty string).
+
+        Args:
+            excel_file_path (str): Path to the Excel file.
+            sheet_name (str): Name of the sheet.
+
+        Returns:
+            pd.DataFrame: The cached dataframe of the sheet (shared by all callers, so it must not be modified).
+        """
+        with cls._lock:
+            workbook = cls._get_workbook(excel_file_path)
+            if sheet_name not in workbook["sheets"]:
+                # Only the dataframes are cached. File is closed as soon as the sheet is parsed.
+                with pd.ExcelFile(workbook["path"]) as excel_file:
+                    workbook["sheet_names"] = list(excel_file.sheet_names)
+                    sheet_df = excel_file.parse(sheet_name)
+                # NaN will of float type if we convert it to python object
+                workbook["sheets"][sheet_name] = replace_nan(sheet_df)
+            return workbook["sheets"][sheet_name]
+
+    @classmethod
+    def clear(cls) -> None:
+        """Remove all workbooks from the cache."""
+        with cls._lock:
+            cls._workbooks.clear()
 
 
 class PreferenceManager:
@@ -24,13 +119,10 @@ class PreferenceManager:
             None
         """
         try:
-            options_df = pd.read_excel(excel_file_path, sheet_name=options_sheet_name)
+            # NaN values are already replaced with '' (empty string) by the cache
+            self.options_df: pd.DataFrame = WorkbookCache.get_sheet(excel_file_path, options_sheet_name)
         except Exception as e:
             raise e.__class__(f"Error in extracting preferences. Error code: 2101. Exception: {e}")
-        else:
-            # NaN will of float type if we convert it to python object
-            # Replacing NaN with '' (empty string)
-            self.options_df: pd.DataFrame = options_df.map(lambda value: "" if pd.isna(value) else value)
 
     def fetch_categories_and_sites(self) -> tuple[list, dict]:
         """
@@ -44,14 +136,9 @@ class PreferenceManager:
             categories: ['text_to_video', 'image_to_video', 'text_to_image', 'text_to_text']
             categories_sites_mapping: {'text_to_video': ['pixverse', 'haiper'], 'image_to_video': ['pixverse', 'haiper'], 'text_to_image': ['ideogram', 'pixlr'], 'text_to_text': ['wordhero']
         """
-        categories_sites_mapping: dict = {}
-
-        categories: list = self.options_df["category"].drop_duplicates().to_list()
-
-        for category in categories:
-            sites: list = self.options_df.loc[self.options_df["category"] == category, "site"].to_list()
-            categories_sites_mapping[category] = sites
-
+        # Single pass grouping (categories are in order of their first appearance)
+        categories_sites_mapping: dict = self.options_df.groupby("category", sort=False)["site"].agg(list).to_dict()
+        categories: list = list(categories_sites_mapping)
         return categories, categories_sites_mapping
 
     def fetch_sites_preferences(self) -> dict[dict]:
@@ -65,35 +152,47 @@ class PreferenceManager:
             site_options: {category1: {site1: {site1_options}, site2: {site2_options}}, category2: {site1: {site1_options}, site2: {site2_options}}, ...}
             1st site option: {'site': 'pixverse', 'category': 'image_to_video', 'automation_status': True, 'options': {'image': '', 'prompt': '', 'camera_motion': '', 'motion_strength': '', 'seed': '', 'hd_quality': 1.0}}
         """
-        number_of_rows = len(self.options_df)
-        sites_options: dict[dict] = {}
-
-        # Iterating through each row of the dataframe
-        for index in range(number_of_rows):
-            site_dict: dict = {}  # Contains site specific key-values
-            options_dict: dict = {}  # Contains site options key-values
-
-            # Fetching the row as a dictionary of key-value pairs where keys are columns
-            row_col_dict = self.options_df.iloc[index].to_dict()
-
-            for key, value in row_col_dict.items():
-                if "option" in key:
-                    if value:
-                        options_dict[value] = ""
-                        last_key = value
-                elif "value" in key:
-                    if value:
-                        options_dict[last_key] = value
-                else:
-                    site_dict[key] = value
+        columns: list = self.options_df.columns.to_list()
+        option_columns = [column for column in columns if "option" in column]
+        value_columns = [column for column in columns if "option" not in column and "value" in column]
+        site_columns = [column for column in columns if "option" not in column and "value" not in column]
+
+        # Contains site specific key-values of each row
+        sites_records: list[dict] = self.options_df[site_columns].to_dict("records")
+        options = self.options_df[option_columns].to_numpy(dtype=object)
+        values = self.options_df[value_columns].to_numpy(dtype=object)
+        is_option_set = options.astype(bool)
+
+        # Value belongs to the last non-empty option before it (in the same row). So, forward filling the (non-empty) option indexes.
+        filled_option_indexes = np.maximum.accumulate(np.where(is_option_set, np.arange(len(option_columns)), -1), axis=1)
+        # Position (among option columns) of the last option column before each value column
+        preceding_option_positions = [
+            sum(columns.index(option) < columns.index(value) for option in option_columns) - 1 for value in value_columns
+        ]
+        value_option_indexes = np.full(values.shape, -1)
+        for value_position, option_position in enumerate(preceding_option_positions):
+            if option_position >= 0:
+                value_option_indexes[:, value_position] = filled_option_indexes[:, option_position]
+        is_value_set = values.astype(bool) & (value_option_indexes >= 0)
+        value_keys = (
+            np.take_along_axis(options, np.maximum(value_option_indexes, 0), axis=1) if option_columns else np.full(values.shape, None)
+        )
+
+        # Non-empty options/values of all rows as flat lists (row-major). Slices of the nth row are [offsets[n], offsets[n + 1]).
+        set_options: list = options[is_option_set].tolist()
+        set_value_keys: list = value_keys[is_value_set].tolist()
+        set_values: list = values[is_value_set].tolist()
+        option_offsets: list = np.concatenate(([0], np.cumsum(is_option_set.sum(axis=1)))).tolist()
+        value_offsets: list = np.concatenate(([0], np.cumsum(is_value_set.sum(axis=1)))).tolist()
 
+        sites_options: dict[dict] = {}
+        for row_index, site_dict in enumerate(sites_records):
+            # Contains site options key-values
+            options_dict: dict = dict.fromkeys(set_options[option_offsets[row_index] : option_offsets[row_index + 1]], "")
+            value_slice = slice(value_offsets[row_index], value_offsets[row_index + 1])
+            options_dict.update(zip(set_value_keys[value_slice], set_values[value_slice]))
             site_dict["options"] = options_dict
-
-            try:
-                sites_options[row_col_dict["category"]][site_dict["site"]] = site_dict
-            except KeyError:
-                # If the category is not present in the dictionary
-                sites_options[row_col_dict["category"]] = {site_dict["site"]: site_dict}
+            sites_options.setdefault(site_dict["category"], {})[site_dict["site"]] = site_dict
         return sites_options
 
     @staticmethod
@@ -107,8 +206,7 @@ class PreferenceManager:
         Returns:
             list: A list of sheet names in the Excel file.
         """
-        excel_file = pd.ExcelFile(excel_file_path)
-        return excel_file.sheet_names  # list of all sheet names
+        return WorkbookCache.get_sheet_names(excel_file_path)  # list of all sheet names
 
     @staticmethod
     def fetch_all_prompts(sheet_name: str, excel_file_path: str = "preferences.xlsx", column_name: str = "prompt"):
@@ -123,8 +221,7 @@ class PreferenceManager:
         Returns:
             list: A list of prompts extracted from the specified column.
         """
-        prompt_df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-        prompt_df = prompt_df.map(lambda value: "" if pd.isna(value) else value)
+        prompt_df = WorkbookCache.get_sheet(excel_file_path, sheet_name)
         return prompt_df[column_name].to_list()
 
     @staticmethod
@@ -140,10 +237,64 @@ class PreferenceManager:
         Returns:
             list: A list of image Paths from the specified column.
         """
-        image_df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
-        image_df = image_df.map(lambda value: "" if pd.isna(value) else value)
+        image_df = WorkbookCache.get_sheet(excel_file_path, sheet_name)
         return image_df[column_name].to_list()
 
+    @staticmethod
+    def iterate_column(sheet_name: str, excel_file_path: str = "preferences.xlsx", column_name: str = "prompt") -> Iterator[Any]:
+        """
+        A static method to iterate over the values of a column of an Excel sheet without loading the whole sheet into the memory.
+
+        Rows are streamed one by one (openpyxl read-only mode).
+        So, memory usage is constant even for sheets with hundreds of thousands of rows.
+        Empty cells are yielded as '' (empty string) and trailing empty rows are skipped (same as fetch_all_prompts()).
+
+        Parameters:
+            sheet_name (str): The name of the sheet in the Excel file.
+            excel_file_path (str): The path to the Excel file (default is "preferences.xlsx").
+            column_name (str): The name of the column (header in the first row) (default is "prompt").
+
+        Returns:
+            Iterator[Any]: Values of the column (in order of the rows).
+
+        Raises:
+            KeyError: If the column is not found in the sheet.
+        """
+        # Workbook is opened here (not lazily) because sites change the CWD before the iteration starts.
+        workbook = load_workbook(os.path.abspath(excel_file_path), read_only=True, data_only=True)
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if column_name not in header:
+            workbook.close()
+            raise KeyError(f"Column '{column_name}' not found in the sheet '{sheet_name}'. Error code: 2102")
+        column_index = header.index(column_name)
+
+        def iterate_values() -> Iterator[Any]:
+            try:
+                empty_rows = 0  # Consecutive empty rows. Yielded only if a non-empty row follows them.
+                for row in rows:
+                    if all(value is None for value in row):
+                        empty_rows += 1
+                        continue
+                    yield from [""] * empty_rows
+                    empty_rows = 0
+                    value = row[column_index] if column_index < len(row) else None
+                    yield "" if value is None else value
+            finally:
+                workbook.close()
+
+        return iterate_values()
+
+    @staticmethod
+    def iterate_prompts(sheet_name: str, excel_file_path: str = "preferences.xlsx", column_name: str = "prompt") -> Iterator[Any]:
+        """Streaming version of fetch_all_prompts(). See iterate_column()."""
+        return PreferenceManager.iterate_column(sheet_name, excel_file_path, column_name)
+
+    @staticmethod
+    def iterate_images(sheet_name: str, excel_file_path: str = "preferences.xlsx", column_name: str = "image") -> Iterator[Any]:
+        """Streaming version of fetch_all_images(). See iterate_column()."""
+        return PreferenceManager.iterate_column(sheet_name, excel_file_path, column_name)
+
 
 if __name__ == "__main__":
     preferences = PreferenceManager()
@@ -0,0 +1,160 @@
+"""Module to fill the option panels (forms) of the sites in a single WebDriver round trip using declarative form specs.
+
+Filling a form by WebDriver costs a round trip for every find_element(), send_keys(), click() and hover (ActionChains).
+Here, each site declares its form once (at import) as a list of steps and all steps are applied by one execute_async_script call.
+Step waits (like waiting for an element rendered by the previous click) are performed inside the page.
+
+A step of the form spec is a dict:
+    - action (str): 'click', 'fill' (set the value of an input/textarea), 'check' (set a checkbox/switch) or 'wait' (wait for the element only).
+    - locator (tuple[str, str]): Selenium locator of the element. Not required if 'choices' is provided.
+    - option (str, optional): Name of the option (keyword argument of the site method). Step is skipped if the option is not provided (None or "").
+      Value of the option is the value of 'fill' and 'check' steps.
+    - choices (dict[str, tuple[str, str]], optional): {option value: locator}. Element of the chosen value is clicked. E.g: {"Square": (By.ID, "aspect-square")}.
+    - default (Any, optional): Value used if the option is not provided (or not in choices).
+    - value (Any, optional): Value of the step without option. E.g: {"action": "check", "locator": ..., "value": True}.
+    - index (int, optional): Index of the element if the locator matches many elements. Defaults to 0.
+    - enabled (bool, optional): Also wait until the element is enabled (like a submit button). Defaults to False.
+    - timeout (int | float, optional): Seconds to wait for the element. Defaults to STEP_TIMEOUT.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3800
+"""
+
+import logging
+from typing import Any
+from selenium.webdriver import Chrome, Edge
+from selenium.common.exceptions import TimeoutException
+import dom_wait
+
+STEP_TIMEOUT = 30  # Seconds. Default wait for the element of a step.
+
+# arguments: [steps, callback]. Resolves with {"ok": true} or {"ok": false, "step": index, "error": message}.
+FILL_SCRIPT = """
+const [steps, done] = arguments;
+const find = (locator, index) => {
+    const [by, value] = locator;
+    if (by === "xpath") {
+        const snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        return snapshot.snapshotItem(index);
+    }
+    return document.querySelectorAll(value)[index] || null;
+};
+const isReady = (element, step) => !!element && (!step.enabled || (!element.disabled && element.getAttribute("aria-disabled") !== "true"));
+const waitFor = (step) => new Promise((resolve) => {
+    const deadline = Date.now() + step.timeout;
+    const poll = () => {
+        const element = find(step.locator, step.index);
+        if (isReady(element, step)) return resolve(element);
+        if (Date.now() >= deadline) return resolve(null);
+        setTimeout(poll, 100);
+    };
+    poll();
+});
+const setValue = (element, value) => {
+    const prototype = element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    element.focus();
+    // Native setter. So, the frameworks of the sites (like React) notice the new value.
+    Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, value);
+    element.dispatchEvent(new Event("input", {bubbles: true}));
+    element.dispatchEvent(new Event("change", {bubbles: true}));
+};
+(async () => {
+    for (const [index, step] of steps.entries()) {
+        const element = await waitFor(step);
+        if (!element) return done({ok: false, step: index, error: "Element not found"});
+        if (step.action === "click") {
+            element.click();
+        } else if (step.action === "fill") {
+            setValue(element, step.value);
+        } else if (step.action === "check") {
+            const checked = element.getAttribute("aria-checked") === "true" || element.checked === true;
+            if (checked !== step.value) element.click();
+        }
+    }
+    done({ok: true});
+})().catch((error) => done({ok: false, step: -1, error: String(error)}));
+"""
+
+
+def to_text(value: Any) -> str:
+    """Text of an option value (numbers read from the preferences sheet like 4.0 are written as 4)."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def build_steps(form: list[dict], values: dict) -> list[dict]:
+    """Build the steps (understood by the fill script) of the form for the given option values.
+
+    Args:
+        form (list[dict]): The form spec. See the module docstring.
+        values (dict): {option: value}. E.g: {"prompt": "A cat", "seed": 42}.
+
+    Returns:
+        list[dict]: The steps.
+
+    Raises:
+        ValueError: If the value of an option is not one of its choices (and the step has no default).
+    """
+    steps = []
+    for spec in form:
+        value = spec.get("value")
+        if "option" in spec:
+            value = values.get(spec["option"])
+            if value is None or value == "":
+                if "default" not in spec:
+                    continue
+                value = spec["default"]
+
+        locator = spec.get("locator")
+        if "choices" in spec:
+            choices: dict = spec["choices"]
+            text = to_text(value)
+            locator = choices.get(text) or choices.get(text.title())
+            if locator is None:
+                if "default" not in spec:
+                    raise ValueError(
+                        f"Invalid value '{value}' of the option '{spec.get('option')}'. Valid: {list(choices)}. Error Code: 3801"
+                    )
+                locator = choices[to_text(spec["default"])]
+
+        step = {
+            "action": spec["action"],
+            "locator": dom_wait.to_js_locator(locator),
+            "index": spec.get("index", 0),
+            "enabled": spec.get("enabled", False),
+            "timeout": int(spec.get("timeout", STEP_TIMEOUT) * 1000),
+        }
+        if spec["action"] == "fill":
+            step["value"] = to_text(value)
+        elif spec["action"] == "check":
+            step["value"] = bool(value)
+        steps.append(step)
+    return steps
+
+
+def fill_form(driver: Chrome | Edge, form: list[dict], values: dict | None = None) -> None:
+    """Apply all steps of the form in a single round trip.
+
+    Args:
+        driver (Chrome | Edge): The web driver.
+        form (list[dict]): The form spec. See the module docstring.
+        values (dict | None, optional): {option: value}. Defaults to None (only the steps without option are applied).
+
+    Raises:
+        ValueError: If the value of an option is not one of its choices.
+        TimeoutException: If the element of a step is not found (or not enabled) within its timeout.
+    """
+    steps = build_steps(form, values or {})
+    original_script_timeout = driver.timeouts.script
+    driver.set_script_timeout(sum(step["timeout"] for step in steps) / 1000 + 10)  # Script resolves itself when a step times out.
+    try:
+        result = driver.execute_async_script(FILL_SCRIPT, steps)
+    finally:
+        driver.set_script_timeout(original_script_timeout)
+
+    if not result or not result.get("ok"):
+        step = steps[result["step"]] if result and 0 <= result.get("step", -1) < len(steps) else None
+        raise TimeoutException(f"Failed to fill the form at the step {step}: {result and result.get('error')}. Error Code: 3802")
+    logging.debug(f"Form filled with {len(steps)} steps in a single round trip.")
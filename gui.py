@@ -3,17 +3,19 @@
 GUI module to provide Graphical User Interface for the application.
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 09th June 2024
-Last-modified: 28th June 2024
+Last-modified: 17th October 2026
 Error-series: 2300
 """
 
 import os
 import logging
-import importlib
+from typing import Iterator
 import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
-from excel_preference_manager import PreferenceManager
+import preferences_snapshot
+import site_runner
+import tools
 
 __author__ = "Suraj Kumar Giri"
 __version__ = "0.0.0"
@@ -62,6 +64,11 @@ class AIGenerator(toga.App):
         # 4.1 Prompt/image sheet selection dropdown
         self.prompt_image_sheet_dropdown = toga.Selection(items=[""], style=dropdown_style)
 
+        # 4.2 Resume switch (To continue the unfinished jobs of the previous interrupted batch instead of the selected sheet)
+        self.resume_jobs_switch = toga.Switch(
+            "Resume unfinished jobs (ignore the selected sheet)", style=Pack(font_size=12, padding_top=10, alignment="center")
+        )
+
         # 5. Submit Button widget
         button_style = Pack(
             width=100,
@@ -88,6 +95,7 @@ class AIGenerator(toga.App):
             self.sites_checkbox_container,
             self.prompts_label,
             self.prompt_image_sheet_dropdown,
+            self.resume_jobs_switch,
         )
         self.box.add(self.submit_button)
 
@@ -141,7 +149,7 @@ class AIGenerator(toga.App):
 
         # For Prompts (or Images in case of image_to_video category)
         if selected_category:
-            excel_sheets = PreferenceManager.fetch_excel_sheet_names()
+            excel_sheets = preferences_snapshot.get_snapshot().sheet_names
             if selected_category == "image_to_video":
                 self.prompts_label.text = "Select Excel Sheet For Images"
                 self.prompt_image_sheet_dropdown.items = [sheet for sheet in excel_sheets if sheet.startswith("image")]
@@ -173,8 +181,8 @@ class AIGenerator(toga.App):
             self.main_window.error_dialog("Error", "Please select a site")
             return
 
-        # Checking for selected sheets for image/prompt.
-        if not self.prompt_image_sheet_dropdown.value:
+        # Checking for selected sheets for image/prompt (Not required in case of resuming the unfinished jobs).
+        if not self.prompt_image_sheet_dropdown.value and not self.resume_jobs_switch.value:
             message = (
                 "Please select an Excel sheet for images"
                 if self.generation_category_dropdown.value == "image_to_video"
@@ -208,58 +216,108 @@ class AIGenerator(toga.App):
         Returns:
             None
         """
+        resume_jobs: bool = self.resume_jobs_switch.value
+        snapshot = preferences_snapshot.get_snapshot()
+        max_parallel_sites = int(tools.load_app_settings().get("max_parallel_sites", 1))
+        # Parallel mode is possible only if the sites are allowed to create their own web driver.
+        is_parallel_mode = max_parallel_sites > 1 and len(selected_sites) > 1 and not self.driver
+
         # Updating prompts/images for the selected site
         for selected_site in selected_sites:
+            self.sites_preferences[selected_category][selected_site]["resume_jobs"] = resume_jobs
+            if resume_jobs:
+                # Prompts/images of the unfinished jobs are used.
+                continue
+
             # BTW image2video sites have both options prompt as well as image and prompt is optional.
             # Currently, the application supports only image in case of image (not prompt with image)
             # That's why, checking image option first. If found then fetch images only and don't go for prompt.
+            # In sequential mode, rows of the sheet are streamed into the site (first generation starts without reading the whole sheet).
+            # Parallel mode requires lists because the preferences are sent to the worker processes.
             if "image" in self.sites_preferences[selected_category][selected_site]["options"].keys():
-                images: list = PreferenceManager.fetch_all_images(selected_sheet)
+                images: list | Iterator = (
+                    snapshot.fetch_column(selected_sheet, "image") if is_parallel_mode else snapshot.iterate_column(selected_sheet, "image")
+                )
                 self.sites_preferences[selected_category][selected_site]["options"]["image"] = images
             elif "prompt" in self.sites_preferences[selected_category][selected_site]["options"].keys():
-                prompts: list = PreferenceManager.fetch_all_prompts(selected_sheet)
+                prompts: list | Iterator = (
+                    snapshot.fetch_column(selected_sheet, "prompt")
+                    if is_parallel_mode
+                    else snapshot.iterate_column(selected_sheet, "prompt")
+                )
                 self.sites_preferences[selected_category][selected_site]["options"]["prompt"] = prompts
 
-        category_package_name_mapping: dict[str, str] = {
-            "text_to_video": "ai_video_generators",
-            "image_to_video": "ai_video_generators",
-            "text_to_image": "ai_image_generators",
-            "text_to_text": "ai_content_generators",
-        }
-
-        for selected_site in selected_sites:
+        if is_parallel_mode:
             os.chdir(os.path.dirname(__file__))
-            logging.info("======================Starting a new AI Generation (With GUI Interface)=======================")
-            logging.info(f"Category: {selected_category} | Site: {selected_site} | Sheet: {selected_sheet}")
-
-            module = f"{category_package_name_mapping[selected_category]}.{selected_site}_ai.main"
-            logging.info(f"Importing module: {module}")
-            module = importlib.import_module(module)
-            try:
-                logging.info("Calling the main() function of the module...")
-                status: bool = module.main(
-                    site_preferences=self.sites_preferences[selected_category][selected_site], driver=self.driver, *self.args, **self.kwargs
-                )
-            except Exception as e:
-                status = False
-                logging.exception(f"Exception: {e}. Error Code: 2301")
-                self.main_window.error_dialog("Exception", str(e))
-
-            if status:
-                logging.info("======================AI Generation Completed | STATUS -> SUCCESS =======================")
-                self.main_window.info_dialog("Success", f"AI Generation Completed Successfully For {selected_site}")
-            else:
-                logging.warning("======================AI Generation Failed | STATUS -> FAILED =======================")
-                # self.main_window.error_dialog("Failed", f"AI Generation Failed For {selected_site}")
+            logging.info("======================Starting a new AI Generation (With GUI Interface | Parallel Mode)=======================")
+            logging.info(f"Category: {selected_category} | Sites: {selected_sites} | Sheet: {selected_sheet}")
+
+            for selected_site, status, exception in site_runner.run_sites_in_parallel(
+                selected_category, selected_sites, self.sites_preferences, max_parallel_sites
+            ):
+                if exception:
+                    self.main_window.error_dialog("Exception", f"{selected_site}: {exception}")
+                self.show_generation_status(selected_site, status)
+        else:
+            for selected_site in selected_sites:
+                logging.info("======================Starting a new AI Generation (With GUI Interface)=======================")
+                logging.info(f"Category: {selected_category} | Site: {selected_site} | Sheet: {selected_sheet}")
+
+                try:
+                    if self.browser_pool and not self.driver:
+                        status: bool = site_runner.run_site_with_browser_pool(
+                            self.browser_pool,
+                            selected_category,
+                            selected_site,
+                            self.sites_preferences[selected_category][selected_site],
+                            *self.args,
+                            **self.kwargs,
+                        )
+                    else:
+                        status: bool = site_runner.run_site(
+                            selected_category,
+                            selected_site,
+                            self.sites_preferences[selected_category][selected_site],
+                            self.driver,
+                            *self.args,
+                            **self.kwargs,
+                        )
+                except Exception as e:
+                    status = False
+                    logging.exception(f"Exception: {e}. Error Code: 2301")
+                    self.main_window.error_dialog("Exception", str(e))
+
+                self.show_generation_status(selected_site, status)
 
         # Switching the CWD to root dir.
         os.chdir(os.path.dirname(__file__))
 
-    def set_attributes(self, categories: list, categories_sites_mapping: dict, sites_preferences: dict, driver=None, *args, **kwargs):
+    def show_generation_status(self, selected_site: str, status: bool) -> None:
+        """
+        A method to log and display the status of the AI generation of a site.
+
+        Parameters:
+            selected_site (str): The site for which the AI generation has been performed.
+            status (bool): Status of the AI generation.
+
+        Returns:
+            None
+        """
+        if status:
+            logging.info("======================AI Generation Completed | STATUS -> SUCCESS =======================")
+            self.main_window.info_dialog("Success", f"AI Generation Completed Successfully For {selected_site}")
+        else:
+            logging.warning("======================AI Generation Failed | STATUS -> FAILED =======================")
+            # self.main_window.error_dialog("Failed", f"AI Generation Failed For {selected_site}")
+
+    def set_attributes(
+        self, categories: list, categories_sites_mapping: dict, sites_preferences: dict, driver=None, browser_pool=None, *args, **kwargs
+    ):
         self.categories: list = categories
         self.categories_sites_mapping: dict = categories_sites_mapping
         self.sites_preferences: dict = sites_preferences
         self.driver = driver
+        self.browser_pool = browser_pool
         self.args = args
         self.kwargs = kwargs
 
@@ -269,6 +327,7 @@ def main(
     categories_sites_mapping: dict,
     sites_preferences: dict,
     driver=None,
+    browser_pool=None,
     app_name: str = "AI Generator",
     app_id: str = "org.surajgirioffl.ai_generator",
     icon_path: str | None = None,
@@ -286,6 +345,7 @@ def main(
         categories_sites_mapping (dict): A dictionary mapping categories to sites.
         sites_preferences (dict): A dictionary containing preferences for each site.
         driver (optional): An optional web driver object.
+        browser_pool (BrowserPool, optional): Pool of warm browsers. Used (in sequential mode) if driver is not provided. Defaults to None.
         app_name (str): The name of the application (application title that will visible to the user)
         app_id (str): The ID of the application. E.g: com.example.myapp
         icon_path (str | None, optional): Path to the icon file. Defaults to None.
@@ -301,7 +361,7 @@ def main(
         icon = toga.Icon(icon_path)
 
     app = AIGenerator(app_name, app_id, author=__author__, version=__version__, description=__description__, icon=icon, home_page=home_page)
-    app.set_attributes(categories, categories_sites_mapping, sites_preferences, driver, *args, **kwargs)
+    app.set_attributes(categories, categories_sites_mapping, sites_preferences, driver, browser_pool, *args, **kwargs)
     app.main_loop()
 
 
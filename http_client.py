@@ -0,0 +1,232 @@
+"""Module containing the HTTP operations (downloads) shared by all sites.
+
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 2800
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import weakref
+from time import sleep, perf_counter
+from typing import Any
+import requests
+from requests.adapters import HTTPAdapter
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+POOL_SIZE = 16  # Maximum number of keep-alive connections per host
+COOKIES_REFRESH_INTERVAL = 30  # Seconds. Cookies of the browser are read again (See get_browser_session()) after this interval.
+
+_session: requests.Session | None = None
+_adapter: HTTPAdapter | None = None
+# {driver: (read_at, cookies, user_agent)}
+_browser_cookies: "weakref.WeakKeyDictionary[Any, tuple[float, list[dict], str]]" = weakref.WeakKeyDictionary()
+_session_lock = threading.Lock()
+
+
+def _get_adapter() -> HTTPAdapter:
+    """Get the connection pool shared by all sessions (must be called with _session_lock)."""
+    global _adapter
+    if _adapter is None:
+        _adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    return _adapter
+
+
+def get_session() -> requests.Session:
+    """Get the session shared by all sites (created on first call).
+
+    Connections are kept alive and reused. So, consecutive requests to the same host don't pay the TCP/TLS handshake again.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", _get_adapter())
+            _session.mount("http://", _get_adapter())
+        return _session
+
+
+def _read_browser_cookies(driver) -> list[dict]:
+    """Read the cookies of all domains of the browser (WebDriver only returns the cookies of the current page)."""
+    try:
+        return driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except Exception:
+        return driver.get_cookies()
+
+
+def get_browser_session(driver, force: bool = False) -> requests.Session:
+    """Get a session carrying the cookies and the user agent of the browser. So, authenticated assets are downloaded outside the browser.
+
+    Must be called on the thread driving the browser (WebDriver is not thread-safe), like when a download is queued.
+    The session is a snapshot of the cookies. So, it can be passed to the download (worker) thread and never calls into the driver.
+    Uses the connection pool shared by all sessions.
+
+    Args:
+        driver (Chrome | Edge): The web driver whose cookies are used.
+        force (bool, optional): Read the cookies even if they were read within COOKIES_REFRESH_INTERVAL. Defaults to False.
+
+    Returns:
+        requests.Session: The session.
+    """
+    with _session_lock:
+        cached = _browser_cookies.get(driver)  # (read_at, cookies, user_agent)
+    if force or cached is None or perf_counter() - cached[0] >= COOKIES_REFRESH_INTERVAL:
+        try:
+            cookies = _read_browser_cookies(driver)
+            user_agent = cached[2] if cached else driver.execute_script("return navigator.userAgent")
+        except Exception as e:
+            logging.warning(f"Failed to read the cookies of the browser. Error Code: 2803. Exception: {e}")
+        else:
+            cached = (perf_counter(), cookies, user_agent)
+            with _session_lock:
+                _browser_cookies[driver] = cached
+            logging.debug(f"Read {len(cookies)} cookies of the browser.")
+
+    session = requests.Session()
+    with _session_lock:
+        session.mount("https://", _get_adapter())
+        session.mount("http://", _get_adapter())
+    if cached:
+        _, cookies, user_agent = cached
+        session.headers["User-Agent"] = user_agent
+        for cookie in cookies:
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+                secure=cookie.get("secure", False),
+            )
+    return session
+
+
+def fetch(
+    link: str,
+    headers: dict | None = None,
+    accepted_content_type: str | None = None,
+    max_retries: int = 4,
+    backoff_factor: int | float = 1,
+    timeout: int | float = 60,
+    session: requests.Session | None = None,
+) -> requests.Response:
+    """GET the link using the shared session and retry with exponential backoff on failure.
+
+    Args:
+        link (str): The URL to fetch.
+        headers (dict | None, optional): Additional headers of the request. Defaults to None.
+        accepted_content_type (str | None, optional): If provided then response whose Content-Type doesn't contain it is considered as failure. E.g: 'image/'. Defaults to None.
+        max_retries (int, optional): Maximum number of retries (retry budget) of the link. Defaults to 4.
+        backoff_factor (int | float, optional): Wait before the nth retry is backoff_factor * 2^(n-1) seconds. Defaults to 1.
+        timeout (int | float, optional): Timeout (in seconds) of each request. Defaults to 60.
+        session (requests.Session | None, optional): Session to use. Defaults to None (shared session).
+
+    Returns:
+        requests.Response: The successful response.
+
+    Raises:
+        requests.RequestException: If all attempts failed.
+    """
+    session = session or get_session()
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            sleep(backoff_factor * 2 ** (attempt - 1))
+        start_time = perf_counter()
+        try:
+            response = session.get(link, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if accepted_content_type and accepted_content_type not in content_type:
+                raise requests.RequestException(f"Unexpected Content-Type: '{content_type}'")
+        except requests.RequestException as e:
+            logging.warning(
+                f"Attempt {attempt + 1}/{max_retries + 1} failed in {perf_counter() - start_time:.2f} seconds for '{link}'. Exception: {e}"
+            )
+            last_exception = e
+        else:
+            logging.info(
+                f"Fetched '{link}' in {perf_counter() - start_time:.2f} seconds ({len(response.content)} bytes, attempt {attempt + 1})."
+            )
+            return response
+
+    logging.error(f"Failed to fetch '{link}' after {max_retries + 1} attempts. Error Code: 2802")
+    raise last_exception
+
+
+def stream_download(
+    link: str,
+    file_path: str,
+    chunk_size: int = CHUNK_SIZE,
+    max_retries: int = 5,
+    timeout: int | float = 60,
+    session: requests.Session | None = None,
+) -> str:
+    """Download a file in fixed-size chunks (without buffering the complete file in the memory).
+
+    Content is written into '<file_path>.part' and renamed to 'file_path' only when the download is completed.
+    If the connection breaks, download is resumed from the last received byte using HTTP Range header.
+
+    Args:
+        link (str): The URL of the file to download.
+        file_path (str): The path where the file will be saved.
+        chunk_size (int, optional): Number of bytes read from the network at once. Defaults to 1 MB.
+        max_retries (int, optional): Maximum number of resume attempts after an interruption. Defaults to 5.
+        timeout (int | float, optional): Timeout (in seconds) of connection and of each read. Defaults to 60.
+        session (requests.Session | None, optional): Session to use for the requests. Defaults to None (shared session).
+
+    Returns:
+        str: SHA-256 checksum (hex) of the downloaded file (computed while streaming).
+
+    Raises:
+        requests.RequestException: If the download fails even after all retries.
+    """
+    temp_file_path = f"{file_path}.part"
+    get = (session or get_session()).get
+    hasher = hashlib.sha256()
+    downloaded_bytes = 0
+    attempt = 0
+
+    try:
+        with open(temp_file_path, "wb") as file:
+            while True:
+                headers = {"Range": f"bytes={downloaded_bytes}-"} if downloaded_bytes else {}
+                try:
+                    with get(link, headers=headers, stream=True, timeout=timeout) as response:
+                        response.raise_for_status()
+                        if downloaded_bytes and response.status_code != 206:
+                            # Server doesn't support Range. So, starting from the beginning.
+                            logging.warning("Server doesn't support resuming the download. Downloading from the beginning...")
+                            file.seek(0)
+                            file.truncate()
+                            hasher = hashlib.sha256()
+                            downloaded_bytes = 0
+
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            file.write(chunk)
+                            hasher.update(chunk)
+                            downloaded_bytes += len(chunk)
+                    break
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    attempt += 1
+                    if attempt > max_retries:
+                        logging.error(f"Download failed after {max_retries} retries. Error Code: 2801")
+                        raise
+                    logging.warning(
+                        f"Download interrupted at byte {downloaded_bytes}. Resuming ({attempt}/{max_retries})... Exception: {e}"
+                    )
+                    sleep(min(2**attempt, 30))
+    except Exception:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+
+    os.replace(temp_file_path, file_path)  # Atomic. So, a file with the final name is always complete.
+    checksum = hasher.hexdigest()
+    logging.info(f"Downloaded {downloaded_bytes} bytes into '{file_path}'. SHA-256: {checksum}")
+    return checksum
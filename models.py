@@ -2,12 +2,30 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 16th June 2024
-Last-modified: 21st June 2024
+Last-modified: 17th October 2026
 Error-series: 2400
 """
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey, create_engine
-from sqlalchemy.orm import DeclarativeBase, mapped_column, sessionmaker, Session
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, Engine, Connection, create_engine, event, inspect
+from sqlalchemy.orm import DeclarativeBase, mapped_column, sessionmaker, scoped_session, Session
+
+# Resolved at import (like the engine created at import before). So, the database doesn't move if the CWD is changed before the first use.
+DATABASE_PATH = os.path.abspath("ai_generator.db")
+
+# Several processes (parallel mode) and threads (download callbacks) write into the same database.
+# In WAL mode, readers don't block the writer and a writer waits (up to BUSY_TIMEOUT) for the other writer instead of failing with 'database is locked'.
+BUSY_TIMEOUT = 30  # Seconds
+# Safe with WAL (only the last transactions may be lost on power failure, never corrupted) and avoids a fsync per commit.
+SYNCHRONOUS_MODE = "NORMAL"
+
+_engine: Engine | None = None
+_session_factory: sessionmaker | None = None
+_scoped_sessions: scoped_session | None = None
+_engine_lock = threading.Lock()
 
 
 class Base(DeclarativeBase):
@@ -40,20 +58,110 @@ class Output(Base):
     prompt_id = mapped_column(Integer, ForeignKey(Prompts.id), nullable=True)
     image_id = mapped_column(Integer, ForeignKey(Images.id), nullable=True)
     timestamp = mapped_column(DateTime, nullable=False)
-
-
-engine = create_engine("sqlite:///ai_generator.db", echo=False)
-Base.metadata.create_all(bind=engine)
+    # Hash of (site, category, prompt/image, options) of the generation. Used to skip the already generated prompts/images (See db_scripts.compute_generation_key()).
+    generation_key = mapped_column(String, nullable=True)
+    # Path of the content in the output store (See output_store.py). Shared by the outputs having identical content. None if the store is not used.
+    # file_path remains the human-readable path of the output. So, each generation keeps its own row even if its content is deduplicated.
+    object_path = mapped_column(String, nullable=True)
+
+    # Used by the queries of AIGeneratorDB (outputs of a site in a date range, latest output of a prompt/image and counts per category).
+    __table_args__ = (
+        Index("output_site_id_timestamp_index", "site_id", "timestamp"),
+        Index("output_prompt_id_index", "prompt_id"),
+        Index("output_image_id_index", "image_id"),
+        Index("output_category_index", "category"),
+        Index("output_generation_key_index", "generation_key"),
+    )
+
+
+class Jobs(Base):
+    """A prompt/image of a batch to be processed by a site. Used to resume the unfinished batches."""
+
+    __tablename__ = "jobs"
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    category = mapped_column(String, nullable=False)
+    site_id = mapped_column(Integer, ForeignKey(Sites.id), nullable=False)
+    payload_type = mapped_column(String, nullable=False)  # 'prompt' or 'image'
+    payload = mapped_column(String, nullable=False)  # The prompt or the image path
+    state = mapped_column(String, nullable=False, default="pending")  # 'pending', 'running', 'done' or 'failed'
+    attempts = mapped_column(Integer, nullable=False, default=0)
+    created_at = mapped_column(DateTime, nullable=False)
+    updated_at = mapped_column(DateTime, nullable=False)
+    generation_key = mapped_column(String, nullable=True)  # Stored with the output of the job
+
+
+def configure_connection(dbapi_connection, connection_record) -> None:
+    """Configure every new connection of the pool (WAL journal, busy timeout and synchronous mode)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # Persistent in the database file. But executed on every connection (it is cheap).
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+    cursor.execute(f"PRAGMA synchronous={SYNCHRONOUS_MODE}")
+    cursor.close()
+
+
+def add_missing_columns(connection: Connection) -> None:
+    """Add the columns added later to the existing tables (create_all() doesn't alter the existing tables). Such columns must be nullable."""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+
+
+def get_engine() -> Engine:
+    """Get the engine of the database. Engine (and the missing tables) are created on the first call (not at the import of the module)."""
+    global _engine, _session_factory, _scoped_sessions
+    with _engine_lock:
+        if _engine is None:
+            engine = create_engine(f"sqlite:///{DATABASE_PATH}", echo=False, connect_args={"timeout": BUSY_TIMEOUT})
+            event.listen(engine, "connect", configure_connection)
+            with engine.connect() as connection:
+                # Write lock is taken before checking the tables. So, processes (parallel mode) starting together don't create the same table.
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                Base.metadata.create_all(bind=connection)
+                add_missing_columns(connection)
+                # Indexes added later to the existing tables (create_all() only creates the indexes of the new tables).
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(bind=connection, checkfirst=True)
+                connection.commit()
+            # Objects stay usable after the commit (and the close) of their session. E.g: jobs returned by AIGeneratorDB.get_unfinished_jobs().
+            _session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+            _scoped_sessions = scoped_session(_session_factory)
+            _engine = engine
+        return _engine
 
 
 def get_new_session() -> Session:
-    return sessionmaker(bind=engine)()
+    get_engine()
+    return _session_factory()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Context manager providing the session of the current thread for a unit of work.
+
+    Each thread has its own session (so, sessions are never shared between threads). Session is committed at the end of the block
+    (rolled back on exception) and its connection is returned to the pool. So, no connection (or write lock) is held between the operations.
+    Scopes must not be nested in the same thread (inner scope would commit and close the session of the outer one).
+    """
+    get_engine()
+    session = _scoped_sessions()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
     sites = ["pixverse", "haiper", "ideogram", "wordhero", "pixlr"]
     site_objects = [Sites(site=site) for site in sites]
-    SessionClass = sessionmaker(bind=engine)
-    with SessionClass() as session:
+    with get_new_session() as session:
         session.add_all(site_objects)
         session.commit()
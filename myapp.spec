@@ -36,6 +36,9 @@ for package, sub_packages in packages.items():
         all_submodules.extend(collect_submodules(f"{package}.{sub_package}"))
 
 hidden_imports = hidden_imports + list(packages.keys()) + all_submodules
+# Modules imported on first use (inside the functions) by app.py and others to reduce the startup time.
+# PyInstaller finds most of them but listing explicitly ensures the frozen app doesn't fail on the first use.
+hidden_imports += ["cli", "gui", "db_scripts", "models", "browser_pool", "excel_preference_manager", "network_capture", "output_store", "dom_extract", "form_filler"]
 print(hidden_imports)
 
 a = Analysis(
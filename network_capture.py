@@ -0,0 +1,184 @@
+"""Module to capture the JSON responses of the site's API using Chrome DevTools Protocol (CDP) network events.
+
+Generated asset URLs (videos/images) and request IDs are taken straight from the API responses received by the page.
+So, the extra page loads and DOM scraping (to find the asset URLs) are not required.
+Browser must be launched with the performance logging enabled (See enable_performance_logging()). Otherwise, capture is not available and sites fall back to DOM scraping.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3300
+"""
+
+import re
+import json
+import logging
+from collections import deque
+from typing import Any, Iterator
+from selenium.webdriver import Chrome, Edge, ChromeOptions, EdgeOptions
+
+
+def enable_performance_logging(options: ChromeOptions | EdgeOptions) -> None:
+    """Enable the performance logging (CDP network events) in the options of the browser.
+
+    Args:
+        options (ChromeOptions | EdgeOptions): The options used to launch the browser.
+    """
+    vendor_prefix = "ms" if isinstance(options, EdgeOptions) else "goog"
+    options.set_capability(f"{vendor_prefix}:loggingPrefs", {"performance": "ALL"})
+
+
+def iterate_objects(data: Any) -> Iterator[dict]:
+    """Iterate over all objects (dicts) of a JSON document recursively."""
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from iterate_objects(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iterate_objects(value)
+
+
+def iterate_strings(data: Any) -> Iterator[str]:
+    """Iterate over all strings of a JSON document recursively."""
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, dict):
+        for value in data.values():
+            yield from iterate_strings(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iterate_strings(value)
+
+
+class NetworkCapture:
+    """Class to capture the JSON responses of the site's API from the network events of the browser."""
+
+    def __init__(self, driver: Chrome | Edge, url_filter: str = r"/api/", max_responses: int = 500) -> None:
+        """Constructor of NetworkCapture class.
+
+        Args:
+            driver (Chrome | Edge): The web driver (launched with the performance logging enabled).
+            url_filter (str, optional): Regex. Only responses whose URL matches it are captured. Defaults to r"/api/".
+            max_responses (int, optional): Maximum number of responses kept in memory (oldest are dropped). Defaults to 500.
+        """
+        self.driver = driver
+        self.url_filter = re.compile(url_filter)
+        self.responses: deque[tuple[str, Any]] = deque(maxlen=max_responses)  # (url, parsed JSON)
+        self.pending_requests: dict[str, str] = {}  # {request_id: url} Responses whose body is not yet loaded completely.
+        self.is_started = False
+
+    @staticmethod
+    def is_supported(driver: Chrome | Edge) -> bool:
+        """Check if the browser is launched with the performance logging enabled.
+
+        Args:
+            driver (Chrome | Edge): The web driver.
+
+        Returns:
+            bool: True if the network events can be captured else False.
+        """
+        try:
+            return "performance" in driver.log_types
+        except Exception:
+            return False
+
+    def start(self) -> bool:
+        """Start capturing the network events.
+
+        Returns:
+            bool: True if started successfully else False (capture is not available).
+        """
+        if not self.is_supported(self.driver):
+            logging.info("Network capture is not available (performance logging is not enabled). DOM scraping will be used.")
+            return False
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.get_log("performance")  # Discarding the old events
+        except Exception as e:
+            logging.warning(f"Failed to start the network capture. Error Code: 3301. Exception: {e}")
+            return False
+        self.is_started = True
+        logging.info("Network capture started.")
+        return True
+
+    def collect(self) -> int:
+        """Read the new network events of the browser and store the JSON responses matching the URL filter.
+
+        Returns:
+            int: Number of newly captured responses.
+        """
+        if not self.is_started:
+            return 0
+
+        captured = 0
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logging.warning(f"Failed to read the network events. Error Code: 3302. Exception: {e}")
+            return 0
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if "json" in response.get("mimeType", "") and self.url_filter.search(response.get("url", "")):
+                    self.pending_requests[params["requestId"]] = response["url"]
+            elif method == "Network.loadingFinished" and params.get("requestId") in self.pending_requests:
+                url = self.pending_requests.pop(params["requestId"])
+                try:
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                    self.responses.append((url, json.loads(body["body"])))
+                    captured += 1
+                except Exception as e:
+                    # Body may be evicted by the browser (or not a valid JSON).
+                    logging.debug(f"Failed to read the response body of {url}: {e}")
+        return captured
+
+    def find_values(self, key: str, where: dict | None = None) -> list:
+        """Find the values of the key in the captured responses (oldest first).
+
+        Args:
+            key (str): The key. E.g: 'request_id'.
+            where (dict | None, optional): Only objects having all these key-value pairs are considered. E.g: {'prompt': 'A cat'}. Defaults to None.
+
+        Returns:
+            list: The values (without duplicates).
+        """
+        self.collect()
+        values = []
+        for _, data in self.responses:
+            for obj in iterate_objects(data):
+                if key in obj and all(obj.get(k) == v for k, v in (where or {}).items()) and obj[key] not in values:
+                    values.append(obj[key])
+        return values
+
+    def find_asset_urls(self, identifier: str, url_pattern: str) -> list[str]:
+        """Find the asset URLs (like generated video/images) of a generation in the captured responses.
+
+        Searches the objects having the identifier as one of its value and collects all URLs (inside the object) matching the pattern.
+
+        Args:
+            identifier (str): ID of the generation. E.g: video ID or request ID.
+            url_pattern (str): Regex of the asset URLs. E.g: r"\\.mp4(\\?|$)".
+
+        Returns:
+            list[str]: The asset URLs (latest response first, without duplicates).
+        """
+        self.collect()
+        pattern = re.compile(url_pattern)
+        urls = []
+        for _, data in reversed(self.responses):
+            for obj in iterate_objects(data):
+                if identifier not in obj.values():
+                    continue
+                for string in iterate_strings(obj):
+                    if string.startswith("http") and pattern.search(string) and string not in urls:
+                        urls.append(string)
+            if urls:
+                break  # Latest response is enough
+        return urls
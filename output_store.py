@@ -0,0 +1,183 @@
+"""Module to store the generated outputs (videos, images and articles) by their content (content-addressed store).
+
+Each output is hashed (SHA-256) while it is written and stored as 'objects/<hash[:2]>/<hash[2:4]>/<hash><extension>' inside the store.
+So, identical outputs are stored only once, parallel runs never collide on a file name and no directory contains millions of files.
+Human-readable names (generated by the sites) are exposed as hard links in the output directory of the site (See 'output_store_links' of settings.json).
+Human-readable path identifies the generation (Output.file_path) and the object path is recorded with it (Output.object_path).
+So, generations having identical content share the object but keep their own rows in the database.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3600
+"""
+
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Read directly (not by tools.load_app_settings()) because sites executed standalone have their own tools module.
+APP_SETTINGS_PATH = os.path.join(PROJECT_DIR, "settings.json")
+
+_output_store: "OutputStore | None" = None
+_output_store_loaded = False
+_output_store_lock = threading.Lock()
+
+
+class OutputStore:
+    """Class to write the outputs into the content-addressed store."""
+
+    def __init__(self, root_dir_path: str, create_links: bool = True) -> None:
+        """Constructor of OutputStore class.
+
+        Args:
+            root_dir_path (str): Directory of the store. Relative path is resolved from the project directory.
+            create_links (bool, optional): Whether to create the human-readable names (hard links) of the outputs. Defaults to True.
+        """
+        self.root_dir_path = os.path.join(PROJECT_DIR, root_dir_path)
+        self.objects_dir_path = os.path.join(self.root_dir_path, "objects")
+        self.temp_dir_path = os.path.join(self.root_dir_path, "tmp")  # Same file system as the objects. So, moving is atomic.
+        self.create_links = create_links
+        self.object_paths: dict[str, str] = {}  # {output path (returned by add_file()): object path}. Popped when the output is inserted.
+        self.object_paths_lock = threading.Lock()
+        os.makedirs(self.objects_dir_path, exist_ok=True)
+        os.makedirs(self.temp_dir_path, exist_ok=True)
+
+    def get_object_path(self, checksum: str, extension: str = "") -> str:
+        """Get the path of the object having the checksum (SHA-256 hex) in the store."""
+        return os.path.join(self.objects_dir_path, checksum[:2], checksum[2:4], f"{checksum}{extension.lower()}")
+
+    def new_temp_file_path(self) -> str:
+        """Get a unique path (inside the store) to write an output before its checksum is known."""
+        return os.path.join(self.temp_dir_path, uuid.uuid4().hex)
+
+    def add_file(self, temp_file_path: str, checksum: str, link_path: str | None = None) -> str:
+        """Move a completely written file into the store (it is deleted if the same content is already stored).
+
+        Args:
+            temp_file_path (str): Path of the file. Must be inside the store (See new_temp_file_path()).
+            checksum (str): SHA-256 (hex) of the content of the file.
+            link_path (str | None, optional): Human-readable path of the output (like 'outputs/prompt_timestamp.mp4'). Its extension is used for the object. Defaults to None.
+
+        Returns:
+            str: The absolute path of the output. It is the human-readable path (the created link, suffixed if the name is taken) if link_path is provided
+                (not created if 'create_links' is False) else the path of the object. See pop_object_path() for the object of the output.
+        """
+        extension = os.path.splitext(link_path)[1] if link_path else ""
+        object_path = self.get_object_path(checksum, extension)
+        if os.path.exists(object_path):
+            os.remove(temp_file_path)
+            logging.info(f"Output already exists in the store (deduplicated): '{object_path}'")
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(temp_file_path, object_path)  # Atomic. If another process stores the same content at the same time, content is same.
+        if not link_path:
+            return object_path
+
+        output_path = self.link(object_path, link_path) if self.create_links else os.path.abspath(link_path)
+        with self.object_paths_lock:
+            self.object_paths[output_path] = object_path
+        return output_path
+
+    def pop_object_path(self, output_path: str) -> str | None:
+        """Get (and forget) the object path of the output returned by add_file(). Used when the output is inserted into the database.
+
+        Args:
+            output_path (str): The path returned by add_file() (or save_bytes(), save_text() and download()).
+
+        Returns:
+            str | None: The absolute path of the object in the store. None if the output is not written by this store.
+        """
+        output_path = os.path.abspath(output_path)
+        with self.object_paths_lock:
+            object_path = self.object_paths.pop(output_path, None)
+        if object_path is None and os.path.abspath(os.path.dirname(output_path)).startswith(self.objects_dir_path):
+            return output_path  # Output is the object itself (added without link_path)
+        return object_path
+
+    def link(self, object_path: str, link_path: str) -> str:
+        """Expose the object with a human-readable name (hard link). Copied if hard links are not supported by the file system.
+
+        Args:
+            object_path (str): Path of the object in the store.
+            link_path (str): The human-readable path. A suffix is added if another file has the same name.
+
+        Returns:
+            str: The absolute path of the created link.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(link_path)), exist_ok=True)
+        base_path, extension = os.path.splitext(link_path)
+        suffix = 0
+        while os.path.exists(link_path):
+            if os.path.samefile(link_path, object_path):
+                return os.path.abspath(link_path)
+            suffix += 1
+            link_path = f"{base_path}_{suffix}{extension}"
+        try:
+            os.link(object_path, link_path)
+        except OSError as e:
+            logging.warning(f"Failed to create the hard link '{link_path}'. Copying the output. Error Code: 3601. Exception: {e}")
+            shutil.copy2(object_path, link_path)
+        return os.path.abspath(link_path)
+
+    def save_bytes(self, data: bytes, link_path: str | None = None) -> str:
+        """Save the content (like a decoded image) into the store.
+
+        Args:
+            data (bytes): The content.
+            link_path (str | None, optional): Human-readable path of the output. See add_file(). Defaults to None.
+
+        Returns:
+            str: The absolute path of the output. See add_file().
+        """
+        temp_file_path = self.new_temp_file_path()
+        with open(temp_file_path, "wb") as file:
+            file.write(data)
+        return self.add_file(temp_file_path, hashlib.sha256(data).hexdigest(), link_path)
+
+    def save_text(self, text: str, link_path: str | None = None, encoding: str = "utf-8") -> str:
+        """Save the text (like a generated article) into the store. See save_bytes()."""
+        return self.save_bytes(text.encode(encoding), link_path)
+
+    def download(self, link: str, link_path: str | None = None, **kwargs) -> str:
+        """Download the file into the store (hashed while streaming). See http_client.stream_download() for the keyword arguments.
+
+        Args:
+            link (str): The URL of the file to download.
+            link_path (str | None, optional): Human-readable path of the output. See add_file(). Defaults to None.
+
+        Returns:
+            str: The absolute path of the output. See add_file().
+        """
+        import http_client
+
+        temp_file_path = self.new_temp_file_path()
+        checksum = http_client.stream_download(link, temp_file_path, **kwargs)
+        return self.add_file(temp_file_path, checksum, link_path)
+
+
+def get_output_store(settings_path: str = APP_SETTINGS_PATH) -> OutputStore | None:
+    """Get the output store configured in settings.json ('output_store_dir' and 'output_store_links'). Shared by the process.
+
+    Args:
+        settings_path (str, optional): Path of the application settings. Defaults to the settings.json of the project directory.
+
+    Returns:
+        OutputStore | None: The output store. None if 'output_store_dir' is empty (outputs are written into the output directories as before).
+    """
+    global _output_store, _output_store_loaded
+    with _output_store_lock:
+        if not _output_store_loaded:
+            settings = {}
+            if os.path.exists(settings_path):
+                with open(settings_path) as file:
+                    settings = json.load(file)
+            if settings.get("output_store_dir"):
+                _output_store = OutputStore(settings["output_store_dir"], bool(settings.get("output_store_links", True)))
+                logging.info(f"Outputs are written into the output store '{_output_store.root_dir_path}'.")
+            _output_store_loaded = True
+        return _output_store
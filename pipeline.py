@@ -0,0 +1,101 @@
+"""Module to keep multiple AI generations in flight on a site at the same time (pipelined submission).
+
+Instead of submitting a prompt/image and waiting until its generation is completed, up to 'window_size' generations are submitted.
+Each generation is tracked by its site-side ID and harvested as soon as it's completed. Then next item is submitted in place of it.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 2600
+"""
+
+import logging
+from time import sleep, time
+from typing import Any, Callable, Hashable, Iterable
+
+
+def run_in_flight_window(
+    items: Iterable,
+    submit: Callable[[Any, set], Hashable | None],
+    is_generation_completed: Callable[[Hashable], bool],
+    harvest: Callable[[Hashable], Any],
+    on_harvest: Callable[[int, Any, Any], None],
+    window_size: int = 2,
+    poll_interval: int | float = 15,
+    timeout: int | float = 900,
+) -> list[tuple[int, Any]]:
+    """Submit items to a site keeping at most 'window_size' generations in flight and harvest them as they complete.
+
+    Args:
+        items (Iterable): Prompts/images to generate from.
+        submit (Callable[[Any, set], Hashable | None]): Function to submit an item. It receives the item and the set of generation IDs already in flight and returns the site-side ID of the new generation (or None/False on failure).
+        is_generation_completed (Callable[[Hashable], bool]): Function to check if the generation of the given ID is completed.
+        harvest (Callable[[Hashable], Any]): Function to fetch the result (link/links) of the completed generation of the given ID. Returns falsy value on failure.
+        on_harvest (Callable[[int, Any, Any], None]): Function called with (index, item, result) for each harvested generation. E.g: to download and save the output.
+        window_size (int, optional): Maximum number of generations in flight at the same time. Defaults to 2.
+        poll_interval (int | float, optional): Seconds to wait between two completion checks of the in-flight generations. Defaults to 15.
+        timeout (int | float, optional): Seconds after which an in-flight generation is dropped (considered as failed). Defaults to 900.
+
+    Returns:
+        list[tuple[int, Any]]: (index, item) of the items that failed (submission failed, timeout or harvest failed).
+    """
+    window_size = max(1, int(window_size))
+    pending = iter(enumerate(items))
+    in_flight: dict[Hashable, tuple[int, Any, float]] = {}  # {generation_id: (index, item, submission_time)}
+    failed: list[tuple[int, Any]] = []
+    is_exhausted = False
+
+    while True:
+        # Filling the window
+        while not is_exhausted and len(in_flight) < window_size:
+            try:
+                index, item = next(pending)
+            except StopIteration:
+                is_exhausted = True
+                break
+
+            logging.info(f"Submitting the item index {index} ({len(in_flight)} generations are in flight)...")
+            try:
+                generation_id = submit(item, set(in_flight))
+            except Exception as e:
+                logging.exception(f"Exception in submitting the item index {index}. Error Code: 2601. Exception: {e}")
+                generation_id = None
+
+            if not generation_id:
+                logging.error(f"Failed to submit the item index {index}. Error Code: 2602")
+                failed.append((index, item))
+                continue
+
+            logging.info(f"Item index {index} submitted. Generation ID: {generation_id}")
+            in_flight[generation_id] = (index, item, time())
+
+        if not in_flight:
+            break
+
+        sleep(poll_interval)
+
+        # Harvesting the completed generations
+        for generation_id, (index, item, submission_time) in list(in_flight.items()):
+            try:
+                if not is_generation_completed(generation_id):
+                    if time() - submission_time > timeout:
+                        logging.error(
+                            f"Generation {generation_id} (item index {index}) is taking too much time. Dropping it. Error Code: 2603"
+                        )
+                        del in_flight[generation_id]
+                        failed.append((index, item))
+                    continue
+
+                logging.info(f"Generation {generation_id} (item index {index}) completed in {time() - submission_time:.0f} seconds.")
+                result = harvest(generation_id)
+                if not result:
+                    raise ValueError(f"No result found for the generation {generation_id}")
+                on_harvest(index, item, result)
+            except Exception as e:
+                logging.exception(
+                    f"Exception in harvesting the generation {generation_id} (item index {index}). Error Code: 2604. Exception: {e}"
+                )
+                failed.append((index, item))
+            del in_flight[generation_id]
+
+    logging.info(f"All items processed. Failed items: {len(failed)}")
+    return failed
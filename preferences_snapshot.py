@@ -0,0 +1,207 @@
+"""Module to compile the preferences workbook (preferences.xlsx) into a snapshot which is loaded without pandas/openpyxl.
+
+Snapshot is a SQLite database containing the categories, sites, sites preferences and the prompt/image sheets of the workbook.
+It is keyed by the SHA-256 of the workbook content. So, it is rebuilt only when the workbook is changed and launching the application
+(even multiple instances) doesn't parse the workbook again.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3400
+"""
+
+import os
+import json
+import glob
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing
+from typing import Any, Iterator
+
+SNAPSHOT_VERSION = 1  # Increase it when the format of the snapshot changes (old snapshots are rebuilt).
+SHEET_COLUMNS = {"prompt": "prompt", "image": "image"}  # {sheet name prefix: column stored in the snapshot}
+
+_snapshots: dict[str, tuple[tuple[int, int], "PreferencesSnapshot"]] = {}  # {absolute_path: ((mtime_ns, size), snapshot)}
+_snapshots_lock = threading.Lock()
+
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 (hex) of the content of the file."""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class PreferencesSnapshot:
+    """Class to load (and compile if required) the snapshot of the preferences workbook."""
+
+    def __init__(self, excel_file_path: str = "preferences.xlsx", snapshots_dir_path: str = "appdata") -> None:
+        """Constructor of PreferencesSnapshot class. Compiles the snapshot if it doesn't exist for the current content of the workbook.
+
+        Args:
+            excel_file_path (str, optional): Path to the preferences workbook. Defaults to "preferences.xlsx".
+            snapshots_dir_path (str, optional): Directory to store the snapshots. Defaults to "appdata".
+        """
+        # Absolute paths because site modules change the CWD.
+        self.excel_file_path = os.path.abspath(excel_file_path)
+        self.snapshots_dir_path = os.path.abspath(snapshots_dir_path)
+        self.workbook_hash = compute_file_hash(self.excel_file_path)
+        self.snapshot_path = os.path.join(self.snapshots_dir_path, f"preferences_{self.workbook_hash[:16]}.db")
+
+        data = self._load()
+        if data is None:
+            self._compile()
+            data = self._load()
+            if data is None:
+                raise RuntimeError(f"Failed to load the preferences snapshot '{self.snapshot_path}'. Error Code: 3402")
+
+        self.categories: list = data["categories"]
+        self.categories_sites_mapping: dict = data["categories_sites_mapping"]
+        self.sites_preferences: dict = data["sites_preferences"]
+        self.sheet_names: list[str] = data["sheet_names"]
+        self.sheet_columns: dict[str, str] = data["sheet_columns"]  # {sheet_name: column_name} of the sheets stored in the snapshot
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.snapshot_path)
+
+    def _load(self) -> dict | None:
+        """Load the preferences from the snapshot. Returns None if the snapshot doesn't exist or is not usable."""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                metadata = dict(connection.execute("SELECT key, value FROM metadata").fetchall())
+        except sqlite3.Error as e:
+            logging.warning(f"Preferences snapshot '{self.snapshot_path}' is corrupted. Error Code: 3401. Exception: {e}")
+            return None
+        if metadata.get("version") != str(SNAPSHOT_VERSION) or metadata.get("workbook_hash") != self.workbook_hash:
+            return None
+        return json.loads(metadata["preferences"])
+
+    def _compile(self) -> None:
+        """Parse the workbook and write the snapshot (Only place where pandas/openpyxl are imported)."""
+        from excel_preference_manager import PreferenceManager
+
+        logging.info(f"Compiling the preferences snapshot of '{self.excel_file_path}'...")
+        preference_manager = PreferenceManager(self.excel_file_path)
+        categories, categories_sites_mapping = preference_manager.fetch_categories_and_sites()
+        sheet_names = PreferenceManager.fetch_excel_sheet_names(self.excel_file_path)
+        sheet_columns: dict[str, str] = {}
+        preferences = {
+            "categories": categories,
+            "categories_sites_mapping": categories_sites_mapping,
+            "sites_preferences": preference_manager.fetch_sites_preferences(),
+            "sheet_names": sheet_names,
+            "sheet_columns": sheet_columns,  # Filled below
+        }
+
+        # Written into a temporary file and renamed. So, other instances never read a partially written snapshot.
+        os.makedirs(self.snapshots_dir_path, exist_ok=True)
+        temp_snapshot_path = f"{self.snapshot_path}.{os.getpid()}.part"
+        if os.path.exists(temp_snapshot_path):
+            os.remove(temp_snapshot_path)
+        connection = sqlite3.connect(temp_snapshot_path)
+        try:
+            with connection:
+                connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)")
+                connection.execute("CREATE TABLE sheet_rows (sheet TEXT, column_name TEXT, row_index INTEGER, value TEXT)")
+                for sheet_name in sheet_names:
+                    column_name = next((column for prefix, column in SHEET_COLUMNS.items() if sheet_name.startswith(prefix)), None)
+                    if not column_name:
+                        continue
+                    try:
+                        values = PreferenceManager.iterate_column(sheet_name, self.excel_file_path, column_name)
+                    except KeyError:
+                        logging.warning(f"Sheet '{sheet_name}' doesn't have the column '{column_name}'. Skipping it in the snapshot.")
+                        continue
+                    connection.executemany(
+                        "INSERT INTO sheet_rows VALUES (?, ?, ?, ?)",
+                        ((sheet_name, column_name, index, json.dumps(value, default=str)) for index, value in enumerate(values)),
+                    )
+                    sheet_columns[sheet_name] = column_name
+                connection.executemany(
+                    "INSERT INTO metadata VALUES (?, ?)",
+                    [
+                        ("version", str(SNAPSHOT_VERSION)),
+                        ("workbook_hash", self.workbook_hash),
+                        ("preferences", json.dumps(preferences, default=str)),
+                    ],
+                )
+                connection.execute("CREATE INDEX sheet_rows_index ON sheet_rows (sheet, column_name, row_index)")
+        finally:
+            connection.close()
+
+        try:
+            os.replace(temp_snapshot_path, self.snapshot_path)
+        except OSError as e:
+            # Another instance has compiled (and opened) the same snapshot at the same time.
+            logging.warning(f"Failed to replace the preferences snapshot. Error Code: 3403. Exception: {e}")
+            os.remove(temp_snapshot_path)
+        self._remove_old_snapshots()
+        logging.info(f"Preferences snapshot compiled: '{self.snapshot_path}'")
+
+    def _remove_old_snapshots(self) -> None:
+        """Delete the snapshots of the previous contents of the workbook (skipped if still opened by another instance)."""
+        for snapshot_path in glob.glob(os.path.join(self.snapshots_dir_path, "preferences_*.db")):
+            if snapshot_path != self.snapshot_path:
+                try:
+                    os.remove(snapshot_path)
+                except OSError:
+                    pass
+
+    def iterate_column(self, sheet_name: str, column_name: str) -> Iterator[Any]:
+        """Iterate over the values of a column of a prompt/image sheet (rows are read lazily from the snapshot).
+
+        Args:
+            sheet_name (str): The name of the sheet.
+            column_name (str): The name of the column. E.g: 'prompt'.
+
+        Returns:
+            Iterator[Any]: Values of the column (in order of the rows).
+
+        Raises:
+            KeyError: If the column of the sheet is not available in the snapshot.
+        """
+        if self.sheet_columns.get(sheet_name) != column_name:
+            raise KeyError(f"Column '{column_name}' of the sheet '{sheet_name}' is not available in the snapshot. Error code: 3404")
+
+        def iterate_values() -> Iterator[Any]:
+            connection = self._connect()
+            try:
+                query = "SELECT value FROM sheet_rows WHERE sheet = ? AND column_name = ? ORDER BY row_index"
+                for (value,) in connection.execute(query, (sheet_name, column_name)):
+                    yield json.loads(value)
+            finally:
+                connection.close()
+
+        return iterate_values()
+
+    def fetch_column(self, sheet_name: str, column_name: str) -> list:
+        """Fetch all values of a column of a prompt/image sheet. See iterate_column()."""
+        return list(self.iterate_column(sheet_name, column_name))
+
+
+def get_snapshot(excel_file_path: str = "preferences.xlsx", snapshots_dir_path: str = "appdata") -> PreferencesSnapshot:
+    """Get the snapshot of the workbook (shared by the process).
+
+    Snapshot is loaded again only when the workbook is modified (detected by its modification time and size).
+
+    Args:
+        excel_file_path (str, optional): Path to the preferences workbook. Defaults to "preferences.xlsx".
+        snapshots_dir_path (str, optional): Directory to store the snapshots. Defaults to "appdata".
+
+    Returns:
+        PreferencesSnapshot: The snapshot.
+    """
+    excel_file_path = os.path.abspath(excel_file_path)
+    stat = os.stat(excel_file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _snapshots_lock:
+        cached = _snapshots.get(excel_file_path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, PreferencesSnapshot(excel_file_path, snapshots_dir_path))
+            _snapshots[excel_file_path] = cached
+        return cached[1]
@@ -0,0 +1,180 @@
+"""Module to save the login session (cookies and localStorage) of the sites and restore it in the new browsers.
+
+After a successful login, the session of the site is saved per account. On the next run, the session is restored into the browser
+and validated by opening a page of the site. Full login flow (including the Google login) is required only if the session is expired.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 3000
+"""
+
+import os
+import json
+import logging
+import hashlib
+from time import time
+from urllib.parse import urlparse
+from selenium.webdriver import Chrome, Edge
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60  # 7 days (in seconds)
+SAME_SITE_VALUES = ["Strict", "Lax", "None"]
+
+
+class SessionStore:
+    """Class to save and restore the login session of a site for an account."""
+
+    def __init__(
+        self, site: str, account: str | None = None, sessions_dir_path: str = "appdata/sessions", max_age: int = DEFAULT_MAX_AGE
+    ) -> None:
+        """Constructor of SessionStore class.
+
+        Args:
+            site (str): The name of the site. E.g: 'haiper'.
+            account (str | None, optional): The account (email) of the session. Defaults to None ('default' account).
+            sessions_dir_path (str, optional): Directory to store the sessions. Defaults to "appdata/sessions".
+            max_age (int, optional): Seconds after which a saved session is considered as expired (not restored). Defaults to 7 days.
+        """
+        self.site = site
+        self.max_age = max_age
+        # Account is hashed. So, email is not exposed in the filename.
+        account_hash = hashlib.sha256((account or "default").encode()).hexdigest()[:16]
+        os.makedirs(sessions_dir_path, exist_ok=True)
+        self.file_path = os.path.abspath(os.path.join(sessions_dir_path, f"{site}_{account_hash}.json"))
+
+    def save(self, driver: Chrome | Edge) -> bool:
+        """Save the session (cookies and localStorage) of the currently opened site.
+
+        Args:
+            driver (Chrome | Edge): The web driver (logged in to the site).
+
+        Returns:
+            bool: True if the session is saved successfully else False.
+        """
+        try:
+            session = {
+                "url": driver.current_url,
+                "saved_at": time(),
+                "cookies": driver.get_cookies(),
+                "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+            }
+            with open(self.file_path, "w") as file:
+                json.dump(session, file)
+        except Exception as e:
+            logging.exception(f"Failed to save the session of {self.site}. Error Code: 3001. Exception: {e}")
+            return False
+        logging.info(f"Session of {self.site} saved ({len(session['cookies'])} cookies).")
+        return True
+
+    def clear(self) -> None:
+        """Delete the saved session."""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def load(self) -> dict | None:
+        """Load the saved session from the file.
+
+        Returns:
+            dict | None: The session or None if the session doesn't exist or is expired.
+        """
+        if not os.path.exists(self.file_path):
+            return None
+        try:
+            with open(self.file_path) as file:
+                session: dict = json.load(file)
+        except Exception as e:
+            logging.warning(f"Failed to load the session of {self.site}. Error Code: 3002. Exception: {e}")
+            return None
+
+        if time() - session.get("saved_at", 0) > self.max_age:
+            logging.info(f"Saved session of {self.site} is expired.")
+            return None
+        return session
+
+    def restore(
+        self,
+        driver: Chrome | Edge,
+        validation_url: str,
+        logged_in_url_part: str | None = None,
+        logged_out_url_part: str | None = None,
+        logged_out_selector: str | None = None,
+        logged_in_selector: str | None = None,
+        ready_selector: str | None = None,
+        timeout: int | float = 10,
+    ) -> bool:
+        """Restore the saved session into the browser and validate it.
+
+        Validation opens the 'validation_url' and checks the given conditions (all provided conditions must be satisfied within the timeout).
+
+        Args:
+            driver (Chrome | Edge): The web driver.
+            validation_url (str): URL to open for validation. Generally, the login page (site redirects the logged in user away from it).
+            logged_in_url_part (str | None, optional): URL must contain it if logged in. Defaults to None.
+            logged_out_url_part (str | None, optional): URL must not contain it if logged in. Defaults to None.
+            logged_out_selector (str | None, optional): CSS selector of an element (like login button) which must not be visible if logged in. Defaults to None.
+            logged_in_selector (str | None, optional): CSS selector of an element (like account menu) which must be visible if logged in. Defaults to None.
+            ready_selector (str | None, optional): CSS selector of an element rendered in both states (like the container of the login button).
+                Selectors are checked only after it is visible. So, a page whose client-side content isn't rendered yet isn't considered as logged in.
+                Defaults to None (only the readyState of the document is waited for).
+            timeout (int | float, optional): Seconds to wait for the conditions. Defaults to 10.
+
+        Returns:
+            bool: True if the session is restored and valid else False (full login is required).
+        """
+        session = self.load()
+        if not session:
+            return False
+
+        try:
+            # Cookies can be added only for the domain of the currently opened page.
+            parsed_url = urlparse(session["url"])
+            driver.get(f"{parsed_url.scheme}://{parsed_url.netloc}/")
+            for cookie in session["cookies"]:
+                if cookie.get("expiry") is not None:
+                    if cookie["expiry"] < time():
+                        continue  # Expired cookie
+                    cookie["expiry"] = int(cookie["expiry"])
+                if cookie.get("sameSite") not in SAME_SITE_VALUES:
+                    cookie.pop("sameSite", None)
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    logging.warning(f"Failed to restore the cookie '{cookie.get('name')}': {e}")
+            driver.execute_script(
+                "for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);",
+                session.get("local_storage") or {},
+            )
+
+            def is_visible(driver: Chrome | Edge, selector: str) -> bool:
+                return any(element.is_displayed() for element in driver.find_elements(By.CSS_SELECTOR, selector))
+
+            def is_logged_in(driver: Chrome | Edge) -> bool:
+                if logged_in_url_part and logged_in_url_part not in driver.current_url:
+                    return False
+                if logged_out_url_part and logged_out_url_part in driver.current_url:
+                    return False
+                if logged_out_selector or logged_in_selector:
+                    if driver.execute_script("return document.readyState") != "complete":
+                        return False
+                    if ready_selector and not is_visible(driver, ready_selector):
+                        return False
+                    if logged_in_selector and not is_visible(driver, logged_in_selector):
+                        return False
+                    if logged_out_selector and is_visible(driver, logged_out_selector):
+                        return False
+                return True
+
+            driver.get(validation_url)
+            WebDriverWait(driver, timeout).until(is_logged_in)
+        except TimeoutException:
+            logging.info(f"Saved session of {self.site} is not valid anymore. Full login is required.")
+            self.clear()
+            return False
+        except Exception as e:
+            logging.exception(f"Failed to restore the session of {self.site}. Error Code: 3003. Exception: {e}")
+            return False
+
+        logging.info(f"Session of {self.site} restored. Skipping the login.")
+        return True
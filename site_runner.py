@@ -0,0 +1,140 @@
+"""Module to execute the AI generation of the selected sites (one after another or simultaneously).
+
+Each site is executed by calling the main() function of the '<package>.<site>_ai.main' module.
+In parallel mode, each site is executed in its own process (with its own browser).
+Processes are used instead of threads because every site module changes the CWD and uses paths relative to its own directory.
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+Error-series: 2500
+"""
+
+import os
+import logging
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CATEGORY_PACKAGE_NAME_MAPPING: dict[str, str] = {
+    "text_to_video": "ai_video_generators",
+    "image_to_video": "ai_video_generators",
+    "text_to_image": "ai_image_generators",
+    "text_to_text": "ai_content_generators",
+}
+
+
+def get_site_module_name(category: str, site: str) -> str:
+    """Get the name of the module containing the main() function of the site.
+
+    Args:
+        category (str): The category of the AI generation. E.g: 'text_to_video'.
+        site (str): The name of the site. E.g: 'pixverse'.
+
+    Returns:
+        str: The module name. E.g: 'ai_video_generators.pixverse_ai.main'.
+    """
+    return f"{CATEGORY_PACKAGE_NAME_MAPPING[category]}.{site}_ai.main"
+
+
+def run_site(category: str, site: str, site_preferences: dict, driver=None, *args, **kwargs) -> bool:
+    """Execute the AI generation for a single site.
+
+    Args:
+        category (str): The category of the AI generation.
+        site (str): The name of the site.
+        site_preferences (dict): The preferences of the site (with prompts/images already filled).
+        driver (WebDriver, optional): An instance of a WebDriver. If None then the site creates its own web driver.
+        *args: Additional positional arguments (passed to the main() of the site).
+        **kwargs: Additional keyword arguments (passed to the main() of the site).
+
+    Returns:
+        bool: Status returned by the main() function of the site.
+    """
+    os.chdir(PROJECT_DIR)  # Site modules change the CWD on import. So, always starting from the project directory.
+    module = get_site_module_name(category, site)
+    logging.info(f"Importing module: {module}")
+    module = importlib.import_module(module)
+    logging.info("Calling the main() function of the module...")
+    return module.main(site_preferences=site_preferences, driver=driver, *args, **kwargs)
+
+
+def count_generations(site_preferences: dict) -> int:
+    """Get the number of generations a site run will perform (number of prompts/images of the batch).
+    Must be called before the run because the main() of the site replaces the prompts/images with the current item.
+
+    Args:
+        site_preferences (dict): The preferences of the site (with prompts/images already filled).
+
+    Returns:
+        int: Number of generations (at least 1).
+    """
+    options: dict = site_preferences.get("options", {})
+    items = options.get("image") if "image" in options else options.get("prompt")
+    return max(1, len(items)) if isinstance(items, list) else 1
+
+
+def run_site_with_browser_pool(browser_pool, category: str, site: str, site_preferences: dict, *args, **kwargs) -> bool:
+    """Execute the AI generation for a single site using a browser leased from the browser pool.
+
+    Args:
+        browser_pool (BrowserPool): The browser pool of the application.
+        category (str): The category of the AI generation.
+        site (str): The name of the site.
+        site_preferences (dict): The preferences of the site (with prompts/images already filled).
+        *args: Additional positional arguments (passed to the main() of the site).
+        **kwargs: Additional keyword arguments (passed to the main() of the site).
+
+    Returns:
+        bool: Status returned by the main() function of the site.
+
+    More Info:
+        - The main() of the site reports its jobs as site_preferences["job_ids"] (filled while a streamed batch is iterated).
+          So, the generations actually performed are counted. Otherwise, the size of the batch is used.
+    """
+    generations = count_generations(site_preferences)
+    site_preferences.pop("job_ids", None)  # Jobs of a previous run
+    driver = browser_pool.lease()
+    try:
+        return run_site(category, site, site_preferences, driver, *args, **kwargs)
+    finally:
+        job_ids = site_preferences.pop("job_ids", None)
+        browser_pool.release(driver, len(job_ids) if job_ids is not None else generations)
+
+
+def run_sites_in_parallel(
+    category: str, sites: list[str], sites_preferences: dict, max_workers: int = 2
+) -> Iterator[tuple[str, bool, Exception | None]]:
+    """Execute the AI generation for multiple sites simultaneously.
+
+    Each site runs in a separate process and creates its own web driver. At most 'max_workers' sites run at the same time.
+
+    Args:
+        category (str): The category of the AI generation.
+        sites (list[str]): The sites to execute.
+        sites_preferences (dict): Preferences of all sites. Like {category: {site: {site_preferences}}}.
+        max_workers (int, optional): Maximum number of sites to execute at the same time. Defaults to 2.
+
+    Yields:
+        tuple[str, bool, Exception | None]: (site, status, exception) as soon as a site finishes (in order of completion).
+
+    More Info:
+        - Manual login (that waits for the user input) is not supported in this mode because child processes don't have stdin.
+    """
+    max_workers = max(1, min(int(max_workers), len(sites)))
+    logging.info(f"Executing {len(sites)} sites in parallel with {max_workers} workers...")
+
+    # 'spawn' on all platforms. Forking a process running GUI main loop is not safe.
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(run_site, category, site, sites_preferences[category][site]): site for site in sites}
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                logging.exception(f"Exception in the execution of the site '{site}'. Error Code: 2501. Exception: {e}")
+                yield site, False, e
+            else:
+                yield site, bool(status), None
@@ -0,0 +1,34 @@
+"""Tests of db_scripts.compute_generation_key().
+
+Author: Suraj Kumar Giri (@surajgirioffl)
+Init-date: 17th October 2026
+Last-modified: 17th October 2026
+"""
+
+from db_scripts import compute_generation_key
+
+
+def test_key_is_same_after_main_loop_sets_the_headline():
+    # Options as read from the preferences sheet. 'prompt' holds all headlines of the batch.
+    options = {"prompt": ["Best laptops", "Best phones"], "tone": "Friendly", "language": "English"}
+    key_before = compute_generation_key("WordHero", "content", "prompt", "Best phones", options)
+
+    # Options of a previous run were mutated by its main loop (the last headline was left in them).
+    options["headline"] = "Best laptops"
+    key_after = compute_generation_key("WordHero", "content", "prompt", "Best phones", options)
+
+    assert key_before == key_after
+
+
+def test_key_ignores_all_payload_options():
+    options = {"style": "Anime", "seed": 42.0}
+    key = compute_generation_key("Haiper", "video", "image", "images/cat.png", options)
+
+    stale_options = {**options, "prompt": "A cat", "headline": "Cats", "image": "images/dog.png"}
+    assert compute_generation_key("Haiper", "video", "image", "images/cat.png", stale_options) == key
+    assert compute_generation_key("Haiper", "video", "image", "images/dog.png", options) != key
+
+
+def test_key_changes_with_the_options():
+    key = compute_generation_key("Pixlr", "image", "prompt", "A cat", {"style": "Anime"})
+    assert compute_generation_key("Pixlr", "image", "prompt", "A cat", {"style": "Cinematic"}) != key
@@ -2,7 +2,7 @@
 
 Author: Suraj Kumar Giri (@surajgirioffl)
 Init-date: 23rd May 2024
-Last-modified: 06th July 2024
+Last-modified: 17th October 2026
 Error-series: 1300
 """
 
@@ -10,7 +10,12 @@ from datetime import datetime
 import json
 import logging
 import os
-from selenium.webdriver import Chrome, Edge, ChromeOptions, EdgeOptions
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome, Edge
+
+APP_SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
 
 
 def load_settings(path: str = "settings.json") -> dict:
@@ -34,6 +39,38 @@ def load_settings(path: str = "settings.json") -> dict:
         raise e.__class__(f"{e}")
 
 
+def load_app_settings(path: str = APP_SETTINGS_PATH) -> dict:
+    """Load the application level settings (settings.json of the project directory).
+
+    Args:
+        path (str): The path to the JSON file. Defaults to the settings.json of the project directory.
+
+    Returns:
+        dict: The settings loaded from the file. Empty dict if the file doesn't exist (defaults will be used by the caller).
+    """
+    if not os.path.exists(path):
+        logging.warning(f"Application settings file '{path}' not found. Default settings will be used.")
+        return {}
+    return load_settings(path)
+
+
+def get_memoization_settings(app_settings: dict | None = None) -> dict:
+    """Get the memoization settings of the application as keyword arguments of AIGeneratorDB.load_jobs().
+
+    Args:
+        app_settings (dict | None): The application settings. Defaults to None (loaded from settings.json).
+
+    Returns:
+        dict: {'memoize': bool, 'ttl_hours': float, 'force': bool}
+    """
+    app_settings = load_app_settings() if app_settings is None else app_settings
+    return {
+        "memoize": bool(app_settings.get("memoize_outputs", False)),
+        "ttl_hours": float(app_settings.get("memoize_ttl_hours") or 0),
+        "force": bool(app_settings.get("force_regenerate", False)),
+    }
+
+
 def configure_logging(filename: str = "appdata/script.log") -> None:
     """Configure logging with a specified filename or default 'appdata/script.log'.
 
@@ -59,23 +96,32 @@ def create_app_require_directories(dirs: list | tuple) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
-def get_webdriver_instance(browser: str = "chrome", headless=False, profile_dir_path: str | None = None) -> Chrome | Edge | None:
+def get_webdriver_instance(
+    browser: str = "chrome", headless=False, profile_dir_path: str | None = None, capture_network: bool = False
+) -> "Chrome | Edge | None":
     """Function to get the webdriver instance for the given browser.
 
     Args:
         browser (str, optional): Desired browser (chrome or edge). Defaults to "chrome".
         headless (bool, optional): Set to True for headless mode. Defaults to False.
         profile_dir_path (str, optional): Path to the profile directory. Defaults to None.
+        capture_network (bool, optional): Set to True to enable the performance logging (required by the network capture). Defaults to False.
 
     Returns:
         Chrome | Edge | None: Webdriver instance if browser is supported, else None.
     """
+    # Imported here (not at the top) because selenium is slow to import and not required by the other tools (startup of the application).
+    from selenium.webdriver import Chrome, Edge, ChromeOptions, EdgeOptions
+    from network_capture import enable_performance_logging
+
     if browser == "chrome":
         options = ChromeOptions()
         if headless:
             options.add_argument("--headless")
         if profile_dir_path:
             options.add_argument(f"--user-data-dir={profile_dir_path}")
+        if capture_network:
+            enable_performance_logging(options)
         return Chrome(options=options)
     elif browser == "edge":
         options = EdgeOptions()
@@ -83,6 +129,8 @@ def get_webdriver_instance(browser: str = "chrome", headless=False, profile_dir_
             options.add_argument("--headless")
         if profile_dir_path:
             options.add_argument(f"--user-data-dir={profile_dir_path}")
+        if capture_network:
+            enable_performance_logging(options)
         return Edge(options=options)
     else:
         logging.error("Browser not supported. Please use Chrome or Edge. Error Code: 1302")